@@ -0,0 +1,190 @@
+"""
+Utilidades compartidas por los benchmarks de snippets C++.
+
+Los programas se arman con ``SnippetChecker.build_program`` (plantilla de
+concurso + snippet + ``main`` del benchmark) y reportan por stderr:
+
+    BENCH_PHASE <fase> <operaciones> <segundos>
+    BENCH_RSS <KB>                      (al salir, pico de memoria residente)
+
+``BENCH_HELPERS`` se inserta antes del snippet y define ``bench_start()``,
+``bench_phase(nombre, ops)`` y ``bench_sink`` para evitar que el compilador
+descarte resultados.
+"""
+
+import json
+import os
+import platform
+import re
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from generate_pdf import ProjectPaths, SnipIgnore, SnippetCollector, SnippetIndex, content_hash  # noqa: E402
+from snippet_check import SnippetChecker, read_snippet  # noqa: E402
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+FLAGS = ["-std=gnu++17", "-O2", "-w"]
+RESULTS_VERSION = 1
+
+BENCH_HELPERS = r"""
+#ifdef __unix__
+#include <sys/resource.h>
+#endif
+static chrono::steady_clock::time_point bench_t0 = chrono::steady_clock::now();
+static volatile long long bench_sink;
+static void bench_start() { bench_t0 = chrono::steady_clock::now(); }
+static void bench_phase(const char* name, long long ops) {
+    double s = chrono::duration<double>(chrono::steady_clock::now() - bench_t0).count();
+    fprintf(stderr, "BENCH_PHASE %s %lld %.9f\n", name, ops, s);
+    bench_t0 = chrono::steady_clock::now();
+}
+// VmHWM se reinicia en exec; ru_maxrss en Linux arrastra el del proceso padre antes del fork
+static void bench_report_rss() {
+    long kb = -1;
+    if (FILE* f = fopen("/proc/self/status", "r")) {
+        char line[256];
+        while (fgets(line, sizeof line, f)) if (sscanf(line, "VmHWM: %ld", &kb) == 1) break;
+        fclose(f);
+    }
+#ifdef __unix__
+    if (kb < 0) { rusage ru; getrusage(RUSAGE_SELF, &ru); kb = ru.ru_maxrss; }
+#endif
+    if (kb >= 0) fprintf(stderr, "BENCH_RSS %ld\n", kb);
+}
+static int bench_rss_registered = atexit(bench_report_rss);
+"""
+
+PHASE_RE = re.compile(r"^BENCH_PHASE (\S+) (\d+) (\S+)$", re.MULTILINE)
+RSS_RE = re.compile(r"^BENCH_RSS (\d+)$", re.MULTILINE)
+
+
+@dataclass
+class Phase:
+    name: str
+    ops: int
+    seconds: float
+
+    @property
+    def ns_per_op(self) -> float:
+        return self.seconds * 1e9 / max(1, self.ops)
+
+
+@dataclass
+class Measurement:
+    status: str  # "ok", "tiempo", "pila", "error"
+    wall_s: float
+    phases: List[Phase] = field(default_factory=list)
+    peak_rss_kb: Optional[int] = None
+    detail: str = ""
+
+    def phase(self, name: str) -> Optional[Phase]:
+        return next((p for p in self.phases if p.name == name), None)
+
+
+def _stack_limit(limit_bytes: Optional[int]):
+    def apply():
+        value = resource.RLIM_INFINITY if limit_bytes is None else limit_bytes
+        hard = resource.getrlimit(resource.RLIMIT_STACK)[1]
+        if hard != resource.RLIM_INFINITY and (value == resource.RLIM_INFINITY or value > hard):
+            value = hard
+        resource.setrlimit(resource.RLIMIT_STACK, (value, hard))
+    return apply
+
+
+def run_measured(cmd: Sequence[str], stdin_path: Optional[Path] = None, timeout: float = 60.0,
+                 stack_bytes: Optional[int] = 0, stdout_path: Optional[Path] = None) -> Measurement:
+    """
+    Ejecuta un benchmark y junta sus fases. ``stack_bytes``: 0 deja el límite
+    de pila del sistema, None lo quita y un número lo fija (p. ej. 8 MB como
+    en muchos jueces). Un SIGSEGV se informa como posible desborde de pila.
+    La salida estándar se descarta salvo que se indique ``stdout_path``.
+    """
+    preexec = _stack_limit(stack_bytes) if resource is not None and stack_bytes != 0 else None
+    start = time.perf_counter()
+    stdin = open(stdin_path, "rb") if stdin_path else subprocess.DEVNULL
+    stdout = open(stdout_path, "wb") if stdout_path else subprocess.DEVNULL
+    try:
+        proc = subprocess.run(list(map(str, cmd)), stdin=stdin, stdout=stdout, stderr=subprocess.PIPE,
+                              text=True, errors="replace", timeout=timeout, preexec_fn=preexec)
+    except subprocess.TimeoutExpired as e:
+        stderr = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else (e.stderr or "")
+        return Measurement("tiempo", time.perf_counter() - start, _phases(stderr), detail=f"más de {timeout:.0f} s")
+    finally:
+        for fh, used in ((stdin, stdin_path), (stdout, stdout_path)):
+            if used:
+                fh.close()
+    wall = time.perf_counter() - start
+    phases = _phases(proc.stderr)
+    rss = RSS_RE.search(proc.stderr)
+    peak = int(rss.group(1)) if rss else None
+    if proc.returncode == 0:
+        return Measurement("ok", wall, phases, peak)
+    if proc.returncode == -getattr(signal, "SIGSEGV", 11):
+        return Measurement("pila", wall, phases, peak, "SIGSEGV (probable desborde de pila)")
+    tail = proc.stderr.strip().splitlines()[-3:]
+    return Measurement("error", wall, phases, peak, f"código {proc.returncode} {' '.join(tail)}")
+
+
+def _phases(stderr: str) -> List[Phase]:
+    return [Phase(m.group(1), int(m.group(2)), float(m.group(3))) for m in PHASE_RE.finditer(stderr)]
+
+
+def section_snippets(section: str, paths: Optional[ProjectPaths] = None) -> Dict[str, str]:
+    """``{stem: ruta relativa}`` de los snippets de una sección de Snippets/."""
+    paths = paths or ProjectPaths()
+    index = SnippetIndex(paths.snippets_dir, paths.index, SnipIgnore.load(paths.snipignore))
+    files = SnippetCollector(paths.snippets_dir, index).collect().get(section, [])
+    return {f.stem: f.relative_to(paths.snippets_dir).as_posix() for f in files}
+
+
+def snippet_hash(checker: SnippetChecker, rel: str) -> str:
+    return content_hash(read_snippet(checker.paths.snippets_dir / rel).encode("utf-8"))[:16]
+
+
+def environment(checker: SnippetChecker) -> Dict:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                  text=True).stdout.strip() or None
+    except OSError:
+        revision = None
+    return {
+        "version": RESULTS_VERSION,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git": revision,
+        "compiler": checker.compiler_version(),
+        "flags": FLAGS,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_results(path: Path, payload: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=1, default=lambda o: asdict(o)), encoding="utf-8")
+
+
+def compare_rows(old: List[Dict], new: List[Dict], keys: Sequence[str], metric: str = "ns_per_op") -> List[str]:
+    """Líneas ``clave: antes -> ahora (xN)`` para las filas presentes en ambos resultados."""
+    index = {tuple(r.get(k) for k in keys): r for r in old}
+    lines = []
+    for row in new:
+        before = index.get(tuple(row.get(k) for k in keys))
+        if not before or not before.get(metric) or not row.get(metric):
+            continue
+        ratio = row[metric] / before[metric]
+        mark = "⚠️" if ratio > 1.1 else ("✅" if ratio < 0.9 else "  ")
+        label = " ".join(str(row.get(k)) for k in keys)
+        lines.append(f"{mark} {label}: {before[metric]:.1f} -> {row[metric]:.1f} (x{ratio:.2f})")
+    return lines
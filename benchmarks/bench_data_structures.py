@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los snippets de ``Snippets/Data Structures`` con cargas de concurso.
+
+Para cada estructura conocida de la sección (Fenwick, Segment Tree, Sparse
+Table) y cada ``n = q`` se genera un arreglo y ``q`` operaciones aleatorias
+(actualizaciones puntuales y consultas de rango, con distintas proporciones
+de lectura/escritura) y se mide:
+
+- construcción (ns por elemento; en Sparse Table incluye leer la entrada,
+  porque el snippet la lee de ``cin``),
+- operaciones (ns por operación),
+- pico de memoria residente del proceso (incluye la entrada y las
+  operaciones pregeneradas).
+
+Se toma el mejor de ``--repeat`` ejecuciones. Los resultados van a
+``build/bench/data_structures.json`` con el hash de cada snippet, para
+compararlos entre revisiones con ``--compare anterior.json``.
+
+Uso:
+    python benchmarks/bench_data_structures.py [--sizes 200000 500000 1000000]
+        [--repeat 3] [--out resultados.json] [--compare anterior.json]
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from bench_common import (FLAGS, BENCH_HELPERS, compare_rows, environment, run_measured, save_results,
+                          section_snippets, snippet_hash)
+from snippet_check import SnippetChecker
+
+SECTION = "Data Structures"
+DEFAULT_SIZES = [200_000, 500_000, 1_000_000]
+# (nombre, % de consultas)
+WORKLOADS: List[Tuple[str, int]] = [("update", 0), ("query", 100), ("mixed50", 50), ("read90", 90)]
+
+WORKLOAD_CODE = r"""
+struct BenchOp { int type, l, r; long long v; };
+static int bench_n;
+static vector<long long> bench_a;
+static vector<BenchOp> bench_ops;
+// argv: n q %consultas
+static void bench_setup(char** argv) {
+    bench_n = atoi(argv[1]);
+    long long q = atoll(argv[2]);
+    unsigned reads = atoi(argv[3]);
+    mt19937 rng(12345);
+    bench_a.resize(bench_n);
+    for (auto& x : bench_a) x = rng() % 1000000000;
+    bench_ops.resize(q);
+    for (auto& op : bench_ops) {
+        int l = rng() % bench_n, r = rng() % bench_n;
+        if (l > r) swap(l, r);
+        op = {(int) (rng() % 100 < reads), l, r, (long long) (rng() % 1000000000)};
+    }
+}
+"""
+
+OPS_LOOP = """long long acc = 0;
+    for (auto& op : bench_ops) {{ if (op.type) acc += {query}; else {update}; }}
+    bench_sink = acc;
+    bench_phase("ops", bench_ops.size());"""
+
+OBJECT_DRIVER = """int main(int argc, char** argv) {{
+    bench_setup(argv);
+    int n = bench_n;
+    auto& a = bench_a;
+    bench_start();
+    {build}
+    bench_phase("build", n);
+    {ops}
+}}"""
+
+# El fragmento lee n y el arreglo de cin: se le da la entrada desde memoria y
+# las consultas se agregan al final del fragmento, donde ``query`` es visible
+STREAM_DRIVER = """int main(int argc, char** argv) {
+    bench_setup(argv);
+    string input = to_string(bench_n) + "\\n";
+    for (long long x : bench_a) input += to_string(x) + " ";
+    istringstream in(input);
+    cin.rdbuf(in.rdbuf());
+    bench_start();
+    check_body();
+}"""
+
+
+@dataclass
+class Structure:
+    stem: str
+    name: str
+    driver: str
+    tail: str = ""
+    # Solo consultas (estructura estática)
+    static: bool = False
+
+
+STRUCTURES: Dict[str, Structure] = {s.stem: s for s in [
+    Structure("Fenwick Tree", "fenwick", OBJECT_DRIVER.format(
+        build="FenwickTree ft(n); for (int i = 0; i < n; i++) ft.update(i, a[i]);",
+        ops=OPS_LOOP.format(query="ft.range_query(op.l, op.r)", update="ft.update(op.l, op.v)"))),
+    Structure("Segment_Tree", "segment_tree", OBJECT_DRIVER.format(
+        build="seg_tree<long long> st(a);",
+        ops=OPS_LOOP.format(query="st.query(op.l, op.r)", update="st.modify(op.l, op.v)"))),
+    Structure("Sparse Table", "sparse_table", STREAM_DRIVER,
+              tail='bench_phase("build", n);\n' + OPS_LOOP.format(query="query(op.l, op.r)", update="(void) 0"),
+              static=True),
+]}
+
+
+def run_structure(checker: SnippetChecker, structure: Structure, rel: str, sizes: Sequence[int],
+                  repeat: int, out_dir: Path) -> List[Dict]:
+    binary = checker.build_program(rel, structure.driver, out_dir, structure.name, FLAGS,
+                                   context=BENCH_HELPERS + WORKLOAD_CODE, tail=structure.tail)
+    digest = snippet_hash(checker, rel)
+    rows = []
+    workloads = [w for w in WORKLOADS if w[1] == 100] if structure.static else WORKLOADS
+    for n in sizes:
+        for workload, reads in workloads:
+            runs = [run_measured([binary, n, n, reads]) for _ in range(repeat)]
+            ok = [r for r in runs if r.status == "ok" and r.phase("ops")]
+            row = {"structure": structure.name, "snippet": rel, "snippet_hash": digest, "workload": workload,
+                   "reads_pct": reads, "n": n, "q": n, "status": "ok" if ok else runs[-1].status}
+            if ok:
+                row["build_ns_per_elem"] = min(r.phase("build").ns_per_op for r in ok)
+                row["ns_per_op"] = min(r.phase("ops").ns_per_op for r in ok)
+                row["peak_rss_kb"] = max(r.peak_rss_kb or 0 for r in ok) or None
+            else:
+                row["detail"] = runs[-1].detail
+            rows.append(row)
+            logging.info(f"   {structure.name} n={n} {workload}: "
+                         + (f"{row['ns_per_op']:.1f} ns/op" if ok else row["status"]))
+    return rows
+
+
+def print_table(rows: List[Dict]):
+    print(f"\n{'Estructura':<14} {'Carga':<8} {'n = q':>9} {'build ns/elem':>13} {'ns/op':>9} {'RSS (MB)':>9}")
+    print("-" * 68)
+    for r in rows:
+        if r["status"] != "ok":
+            print(f"{r['structure']:<14} {r['workload']:<8} {r['n']:>9}  ❌ {r['status']} {r.get('detail', '')}")
+            continue
+        rss = f"{r['peak_rss_kb'] / 1024:.1f}" if r.get("peak_rss_kb") else "-"
+        print(f"{r['structure']:<14} {r['workload']:<8} {r['n']:>9} {r['build_ns_per_elem']:>13.1f} "
+              f"{r['ns_per_op']:>9.1f} {rss:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="valores de n = q")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path, default=None, help="JSON de resultados")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON anterior para comparar ns/op")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    checker = SnippetChecker()
+    out_dir = checker.paths.build_dir / "bench"
+    snippets = section_snippets(SECTION, checker.paths)
+    for stem in sorted(set(snippets) - set(STRUCTURES)):
+        logging.info(f"⏭️ {snippets[stem]}: sin benchmark definido")
+
+    rows: List[Dict] = []
+    for stem, structure in STRUCTURES.items():
+        if stem not in snippets:
+            logging.warning(f"⚠️ {SECTION}/{stem}.cpp no está en Snippets/")
+            continue
+        try:
+            rows.extend(run_structure(checker, structure, snippets[stem], args.sizes, args.repeat, out_dir))
+        except RuntimeError as e:
+            logging.error(f"❌ {structure.name}: {e}")
+
+    print_table(rows)
+    out = args.out or out_dir / "data_structures.json"
+    save_results(out, {"environment": environment(checker), "results": rows})
+    print(f"\n💾 Resultados en {out}")
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        for line in compare_rows(old, rows, ("structure", "workload", "n")):
+            print(line)
+    sys.exit(0 if rows and all(r["status"] == "ok" for r in rows) else 1)
+
+
+if __name__ == "__main__":
+    main()
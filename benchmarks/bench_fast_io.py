@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Benchmark de entrada/salida de la plantilla ``Algos/Fast IO.cpp``.
+
+Genera en el directorio temporal archivos de 10^6 a 10^7 enteros (uno por
+línea, precedidos por la cantidad) y compara, leyendo todos los números y
+volviéndolos a escribir:
+
+- ``template``: ``cpu()`` + ``read``/``pr`` de la plantilla,
+- ``scanf``: ``scanf``/``printf``,
+- ``cin_sync``: ``cin``/``cout`` sin tocar la sincronización con stdio,
+- ``cin_nosync``: ``cin``/``cout`` con ``sync_with_stdio(false)`` y ``tie(nullptr)``,
+- ``getchar``: lector y escritor a mano con ``getchar_unlocked``/``putchar_unlocked``,
+- ``fread``: lector y escritor con buffer propio sobre ``fread``/``fwrite``.
+
+Se informan MB/s de lectura y de escritura (la salida va a un archivo
+temporal y se verifica que sea idéntica a la entrada). Aparte se mide
+``ordered_set`` de la plantilla con ``--ordered-set-n`` elementos: insert,
+order_of_key, find_by_order y erase, en ns por operación.
+
+Uso:
+    python benchmarks/bench_fast_io.py [--tokens 1000000 10000000]
+        [--methods template fread] [--ordered-set-n 1000000] [--repeat 3]
+        [--out resultados.json] [--compare anterior.json]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from bench_common import FLAGS, BENCH_HELPERS, compare_rows, environment, run_measured, save_results, snippet_hash
+from snippet_check import TEMPLATE_SNIPPET, SnippetChecker
+
+METHODS = ["template", "scanf", "cin_sync", "cin_nosync", "getchar", "fread"]
+DEFAULT_TOKENS = [1_000_000, 10_000_000]
+ORDERED_SET_N = 1_000_000
+CHUNK = 100_000
+
+IO_CODE = r"""
+static long long bench_n;
+static vector<long long> bench_v;
+
+static inline long long gc_read() {
+    int c = getchar_unlocked();
+    while (c != '-' && (c < '0' || c > '9') && c != EOF) c = getchar_unlocked();
+    bool neg = c == '-';
+    if (neg) c = getchar_unlocked();
+    long long x = 0;
+    for (; c >= '0' && c <= '9'; c = getchar_unlocked()) x = x * 10 + (c - '0');
+    return neg ? -x : x;
+}
+static inline void gc_write(long long x) {
+    char buf[24];
+    int len = 0;
+    unsigned long long u = x < 0 ? -(unsigned long long) x : x;
+    if (x < 0) putchar_unlocked('-');
+    do buf[len++] = '0' + u % 10; while (u /= 10);
+    while (len) putchar_unlocked(buf[--len]);
+    putchar_unlocked('\n');
+}
+
+static char fr_in[1 << 16], fr_out[1 << 16];
+static size_t fr_in_len, fr_in_pos, fr_out_pos;
+static inline int fr_getc() {
+    if (fr_in_pos == fr_in_len) {
+        fr_in_len = fread(fr_in, 1, sizeof fr_in, stdin), fr_in_pos = 0;
+        if (!fr_in_len) return EOF;
+    }
+    return fr_in[fr_in_pos++];
+}
+static inline long long fr_read() {
+    int c = fr_getc();
+    while (c != '-' && (c < '0' || c > '9') && c != EOF) c = fr_getc();
+    bool neg = c == '-';
+    if (neg) c = fr_getc();
+    long long x = 0;
+    for (; c >= '0' && c <= '9'; c = fr_getc()) x = x * 10 + (c - '0');
+    return neg ? -x : x;
+}
+static inline void fr_flush() { fwrite(fr_out, 1, fr_out_pos, stdout), fr_out_pos = 0; }
+static inline void fr_write(long long x) {
+    if (fr_out_pos + 24 > sizeof fr_out) fr_flush();
+    char buf[24];
+    int len = 0;
+    unsigned long long u = x < 0 ? -(unsigned long long) x : x;
+    if (x < 0) fr_out[fr_out_pos++] = '-';
+    do buf[len++] = '0' + u % 10; while (u /= 10);
+    while (len) fr_out[fr_out_pos++] = buf[--len];
+    fr_out[fr_out_pos++] = '\n';
+}
+
+static void bench_read_done() {
+    long long s = 0;
+    for (long long x : bench_v) s += x;
+    bench_sink = s;
+    bench_phase("read", bench_n);
+}
+
+// ordered_set usa less_equal: erase(x) y find(x) no encuentran nada, se borra con upper_bound(x)
+static int bench_ordered_set(int n) {
+    mt19937_64 rng(12345);
+    vector<long long> vals(n);
+    vector<int> idx(n);
+    for (auto& x : vals) x = rng() % 1000000000;
+    for (auto& i : idx) i = rng() % n;
+    ordered_set<long long> s;
+    bench_start();
+    for (long long x : vals) s.insert(x);
+    bench_phase("insert", n);
+    long long acc = 0;
+    for (long long x : vals) acc += s.order_of_key(x);
+    bench_phase("order_of_key", n);
+    for (int i : idx) acc += *s.find_by_order(i);
+    bench_phase("find_by_order", n);
+    int bad = 0;
+    for (long long x : vals) {
+        auto it = s.upper_bound(x);
+        if (it == s.end() || *it != x) bad++;
+        else s.erase(it);
+    }
+    bench_phase("erase", n);
+    bench_sink = acc;
+    if (bad || !s.empty()) { fprintf(stderr, "ordered_set: %d borrados fallidos\n", bad); return 1; }
+    return 0;
+}
+"""
+
+IO_DRIVER = r"""int main(int argc, char** argv) {
+    string method = argv[1];
+    if (method == "ordered_set") return bench_ordered_set(atoi(argv[2]));
+    bench_start();
+    if (method == "template") {
+        cpu();
+        read(bench_n);
+        bench_v.resize(bench_n);
+        read(bench_v);
+        bench_read_done();
+        for (long long x : bench_v) pr(x, '\n');
+        cout.flush();
+    } else if (method == "scanf") {
+        scanf("%lld", &bench_n);
+        bench_v.resize(bench_n);
+        for (auto& x : bench_v) scanf("%lld", &x);
+        bench_read_done();
+        for (long long x : bench_v) printf("%lld\n", x);
+        fflush(stdout);
+    } else if (method == "cin_sync" || method == "cin_nosync") {
+        if (method == "cin_nosync") ios::sync_with_stdio(false), cin.tie(nullptr);
+        cin >> bench_n;
+        bench_v.resize(bench_n);
+        for (auto& x : bench_v) cin >> x;
+        bench_read_done();
+        for (long long x : bench_v) cout << x << '\n';
+        cout.flush();
+    } else if (method == "getchar") {
+        bench_n = gc_read();
+        bench_v.resize(bench_n);
+        for (auto& x : bench_v) x = gc_read();
+        bench_read_done();
+        for (long long x : bench_v) gc_write(x);
+        fflush(stdout);
+    } else if (method == "fread") {
+        bench_n = fr_read();
+        bench_v.resize(bench_n);
+        for (auto& x : bench_v) x = fr_read();
+        bench_read_done();
+        for (long long x : bench_v) fr_write(x);
+        fr_flush();
+        fflush(stdout);
+    } else {
+        fprintf(stderr, "método desconocido: %s\n", argv[1]);
+        return 2;
+    }
+    bench_phase("write", bench_n);
+}"""
+
+
+def tokens_file(work_dir: Path, count: int, seed: int = 0) -> Dict:
+    """
+    Archivo con ``count`` enteros en [-1e9, 1e9]; se reutiliza si ya existe.
+    Devuelve su ruta, los bytes de la entrada y de la salida esperada y el
+    SHA-1 de esa salida (las mismas líneas sin la cantidad inicial).
+    """
+    path = work_dir / f"tokens_{count}_s{seed}.txt"
+    meta_path = path.with_suffix(".json")
+    if path.exists() and meta_path.exists():
+        return dict(json.loads(meta_path.read_text(encoding="utf-8")), path=path)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(f"tokens:{count}:{seed}")
+    digest, out_bytes = hashlib.sha1(), 0
+    with open(path, "w", encoding="ascii", newline="\n") as fh:
+        fh.write(f"{count}\n")
+        for start in range(0, count, CHUNK):
+            block = "".join(f"{rng.randint(-10 ** 9, 10 ** 9)}\n" for _ in range(min(CHUNK, count - start)))
+            fh.write(block)
+            digest.update(block.encode("ascii"))
+            out_bytes += len(block)
+    meta = {"tokens": count, "in_bytes": path.stat().st_size, "out_bytes": out_bytes, "sha1": digest.hexdigest()}
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return dict(meta, path=path)
+
+
+def file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def run_io(binary: Path, method: str, data: Dict, repeat: int, timeout: float, work_dir: Path) -> Dict:
+    out_path = work_dir / f"out_{method}.txt"
+    row = {"method": method, "tokens": data["tokens"], "in_mb": data["in_bytes"] / 2 ** 20}
+    runs = []
+    try:
+        for _ in range(repeat):
+            run = run_measured([binary, method], stdin_path=data["path"], timeout=timeout, stdout_path=out_path)
+            if run.status == "ok" and (out_path.stat().st_size != data["out_bytes"]
+                                       or file_sha1(out_path) != data["sha1"]):
+                run.status, run.detail = "error", "la salida no coincide con la entrada"
+            runs.append(run)
+            if run.status != "ok":
+                break
+    finally:
+        out_path.unlink(missing_ok=True)
+    ok = [r for r in runs if r.status == "ok"]
+    row["status"] = "ok" if ok else runs[-1].status
+    if not ok:
+        row["detail"] = runs[-1].detail
+        return row
+    row["read_mb_s"] = max(data["in_bytes"] / 2 ** 20 / r.phase("read").seconds for r in ok)
+    row["write_mb_s"] = max(data["out_bytes"] / 2 ** 20 / r.phase("write").seconds for r in ok)
+    row["peak_rss_kb"] = max(r.peak_rss_kb or 0 for r in ok) or None
+    return row
+
+
+def run_ordered_set(binary: Path, n: int, repeat: int, timeout: float) -> List[Dict]:
+    runs = [run_measured([binary, "ordered_set", n], timeout=timeout) for _ in range(repeat)]
+    ok = [r for r in runs if r.status == "ok"]
+    if not ok:
+        return [{"operation": "ordered_set", "n": n, "status": runs[-1].status, "detail": runs[-1].detail}]
+    return [{"operation": p.name, "n": n, "status": "ok", "ns_per_op": min(r.phase(p.name).ns_per_op for r in ok)}
+            for p in ok[0].phases]
+
+
+def print_tables(io_rows: List[Dict], set_rows: List[Dict]):
+    print(f"\n{'Método':<12} {'tokens':>10} {'MB':>7} {'lectura MB/s':>13} {'escritura MB/s':>15} {'RSS (MB)':>9}")
+    print("-" * 72)
+    for r in io_rows:
+        head = f"{r['method']:<12} {r['tokens']:>10} {r['in_mb']:>7.1f}"
+        if r["status"] != "ok":
+            print(f"{head}  ❌ {r['status']} {r.get('detail', '')}")
+            continue
+        rss = f"{r['peak_rss_kb'] / 1024:.1f}" if r.get("peak_rss_kb") else "-"
+        print(f"{head} {r['read_mb_s']:>13.1f} {r['write_mb_s']:>15.1f} {rss:>9}")
+    if set_rows:
+        print(f"\n{'ordered_set':<16} {'n':>9} {'ns/op':>9}")
+        print("-" * 36)
+        for r in set_rows:
+            value = f"{r['ns_per_op']:>9.1f}" if r["status"] == "ok" else f" ❌ {r['status']} {r.get('detail', '')}"
+            print(f"{r['operation']:<16} {r['n']:>9} {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, nargs="+", default=DEFAULT_TOKENS, help="cantidades de enteros")
+    parser.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    parser.add_argument("--ordered-set-n", type=int, default=ORDERED_SET_N, help="0 para no medirlo")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120.0, help="segundos por ejecución")
+    parser.add_argument("--out", type=Path, default=None, help="JSON de resultados")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON anterior para comparar")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    checker = SnippetChecker()
+    out_dir = checker.paths.build_dir / "bench"
+    work_dir = Path(tempfile.gettempdir()) / "snippets_fast_io"
+    try:
+        binary = checker.build_program(TEMPLATE_SNIPPET, IO_DRIVER, out_dir, "fast_io", FLAGS,
+                                       context=BENCH_HELPERS + IO_CODE)
+    except RuntimeError as e:
+        logging.error(f"❌ {e}")
+        sys.exit(1)
+
+    io_rows: List[Dict] = []
+    for count in sorted(args.tokens):
+        logging.info(f"🔄 {count} enteros")
+        data = tokens_file(work_dir, count)
+        for method in args.methods:
+            row = run_io(binary, method, data, args.repeat, args.timeout, work_dir)
+            io_rows.append(row)
+            logging.info(f"   {method}: " + (f"{row['read_mb_s']:.1f} / {row['write_mb_s']:.1f} MB/s"
+                                              if row["status"] == "ok" else row["status"]))
+    set_rows = run_ordered_set(binary, args.ordered_set_n, args.repeat, args.timeout) if args.ordered_set_n else []
+
+    print_tables(io_rows, set_rows)
+    out = args.out or out_dir / "fast_io.json"
+    save_results(out, {"environment": environment(checker), "snippet_hash": snippet_hash(checker, TEMPLATE_SNIPPET),
+                       "io": io_rows, "ordered_set": set_rows})
+    print(f"\n💾 Resultados en {out}")
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare_rows(old["ordered_set"], set_rows, ("operation", "n")):
+            print(line)
+        # Más MB/s es mejor: se compara el tiempo por MB
+        for rows in (old["io"], io_rows):
+            for r in rows:
+                if r.get("read_mb_s"):
+                    r["s_per_gb"] = 1024 / r["read_mb_s"] + 1024 / r["write_mb_s"]
+        for line in compare_rows(old["io"], io_rows, ("method", "tokens"), metric="s_per_gb"):
+            print(line)
+    rows = io_rows + set_rows
+    sys.exit(0 if rows and all(r["status"] == "ok" for r in rows) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los snippets de ``Snippets/Geometry`` y ``Snippets/Manhattan Distance``.
+
+Las nubes de puntos salen de ``point_gen.py`` (uniforme, sobre un círculo,
+todos colineales y coordenadas hasta 2^61) y se guardan en
+``build/bench/geometry/inputs``. Cada snippet se corre con hasta 10^6
+puntos y su salida se compara con una implementación de referencia en
+Python con enteros exactos:
+
+- ``Convex Hull.cpp``: la envolvente completa (mismos vértices, mismo orden).
+- ``2D_Geometry.cpp``: ``side`` sobre ternas consecutivas, ``segIntersect``
+  sobre pares de segmentos, suma de ``dist`` (error relativo 1e-9) y ``area``
+  de triángulos consecutivos.
+- ``Farthest_pair_of_points.cpp``: distancia Manhattan máxima con d = 2.
+- ``Nearest_Neighbor_in_each_Octant.cpp``: las aristas candidatas deben
+  contener un árbol generador; el peso del MST se compara con un Prim
+  O(n^2) hasta ``OCTANT_REFERENCE_MAX`` puntos.
+
+Se informa el tiempo por fase, el throughput (millones de puntos por
+segundo sobre el total de fases), el pico de memoria y cada discrepancia
+con la referencia como fallo de precisión. El generador ``overflow``
+(coordenadas hasta 2^62, fuera de contrato) solo corre si se pide con
+``--generators``; sus filas se marcan y no cuentan para el código de salida.
+
+Uso:
+    python benchmarks/bench_geometry.py [--sizes 1000 10000 100000 1000000]
+        [--only convex_hull geometry_2d] [--generators uniform huge]
+        [--out resultados.json] [--compare anterior.json]
+"""
+
+import argparse
+import json
+import logging
+import math
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from bench_common import (FLAGS, BENCH_HELPERS, compare_rows, environment, run_measured, save_results,
+                          section_snippets, snippet_hash)
+from point_gen import GENERATORS, OUT_OF_CONTRACT, Point, cached_points, read_points
+from snippet_check import SnippetChecker
+
+SECTIONS = ("Geometry", "Manhattan Distance")
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DIST_RTOL = 1e-9
+OCTANT_REFERENCE_MAX = 2_000
+
+POINT_INPUT = r"""
+static vector<pair<long long, long long>> bench_pts;
+static void bench_read_points() {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+    int n;
+    cin >> n;
+    bench_pts.resize(n);
+    for (auto& [x, y] : bench_pts) cin >> x >> y;
+}
+static string bench_i128(__int128 v) {
+    if (v == 0) return "0";
+    bool neg = v < 0;
+    string s;
+    for (; v != 0; v /= 10) s += char('0' + (neg ? -(v % 10) : v % 10));
+    if (neg) s += '-';
+    return string(s.rbegin(), s.rend());
+}
+"""
+
+HULL_DRIVER = """int main() {
+    bench_read_points();
+    vector<Point> points;
+    for (auto [x, y] : bench_pts) points.emplace_back(x, y);
+    bench_start();
+    vector<Point> hull = convex_hull(points);
+    bench_phase("hull", points.size());
+    printf("%zu\\n", hull.size());
+    for (auto& p : hull) printf("%lld %lld\\n", p.x, p.y);
+}"""
+
+GEOMETRY_DRIVER = """int main() {
+    bench_read_points();
+    int n = bench_pts.size();
+    vector<Point> a;
+    for (auto [x, y] : bench_pts) a.emplace_back(x, y);
+    bench_start();
+    array<long long, 3> sides{};
+    for (int i = 0; i + 2 < n; i++) sides[side(a[i], a[i + 1], a[i + 2]) + 1]++;
+    bench_phase("side", n);
+    long long inter = 0;
+    for (int i = 0; i + 3 < n; i += 4) inter += segIntersect(Line(a[i], a[i + 1]), Line(a[i + 2], a[i + 3]));
+    bench_phase("segIntersect", n / 4);
+    Real total = 0;
+    for (int i = 0; i + 1 < n; i++) total += dist(a[i], a[i + 1]);
+    bench_phase("dist", n);
+    __int128 areas = 0;
+    for (int i = 0; i + 2 < n; i++) areas += area(vector<Point>{a[i], a[i + 1], a[i + 2]});
+    bench_phase("area", n);
+    printf("%lld %lld %lld\\n%lld\\n%.21Le\\n%s\\n", sides[0], sides[1], sides[2], inter, total,
+           bench_i128(areas).c_str());
+}"""
+
+# El fragmento usa los globales n, d y p (ver CONTEXT en snippet_check.py)
+FARTHEST_DRIVER = """int main() {
+    bench_read_points();
+    n = bench_pts.size(), d = 2;
+    p.assign(n, vector<long long>(d));
+    for (int i = 0; i < n; i++) p[i][0] = bench_pts[i].first, p[i][1] = bench_pts[i].second;
+    bench_start();
+    check_body();
+}"""
+FARTHEST_TAIL = 'bench_phase("farthest", n);\nprintf("%lld\\n", ans);'
+
+OCTANT_DRIVER = """int main() {
+    bench_read_points();
+    int n = bench_pts.size();
+    vector<point> ps;
+    for (auto [x, y] : bench_pts) ps.push_back({x, y});
+    bench_start();
+    auto edges = manhattan_mst_edges(ps);
+    bench_phase("edges", n);
+    sort(edges.begin(), edges.end());
+    vector<int> dsu(n);
+    iota(dsu.begin(), dsu.end(), 0);
+    auto find = [&](int x) { while (dsu[x] != x) x = dsu[x] = dsu[dsu[x]]; return x; };
+    __int128 total = 0;
+    int comps = n;
+    for (auto [w, u, v] : edges) {
+        int a = find(u), b = find(v);
+        if (a != b) dsu[a] = b, total += w, comps--;
+    }
+    bench_phase("kruskal", edges.size());
+    printf("%zu %d %s\\n", edges.size(), comps, bench_i128(total).c_str());
+}"""
+
+
+# ==================== Referencias (enteros exactos) ====================
+
+def _cross(o: Point, a: Point, b: Point) -> int:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _sign(x) -> int:
+    return (x > 0) - (x < 0)
+
+
+def reference_hull(points: List[Point]) -> List[Point]:
+    """Monotone chain sin colineales, antihorario desde el menor punto (como el snippet)."""
+    pts = sorted(points)
+    if len(pts) <= 1:
+        return pts
+    hull: List[Point] = []
+    for p in pts:
+        while len(hull) >= 2 and _cross(hull[-2], hull[-1], p) <= 0:
+            hull.pop()
+        hull.append(p)
+    lower = len(hull)
+    for p in pts[-2::-1]:
+        while len(hull) > lower and _cross(hull[-2], hull[-1], p) <= 0:
+            hull.pop()
+        hull.append(p)
+    hull.pop()
+    return hull
+
+
+def check_hull(points: List[Point], out: str) -> List[str]:
+    lines = out.split("\n")
+    got = [tuple(map(int, line.split())) for line in lines[1:1 + int(lines[0])]]
+    want = reference_hull(points)
+    if got == want:
+        return []
+    if len(got) != len(want):
+        return [f"envolvente con {len(got)} vértices, se esperaban {len(want)}"]
+    i = next(i for i, (g, w) in enumerate(zip(got, want)) if g != w)
+    return [f"vértice {i}: {got[i]} en vez de {want[i]}"]
+
+
+def _overlap(l1: int, r1: int, l2: int, r2: int) -> bool:
+    l1, r1 = min(l1, r1), max(l1, r1)
+    l2, r2 = min(l2, r2), max(l2, r2)
+    return r1 >= l2 and r2 >= l1
+
+
+def _seg_intersect(p1: Point, p2: Point, q1: Point, q2: Point) -> bool:
+    return (_overlap(p1[0], p2[0], q1[0], q2[0]) and _overlap(p1[1], p2[1], q1[1], q2[1])
+            and _sign(_cross(p1, q1, q2)) * _sign(_cross(p2, q1, q2)) <= 0
+            and _sign(_cross(q1, p1, p2)) * _sign(_cross(q2, p1, p2)) <= 0)
+
+
+def check_geometry(points: List[Point], out: str) -> List[str]:
+    lines = out.split("\n")
+    got_sides = list(map(int, lines[0].split()))
+    got_inter, got_dist, got_area = int(lines[1]), float(lines[2]), int(lines[3])
+    n = len(points)
+    sides = [0, 0, 0]
+    for i in range(n - 2):
+        sides[_sign(_cross(points[i], points[i + 1], points[i + 2])) + 1] += 1
+    inter = sum(_seg_intersect(*points[i:i + 4]) for i in range(0, n - 3, 4))
+    total = math.fsum(math.hypot(a[0] - b[0], a[1] - b[1]) for a, b in zip(points, points[1:]))
+    area = sum(_cross((0, 0), a, b) + _cross((0, 0), b, c) + _cross((0, 0), c, a)
+               for a, b, c in zip(points, points[1:], points[2:]))
+    failures = []
+    if got_sides != sides:
+        failures.append(f"side: (-, 0, +) = {tuple(got_sides)}, se esperaba {tuple(sides)}")
+    if got_inter != inter:
+        failures.append(f"segIntersect: {got_inter} intersecciones, se esperaban {inter}")
+    if not abs(got_dist - total) <= DIST_RTOL * max(1.0, abs(total)):
+        failures.append(f"dist: suma {got_dist:.12g}, se esperaba {total:.12g}")
+    if got_area != area:
+        failures.append(f"area: {got_area}, se esperaba {area}")
+    return failures
+
+
+def check_farthest(points: List[Point], out: str) -> List[str]:
+    s = [x + y for x, y in points]
+    t = [x - y for x, y in points]
+    want = max(max(s) - min(s), max(t) - min(t))
+    got = int(out.split()[0])
+    return [] if got == want else [f"distancia máxima {got}, se esperaba {want}"]
+
+
+def reference_manhattan_mst(points: List[Point]) -> int:
+    """Prim O(n^2) con distancia Manhattan exacta."""
+    n = len(points)
+    best = [math.inf] * n
+    used = [False] * n
+    best[0], total = 0, 0
+    for _ in range(n):
+        u = min((i for i in range(n) if not used[i]), key=best.__getitem__)
+        used[u] = True
+        total += best[u]
+        ux, uy = points[u]
+        for v in range(n):
+            if not used[v]:
+                d = abs(ux - points[v][0]) + abs(uy - points[v][1])
+                if d < best[v]:
+                    best[v] = d
+    return total
+
+
+def check_octant(points: List[Point], out: str) -> List[str]:
+    edges, comps, total = map(int, out.split())
+    failures = []
+    if comps != 1:
+        failures.append(f"las {edges} aristas candidatas dejan {comps} componentes")
+    if len(points) <= OCTANT_REFERENCE_MAX:
+        want = reference_manhattan_mst(points)
+        if total != want:
+            failures.append(f"peso del MST {total}, se esperaba {want}")
+    return failures
+
+
+@dataclass
+class GeometryBench:
+    rel: str
+    name: str
+    driver: str
+    check: Callable[[List[Point], str], List[str]]
+    tail: str = ""
+
+
+BENCHES: List[GeometryBench] = [
+    GeometryBench("Geometry/Convex Hull.cpp", "convex_hull", HULL_DRIVER, check_hull),
+    GeometryBench("Geometry/2D_Geometry.cpp", "geometry_2d", GEOMETRY_DRIVER, check_geometry),
+    GeometryBench("Manhattan Distance/Farthest_pair_of_points.cpp", "farthest_pair", FARTHEST_DRIVER,
+                  check_farthest, tail=FARTHEST_TAIL),
+    GeometryBench("Manhattan Distance/Nearest_Neighbor_in_each_Octant.cpp", "octant_nn", OCTANT_DRIVER,
+                  check_octant),
+]
+
+
+def measure(bench: GeometryBench, binary: Path, digest: str, kind: str, points_path: Path,
+            points: List[Point], timeout: float, out_dir: Path) -> Dict:
+    out_path = out_dir / "out" / f"{bench.name}_{points_path.stem}.txt"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    run = run_measured([binary], stdin_path=points_path, timeout=timeout, stdout_path=out_path)
+    row = {"name": bench.name, "snippet": bench.rel, "snippet_hash": digest, "generator": kind, "n": len(points),
+           "status": run.status}
+    if kind in OUT_OF_CONTRACT:
+        row["out_of_contract"] = True
+    if run.status != "ok":
+        row["detail"] = run.detail
+        return row
+    row["phases"] = {p.name: p.seconds for p in run.phases}
+    row["seconds"] = sum(row["phases"].values())
+    row["mpts_per_s"] = len(points) / row["seconds"] / 1e6 if row["seconds"] > 0 else None
+    row["peak_rss_kb"] = run.peak_rss_kb
+    try:
+        failures = bench.check(points, out_path.read_text(encoding="utf-8"))
+    except (ValueError, IndexError) as e:
+        failures = [f"salida ilegible: {e}"]
+    if failures:
+        row["status"] = "fallo"
+        row["failures"] = failures
+    return row
+
+
+def print_table(rows: List[Dict]):
+    print(f"\n{'Snippet':<14} {'Generador':<10} {'n':>8} {'seg':>8} {'Mpts/s':>8} {'RSS (MB)':>9}  Fases")
+    print("-" * 86)
+    for r in rows:
+        head = f"{r['name']:<14} {r['generator']:<10} {r['n']:>8}"
+        mark = " (fuera de contrato)" if r.get("out_of_contract") else ""
+        if "phases" not in r:
+            print(f"{head}  ❌ {r['status']}{mark} {r.get('detail', '')}")
+            continue
+        rss = f"{r['peak_rss_kb'] / 1024:.1f}" if r.get("peak_rss_kb") else "-"
+        rate = f"{r['mpts_per_s']:.2f}" if r.get("mpts_per_s") else "-"
+        phases = " ".join(f"{k}={v:.3f}" for k, v in r["phases"].items())
+        print(f"{head} {r['seconds']:>8.3f} {rate:>8} {rss:>9}  {phases}{mark}")
+        for failure in r.get("failures", []):
+            print(f"{'':<34}⚠️ {failure}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="cantidades de puntos")
+    parser.add_argument("--only", nargs="+", default=None, help="nombres de snippet a correr")
+    parser.add_argument("--generators", nargs="+", default=[k for k in GENERATORS if k not in OUT_OF_CONTRACT],
+                        choices=list(GENERATORS))
+    parser.add_argument("--timeout", type=float, default=60.0, help="segundos por ejecución")
+    parser.add_argument("--out", type=Path, default=None, help="JSON de resultados")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON anterior para comparar tiempos")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    checker = SnippetChecker()
+    out_dir = checker.paths.build_dir / "bench" / "geometry"
+    available = {rel for section in SECTIONS for rel in section_snippets(section, checker.paths).values()}
+    for rel in sorted(available - {b.rel for b in BENCHES}):
+        logging.info(f"⏭️ {rel}: sin benchmark definido")
+
+    binaries: Dict[str, Tuple[Path, str]] = {}
+    for bench in BENCHES:
+        if args.only and bench.name not in args.only:
+            continue
+        if bench.rel not in available:
+            logging.warning(f"⚠️ {bench.rel} no está en Snippets/")
+            continue
+        try:
+            binaries[bench.name] = (checker.build_program(bench.rel, bench.driver, out_dir, bench.name, FLAGS,
+                                                          context=BENCH_HELPERS + POINT_INPUT, tail=bench.tail),
+                                    snippet_hash(checker, bench.rel))
+        except RuntimeError as e:
+            logging.error(f"❌ {bench.name}: {e}")
+
+    rows: List[Dict] = []
+    timed_out = set()
+    for kind in args.generators:
+        for n in sorted(args.sizes):
+            path = cached_points(out_dir / "inputs", kind, n)
+            points: Optional[Sequence[Point]] = None
+            for bench in BENCHES:
+                if bench.name not in binaries or (bench.name, kind) in timed_out:
+                    continue
+                points = points or read_points(path)
+                row = measure(bench, *binaries[bench.name], kind, path, points, args.timeout, out_dir)
+                rows.append(row)
+                logging.info(f"   {bench.name} {kind} n={n}: "
+                             + (f"{row['seconds']:.3f} s" if "phases" in row else "")
+                             + ("" if row["status"] == "ok" else f" {row['status']}"))
+                if row["status"] == "tiempo":
+                    # Los tamaños siguientes tampoco van a terminar
+                    timed_out.add((bench.name, kind))
+
+    print_table(rows)
+    out = args.out or checker.paths.build_dir / "bench" / "geometry.json"
+    save_results(out, {"environment": environment(checker), "results": rows})
+    print(f"\n💾 Resultados en {out}")
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        for line in compare_rows(old, rows, ("name", "generator", "n"), metric="seconds"):
+            print(line)
+    sys.exit(0 if rows and all(r["status"] == "ok" for r in rows if not r.get("out_of_contract")) else 1)
+
+
+if __name__ == "__main__":
+    main()
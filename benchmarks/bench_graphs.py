@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los snippets de ``Snippets/Graph`` sobre grafos de concurso.
+
+Las entradas salen de ``graph_gen.py`` (disperso, denso, cuadrícula, árbol,
+cadena, DAG y un caso adverso para Dijkstra), se escriben en
+``build/bench/graphs/inputs`` y se reutilizan entre corridas. Cada snippet se
+corre con los generadores que tienen sentido para él, con tamaños de hasta
+10^6 nodos/aristas (Bellman-Ford y Floyd-Warshall se limitan a tamaños donde
+terminan en segundos), y se informa:
+
+- tiempo por fase (en los fragmentos que leen de ``cin`` la fase ``total``
+  incluye la lectura, porque la hace el propio snippet),
+- pico de memoria residente,
+- fallos: tiempo agotado, error y desborde de pila. La pila se limita a
+  ``--stack-mb`` (8 MB por defecto, como en muchos jueces); si un caso
+  revienta se repite sin límite para confirmar que el problema es la
+  recursión y no otra cosa.
+
+``Dijkstra.cpp`` y ``Prim.cpp`` usan ``pqg`` sin definirlo (lo informa
+``snippet_check.py``); aquí se define el alias para poder medirlos.
+
+Uso:
+    python benchmarks/bench_graphs.py [--sizes 10000 100000 1000000]
+        [--only dfs scc] [--stack-mb 8] [--repeat 1] [--out resultados.json]
+        [--compare anterior.json]
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from bench_common import (FLAGS, BENCH_HELPERS, compare_rows, environment, run_measured, save_results,
+                          section_snippets, snippet_hash)
+from graph_gen import cached_graph, read_header
+from snippet_check import SnippetChecker
+
+SECTION = "Graph"
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+GRAPH_INPUT = r"""
+static int bench_gn;
+static vector<pair<int, int>> bench_edges;
+// Formato de graph_gen.py: n m y luego m líneas u v w (el peso se descarta)
+static void bench_read_graph() {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+    int m;
+    long long w;
+    cin >> bench_gn >> m;
+    bench_edges.resize(m);
+    for (auto& [u, v] : bench_edges) cin >> u >> v >> w;
+}
+"""
+PQG = "template <class T> using pqg = priority_queue<T, vector<T>, greater<T>>;"
+
+# El fragmento lee el grafo de cin: se mide todo check_body()
+FRAGMENT_DRIVER = """int main() {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+    bench_start();
+    check_body();
+}"""
+
+# DFS.cpp y BFS.cpp recorren los globales n y adj
+ADJ_DRIVER = """int main() {
+    bench_read_graph();
+    n = bench_gn;
+    adj.assign(n + 1, {});
+    for (auto [u, v] : bench_edges) adj[u].push_back(v), adj[v].push_back(u);
+    bench_start();
+    check_body();
+}"""
+ADJ_TAIL = 'bench_sink = count(vis.begin(), vis.end(), true);\nbench_phase("run", 1);'
+ADJ_REPLACE = {"vector<int> adj[200005];": "vector<vector<int>> adj;"}
+
+SCC_DRIVER = """int main() {
+    bench_read_graph();
+    bench_start();
+    SCC scc(bench_gn);
+    for (auto [u, v] : bench_edges) scc.add_edge(u, v);
+    bench_phase("build", 1);
+    bench_sink = scc.get().size();
+    bench_phase("run", 1);
+}"""
+
+LCA_DRIVER = """int main() {
+    bench_read_graph();
+    int n = bench_gn;
+    mt19937 rng(12345);
+    vector<pair<int, int>> qs(n);
+    for (auto& [u, v] : qs) u = rng() % n + 1, v = rng() % n + 1;
+    bench_start();
+    LCA lca(n);
+    for (auto [u, v] : bench_edges) lca.add_edge(u, v);
+    lca.dfs();
+    bench_phase("build", 1);
+    long long acc = 0;
+    for (auto [u, v] : qs) acc += lca.query(u, v);
+    bench_sink = acc;
+    bench_phase("query", 1);
+}"""
+
+TOPO_DRIVER = """int main() {{
+    bench_read_graph();
+    vector<vector<int>> adj(bench_gn);
+    for (auto [u, v] : bench_edges) adj[u - 1].push_back(v - 1);
+    bench_start();
+    auto order = {call};
+    bench_phase("run", 1);
+    if ((int) order.size() != bench_gn) {{ fprintf(stderr, "orden incompleto\\n"); return 1; }}
+}}"""
+
+
+@dataclass
+class GraphBench:
+    stem: str
+    name: str
+    driver: str
+    generators: Sequence[str]
+    tail: str = ""
+    context: str = ""
+    replace: Optional[Dict[str, str]] = None
+    # Tamaño máximo con el que se corre (algoritmos cuadráticos o peores)
+    max_size: Optional[int] = None
+
+
+BENCHES: List[GraphBench] = [
+    GraphBench("Dijkstra", "dijkstra", FRAGMENT_DRIVER, ["sparse", "grid", "dijkstra_adv"],
+               tail='bench_phase("total", 1);', context=PQG),
+    GraphBench("Bellman Ford", "bellman_ford", FRAGMENT_DRIVER, ["sparse", "dense"],
+               tail='bench_sink = dist[n] + has_negative_cycle;\nbench_phase("total", 1);', max_size=30_000),
+    GraphBench("Floyd Warshall", "floyd_warshall", FRAGMENT_DRIVER, ["dense"],
+               tail='bench_sink = dist[1][n];\nbench_phase("total", 1);', max_size=500_000),
+    GraphBench("Kruskal", "kruskal", FRAGMENT_DRIVER, ["sparse", "grid", "dense"],
+               tail='bench_sink = mst_cost;\nbench_phase("total", 1);'),
+    GraphBench("Prim", "prim", FRAGMENT_DRIVER, ["sparse", "grid", "dense"],
+               tail='bench_sink = mst_cost;\nbench_phase("total", 1);', context=PQG),
+    GraphBench("SCC", "scc", SCC_DRIVER, ["sparse", "dag", "chain"]),
+    GraphBench("Lowest Common Ancestor LCA", "lca", LCA_DRIVER, ["tree", "chain"]),
+    GraphBench("Topo_Sort_DFS", "topo_dfs", TOPO_DRIVER.format(call="topo_sort(adj)"), ["dag", "chain"]),
+    GraphBench("Topo_Sort_Kahns_BFS", "topo_kahn", TOPO_DRIVER.format(call="topo_sort(bench_gn, adj)"),
+               ["dag", "chain"]),
+    GraphBench("DFS", "dfs", ADJ_DRIVER, ["sparse", "grid", "chain"], tail=ADJ_TAIL, replace=ADJ_REPLACE),
+    GraphBench("BFS", "bfs", ADJ_DRIVER, ["sparse", "grid", "chain"], tail=ADJ_TAIL, replace=ADJ_REPLACE),
+]
+
+
+def _row_from(bench: GraphBench, rel: str, digest: str, kind: str, size: int, path: Path, runs) -> Dict:
+    n, m = read_header(path)
+    ok = [r for r in runs if r.status == "ok"]
+    row = {"algorithm": bench.name, "snippet": rel, "snippet_hash": digest, "generator": kind, "size": size,
+           "n": n, "m": m, "status": "ok" if ok else runs[-1].status}
+    if ok:
+        best = min(ok, key=lambda r: sum(p.seconds for p in r.phases))
+        row["phases"] = {p.name: p.seconds for p in best.phases}
+        row["seconds"] = sum(row["phases"].values())
+        row["peak_rss_kb"] = max(r.peak_rss_kb or 0 for r in ok) or None
+    else:
+        row["detail"] = runs[-1].detail
+    return row
+
+
+def run_bench(checker: SnippetChecker, bench: GraphBench, rel: str, sizes: Sequence[int], repeat: int,
+              stack_bytes: Optional[int], timeout: float, out_dir: Path) -> List[Dict]:
+    binary = checker.build_program(rel, bench.driver, out_dir, bench.name, FLAGS, replace=bench.replace,
+                                   context="\n".join((BENCH_HELPERS, GRAPH_INPUT, bench.context)), tail=bench.tail)
+    digest = snippet_hash(checker, rel)
+    rows = []
+    for kind in bench.generators:
+        for size in sizes:
+            if bench.max_size and size > bench.max_size:
+                logging.info(f"   {bench.name} {kind} {size}: omitido (máximo {bench.max_size})")
+                continue
+            path = cached_graph(out_dir / "inputs", kind, size)
+            runs = []
+            for _ in range(repeat):
+                runs.append(run_measured([binary], stdin_path=path, timeout=timeout, stack_bytes=stack_bytes))
+                if runs[-1].status != "ok":
+                    break
+            row = _row_from(bench, rel, digest, kind, size, path, runs)
+            if row["status"] == "pila" and stack_bytes is not None:
+                retry = run_measured([binary], stdin_path=path, timeout=timeout, stack_bytes=None)
+                row["unlimited_stack"] = retry.status
+                if retry.status == "ok":
+                    row["unlimited_stack_seconds"] = sum(p.seconds for p in retry.phases)
+            rows.append(row)
+            logging.info(f"   {bench.name} {kind} n={row['n']} m={row['m']}: "
+                         + (f"{row['seconds']:.3f} s" if row["status"] == "ok" else row["status"]))
+            if row["status"] == "tiempo":
+                # Los tamaños siguientes tampoco van a terminar
+                break
+    return rows
+
+
+def print_table(rows: List[Dict], stack_mb: int):
+    print(f"\n{'Algoritmo':<15} {'Generador':<13} {'n':>8} {'m':>8} {'seg':>8} {'RSS (MB)':>9}  Fases")
+    print("-" * 86)
+    for r in rows:
+        head = f"{r['algorithm']:<15} {r['generator']:<13} {r['n']:>8} {r['m']:>8}"
+        if r["status"] == "ok":
+            rss = f"{r['peak_rss_kb'] / 1024:.1f}" if r.get("peak_rss_kb") else "-"
+            phases = " ".join(f"{k}={v:.3f}" for k, v in r["phases"].items())
+            print(f"{head} {r['seconds']:>8.3f} {rss:>9}  {phases}")
+        elif r["status"] == "pila":
+            extra = ""
+            if "unlimited_stack" in r:
+                extra = (f" (sin límite: {r['unlimited_stack_seconds']:.3f} s)" if r["unlimited_stack"] == "ok"
+                         else f" (sin límite: {r['unlimited_stack']})")
+            print(f"{head}  💥 desborde de pila con {stack_mb} MB{extra}")
+        else:
+            print(f"{head}  ❌ {r['status']} {r.get('detail', '')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="tamaños ~max(V, E)")
+    parser.add_argument("--only", nargs="+", default=None, help="nombres de algoritmo a correr")
+    parser.add_argument("--stack-mb", type=int, default=8, help="límite de pila en MB (0 = sin límite)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=60.0, help="segundos por ejecución")
+    parser.add_argument("--out", type=Path, default=None, help="JSON de resultados")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON anterior para comparar tiempos")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    checker = SnippetChecker()
+    out_dir = checker.paths.build_dir / "bench" / "graphs"
+    snippets = section_snippets(SECTION, checker.paths)
+    for stem in sorted(set(snippets) - {b.stem for b in BENCHES}):
+        logging.info(f"⏭️ {snippets[stem]}: sin benchmark definido")
+    stack_bytes = args.stack_mb * 2 ** 20 if args.stack_mb > 0 else None
+
+    rows: List[Dict] = []
+    for bench in BENCHES:
+        if args.only and bench.name not in args.only:
+            continue
+        if bench.stem not in snippets:
+            logging.warning(f"⚠️ {SECTION}/{bench.stem}.cpp no está en Snippets/")
+            continue
+        logging.info(f"🔄 {bench.name}")
+        try:
+            rows.extend(run_bench(checker, bench, snippets[bench.stem], sorted(args.sizes), args.repeat,
+                                  stack_bytes, args.timeout, out_dir))
+        except RuntimeError as e:
+            logging.error(f"❌ {bench.name}: {e}")
+
+    print_table(rows, args.stack_mb)
+    out = args.out or checker.paths.build_dir / "bench" / "graphs.json"
+    save_results(out, {"environment": dict(environment(checker), stack_mb=args.stack_mb), "results": rows})
+    print(f"\n💾 Resultados en {out}")
+    if args.compare:
+        old = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        for line in compare_rows(old, rows, ("algorithm", "generator", "size"), metric="seconds"):
+            print(line)
+    sys.exit(0 if rows and all(r["status"] == "ok" for r in rows) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la etapa de sanitización de generate_pdf.py.
+
+Compara la implementación anterior (generador por carácter, archivos uno por
+uno) con la actual (expresión regular compilada + pool de hilos) sobre entradas
+grandes generadas al vuelo.
+
+Uso:
+    python benchmarks/bench_sanitize.py [--mb 8] [--files 400] [--repeat 5]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_pdf import decode_snippet, sanitize_text  # noqa: E402
+
+
+def sanitize_text_legacy(text: str) -> str:
+    """Versión original: filtra carácter por carácter con un generador."""
+    text = text.replace("\ufeff", "")
+    text = "".join(ch for ch in text if ch in "\n\t\r" or ord(ch) >= 32)
+    return text
+
+
+def make_source(size: int, seed: int = 0) -> str:
+    """Código C++ sintético con acentos, tabs y algún carácter de control."""
+    rng = random.Random(seed)
+    lines = [
+        "for (int i = 0; i < n; i++) {",
+        "\tdp[i] = max(dp[i - 1], a[i]); // versión rápida",
+        "    cout << \"número: \" << x << '\\n';",
+        "}",
+        "// Complejidad: O(n log n) — búsqueda binaria",
+    ]
+    out = []
+    total = 0
+    while total < size:
+        line = rng.choice(lines)
+        if rng.random() < 0.01:
+            line += "\x0c"
+        out.append(line)
+        total += len(line) + 1
+    return "\ufeff" + "\n".join(out)
+
+
+def legacy_stage(files, out_dir: Path):
+    for f in files:
+        raw = f.read_bytes()
+        try:
+            code = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            code = raw.decode("latin-1", errors="replace")
+        (out_dir / f.name).write_text(sanitize_text_legacy(code), encoding="utf-8", newline="\n")
+
+
+def current_stage(files, out_dir: Path, workers=None):
+    def work(f: Path):
+        code = sanitize_text(decode_snippet(f.read_bytes()))
+        (out_dir / f.name).write_text(code, encoding="utf-8", newline="\n")
+        return f
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(work, files))
+
+
+def best(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=8, help="tamaño del texto para sanitize_text (MB)")
+    parser.add_argument("--files", type=int, default=400, help="snippets sintéticos para la etapa completa")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_source(int(args.mb * 1024 * 1024))
+    assert sanitize_text(text) == sanitize_text_legacy(text)
+    old = best(lambda: sanitize_text_legacy(text), args.repeat)
+    new = best(lambda: sanitize_text(text), args.repeat)
+    mb = len(text.encode("utf-8")) / 1e6
+    print(f"sanitize_text ({mb:.1f} MB)")
+    print(f"  {'anterior':<10} {old * 1000:9.1f} ms  {mb / old:8.1f} MB/s")
+    print(f"  {'actual':<10} {new * 1000:9.1f} ms  {mb / new:8.1f} MB/s  (x{old / new:.1f})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src_dir, out_dir = Path(tmp) / "src", Path(tmp) / "out"
+        src_dir.mkdir()
+        out_dir.mkdir()
+        files = []
+        for i in range(args.files):
+            f = src_dir / f"snippet_{i:04d}.cpp"
+            f.write_text(make_source(20_000, seed=i), encoding="utf-8")
+            files.append(f)
+        total = sum(f.stat().st_size for f in files) / 1e6
+        old = best(lambda: legacy_stage(files, out_dir), args.repeat)
+        new = best(lambda: current_stage(files, out_dir), args.repeat)
+        print(f"leer/decodificar/sanitizar/escribir ({args.files} archivos, {total:.1f} MB)")
+        print(f"  {'anterior':<10} {old * 1000:9.1f} ms")
+        print(f"  {'actual':<10} {new * 1000:9.1f} ms  (x{old / new:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Generadores de grafos para los benchmarks de ``Snippets/Graph``.
+
+Todos producen el formato que leen los snippets: ``n m`` y luego ``m``
+líneas ``u v w`` (nodos 1-indexados, pesos positivos). ``size`` es
+aproximadamente ``max(V, E)``; cada generador reparte ese tamaño entre
+nodos y aristas según su forma. Los archivos se guardan en disco por
+``(tipo, tamaño, semilla)`` y se reutilizan entre corridas.
+"""
+
+import math
+import os
+import random
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+Edge = Tuple[int, int, int]
+Graph = Tuple[int, List[Edge]]
+
+MAX_W = 10 ** 9
+
+
+def _w(rng: random.Random) -> int:
+    return rng.randint(1, MAX_W)
+
+
+def _spanning_tree(rng: random.Random, n: int) -> List[Edge]:
+    """Árbol aleatorio con etiquetas permutadas (profundidad ~log n)."""
+    labels = list(range(1, n + 1))
+    rng.shuffle(labels)
+    return [(labels[rng.randrange(i)], labels[i], _w(rng)) for i in range(1, n)]
+
+
+def sparse(rng: random.Random, size: int) -> Graph:
+    """Conexo, E = 2V: árbol generador más aristas al azar."""
+    n = max(2, size // 2)
+    edges = _spanning_tree(rng, n)
+    edges += [(rng.randint(1, n), rng.randint(1, n), _w(rng)) for _ in range(size - len(edges))]
+    return n, edges
+
+
+def dense(rng: random.Random, size: int) -> Graph:
+    """Casi completo: V ~ sqrt(2E)."""
+    n = max(2, int(math.sqrt(2 * size)))
+    pairs = [(u, v) for u in range(1, n + 1) for v in range(u + 1, n + 1)]
+    rng.shuffle(pairs)
+    return n, [(u, v, _w(rng)) for u, v in pairs[:size]]
+
+
+def grid(rng: random.Random, size: int) -> Graph:
+    """Cuadrícula lado x lado con aristas a derecha y abajo (E ~ 2V, diámetro ~2 sqrt(V))."""
+    side = max(2, int(math.sqrt(size / 2)))
+    edges = []
+    for r in range(side):
+        for c in range(side):
+            u = r * side + c + 1
+            if c + 1 < side:
+                edges.append((u, u + 1, _w(rng)))
+            if r + 1 < side:
+                edges.append((u, u + side, _w(rng)))
+    return side * side, edges
+
+
+def tree(rng: random.Random, size: int) -> Graph:
+    """Árbol aleatorio con raíz 1 (padre de i elegido entre 1..i-1)."""
+    n = max(2, size)
+    return n, [(rng.randint(1, i - 1), i, _w(rng)) for i in range(2, n + 1)]
+
+
+def chain(rng: random.Random, size: int) -> Graph:
+    """Camino 1 -> 2 -> ... -> n: profundidad de recursión n en los DFS."""
+    n = max(2, size)
+    return n, [(i, i + 1, _w(rng)) for i in range(1, n)]
+
+
+def dag(rng: random.Random, size: int) -> Graph:
+    """DAG aleatorio (u -> v con u antes que v en un orden oculto), E = 2V."""
+    n = max(2, size // 2)
+    order = list(range(1, n + 1))
+    rng.shuffle(order)
+    edges = []
+    while len(edges) < size:
+        a, b = rng.randrange(n), rng.randrange(n)
+        if a != b:
+            a, b = min(a, b), max(a, b)
+            edges.append((order[a], order[b], _w(rng)))
+    return n, edges
+
+
+def dijkstra_adversarial(rng: random.Random, size: int) -> Graph:
+    """
+    Cada nodo de una cadena 1..k mejora la distancia de todos los nodos de un
+    conjunto H (pesos que bajan a lo largo de la cadena): k·|H| inserciones en
+    la cola de prioridad, casi todas obsoletas al salir.
+    """
+    k = h = max(2, int(math.sqrt(size)))
+    edges = [(i, i + 1, 1) for i in range(1, k)]
+    big = 4 * k * (h + 1)
+    for i in range(1, k + 1):
+        for j in range(h):
+            edges.append((i, k + 1 + j, big - i * (h + 1)))
+    # Aristas entre nodos de H: el costo de procesar una entrada obsoleta si no se descarta
+    edges += [(k + 1 + j, k + 1 + (j + 1) % h, 1) for j in range(h)]
+    return k + h, edges
+
+
+GENERATORS: Dict[str, Callable[[random.Random, int], Graph]] = {
+    "sparse": sparse,
+    "dense": dense,
+    "grid": grid,
+    "tree": tree,
+    "chain": chain,
+    "dag": dag,
+    "dijkstra_adv": dijkstra_adversarial,
+}
+
+
+def write_graph(path: Path, graph: Graph):
+    n, edges = graph
+    tmp = path.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp, "w", encoding="ascii", newline="\n") as fh:
+        fh.write(f"{n} {len(edges)}\n")
+        fh.write("".join(f"{u} {v} {w}\n" for u, v, w in edges))
+    os.replace(tmp, path)
+
+
+def read_header(path: Path) -> Tuple[int, int]:
+    with open(path, encoding="ascii") as fh:
+        n, m = fh.readline().split()
+    return int(n), int(m)
+
+
+def cached_graph(cache_dir: Path, kind: str, size: int, seed: int = 0) -> Path:
+    """Ruta del grafo ``kind`` de tamaño ``size``; se genera solo si no existe."""
+    path = cache_dir / f"{kind}_{size}_s{seed}.txt"
+    if not path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_graph(path, GENERATORS[kind](random.Random(f"{kind}:{size}:{seed}"), size))
+    return path
@@ -0,0 +1,91 @@
+"""
+Generadores de nubes de puntos enteros para los benchmarks de ``Snippets/Geometry``
+y ``Snippets/Manhattan Distance``.
+
+Formato: ``n`` y luego ``n`` líneas ``x y``. Igual que en ``graph_gen.py``,
+los archivos se guardan por ``(tipo, n, semilla)`` y se reutilizan.
+
+Los tipos de ``OUT_OF_CONTRACT`` generan entradas que los snippets no
+prometen soportar (``dx`` ya no cabe en i64): sirven para ver cómo fallan,
+no para medir precisión.
+"""
+
+import math
+import os
+import random
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+Point = Tuple[int, int]
+
+COORD = 10 ** 9
+# Cerca del borde de i64: |dx|, |x + y| <= 2^62 caben; los productos cruzados
+# y las diferencias de sumas (x1 + y1) - (x2 + y2) pueden desbordar
+HUGE = 2 ** 61
+# Fuera de contrato: |dx| puede llegar a 2^63
+OVERFLOW = 2 ** 62
+
+
+def uniform(rng: random.Random, n: int) -> List[Point]:
+    """Uniformes en [-1e9, 1e9]^2 (rango típico de concurso)."""
+    return [(rng.randint(-COORD, COORD), rng.randint(-COORD, COORD)) for _ in range(n)]
+
+
+def circle(rng: random.Random, n: int) -> List[Point]:
+    """Sobre un círculo de radio 1e9 (redondeados): casi todos en la envolvente."""
+    points = []
+    for _ in range(n):
+        t = rng.uniform(0, 2 * math.pi)
+        points.append((round(COORD * math.cos(t)), round(COORD * math.sin(t))))
+    return points
+
+
+def collinear(rng: random.Random, n: int) -> List[Point]:
+    """Todos sobre la recta y = 3x + 7, en orden aleatorio y con repetidos."""
+    xs = [rng.randint(-COORD // 3, COORD // 3) for _ in range(n)]
+    return [(x, 3 * x + 7) for x in xs]
+
+
+def huge(rng: random.Random, n: int) -> List[Point]:
+    """Uniformes en [-2^61, 2^61]^2: las diferencias caben en i64, los productos cruzados no."""
+    return [(rng.randint(-HUGE, HUGE), rng.randint(-HUGE, HUGE)) for _ in range(n)]
+
+
+def overflow(rng: random.Random, n: int) -> List[Point]:
+    """Uniformes en [-2^62, 2^62]^2: hasta las diferencias desbordan i64 (fuera de contrato)."""
+    return [(rng.randint(-OVERFLOW, OVERFLOW), rng.randint(-OVERFLOW, OVERFLOW)) for _ in range(n)]
+
+
+GENERATORS: Dict[str, Callable[[random.Random, int], List[Point]]] = {
+    "uniform": uniform,
+    "circle": circle,
+    "collinear": collinear,
+    "huge": huge,
+    "overflow": overflow,
+}
+OUT_OF_CONTRACT = {"overflow"}
+# Súbelo al cambiar un generador: los archivos en caché de versiones previas no se reutilizan
+CACHE_VERSION = 2
+
+
+def write_points(path: Path, points: List[Point]):
+    tmp = path.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp, "w", encoding="ascii", newline="\n") as fh:
+        fh.write(f"{len(points)}\n")
+        fh.write("".join(f"{x} {y}\n" for x, y in points))
+    os.replace(tmp, path)
+
+
+def read_points(path: Path) -> List[Point]:
+    with open(path, encoding="ascii") as fh:
+        n = int(fh.readline())
+        return [tuple(map(int, fh.readline().split())) for _ in range(n)]
+
+
+def cached_points(cache_dir: Path, kind: str, n: int, seed: int = 0) -> Path:
+    """Ruta de la nube ``kind`` con ``n`` puntos; se genera solo si no existe."""
+    path = cache_dir / f"{kind}_{n}_s{seed}_v{CACHE_VERSION}.txt"
+    if not path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_points(path, GENERATORS[kind](random.Random(f"{kind}:{n}:{seed}"), n))
+    return path
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Punto de entrada único del build, modelado como grafo de dependencias:
+
+    preamble ──┬──────────────► format ──┐
+               │                         ▼
+    index ──► sanitize ──► tex ──────► compile ──┬──► postprocess
+                                                 └──► booklet
+
+Los nodos cuyas dependencias ya terminaron corren en paralelo en un pool de
+hilos (pdflatex corre en su propio proceso). Un nodo con ``key`` se omite si
+la clave de sus entradas coincide con la registrada en ``build/manifest.json``
+(etapa ``pipeline``) y sus salidas existen. Los artefactos pasan en memoria:
+el nodo ``compile`` entrega los bytes del PDF directamente a la imposición.
+Las fases de nodos que se solapan en el tiempo solo registran tiempo de pared
+en el reporte: CPU y E/S son contadores de todo el proceso.
+
+Uso:
+    python build.py [--force] [--profile] [--no-booklet] [--check] [--workers N]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from generate_pdf import Generator, PDFConfig, content_hash
+
+# Cambiar si cambia la imposición para invalidar los cuadernillos guardados
+BOOKLET_VERSION = "1"
+
+
+@dataclass
+class Node:
+    name: str
+    run: Callable[[Dict[str, object]], object]
+    deps: Sequence[str] = ()
+    # Clave de las entradas; None: el nodo se ejecuta siempre (es incremental por dentro)
+    key: Optional[Callable[[Dict[str, object]], str]] = None
+    outputs: Sequence[Path] = ()
+    # Artefacto a entregar a los dependientes cuando el nodo se omite
+    cached: Optional[Callable[[], object]] = None
+    # Etapa y clave del manifiesto donde se registra (por defecto: pipeline/<nombre>)
+    record: Optional[Tuple[str, str]] = None
+
+
+class Pipeline:
+    STAGE = "pipeline"
+
+    def __init__(self, gen: Generator, nodes: List[Node], max_workers: Optional[int] = None, force: bool = False):
+        self.gen = gen
+        self.nodes = {node.name: node for node in nodes}
+        self.max_workers = max_workers
+        self.force = force
+        self.results: Dict[str, object] = {}
+        self.status: Dict[str, Dict] = {}
+
+    def _record(self, node: Node) -> Tuple[str, str]:
+        return node.record or (self.STAGE, node.name)
+
+    def _up_to_date(self, node: Node, key: Optional[str]) -> bool:
+        return (not self.force and key is not None
+                and self.gen.manifest.get(*self._record(node)) == key
+                and all(p.exists() for p in node.outputs))
+
+    def _execute(self, node: Node):
+        start = time.perf_counter()
+        key = node.key(self.results) if node.key else None
+        if self._up_to_date(node, key):
+            self.results[node.name] = node.cached() if node.cached else None
+            self.status[node.name] = {"status": "al día", "wall_s": time.perf_counter() - start}
+            return
+        # La clave anterior deja de valer hasta que el nodo termine bien
+        stage, name = self._record(node)
+        self.gen.manifest.stages.get(stage, {}).pop(name, None)
+        with self.gen.metrics.phase(f"node:{node.name}"):
+            result = node.run(self.results)
+        if result is False:
+            raise RuntimeError(f"el nodo {node.name} falló")
+        self.results[node.name] = result
+        if key is not None:
+            self.gen.manifest.set(stage, name, key)
+        self.status[node.name] = {"status": "ok", "wall_s": time.perf_counter() - start}
+
+    def run(self) -> bool:
+        pending = dict(self.nodes)
+        running = {}
+        failed = False
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if not failed:
+                    for name, node in list(pending.items()):
+                        if all(dep in self.status for dep in node.deps):
+                            running[pool.submit(self._execute, node)] = name
+                            del pending[name]
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logging.error(f"❌ {name}: {e}")
+                        self.status[name] = {"status": "error", "wall_s": 0.0}
+                        failed = True
+        for name in pending:
+            self.status[name] = {"status": "no ejecutado", "wall_s": 0.0}
+        self.gen.manifest.save()
+        return not failed
+
+    def print_summary(self):
+        width = max(len(name) for name in self.nodes)
+        print(f"\n{'Nodo':<{width}}  {'Estado':<13} {'Tiempo (ms)':>11}")
+        for name in self.nodes:
+            st = self.status.get(name, {"status": "-", "wall_s": 0.0})
+            print(f"{name:<{width}}  {st['status']:<13} {st['wall_s'] * 1000:>11.1f}")
+
+
+def build_nodes(gen: Generator, booklet: Optional[Path], check: bool = False) -> List[Node]:
+    paths = gen.paths
+
+    def compile_node(results):
+        gen.manifest.save()
+        if not gen.compile_pdf():
+            return False
+        return paths.output_pdf.read_bytes()
+
+    def booklet_node(results):
+        from create_booklet import create_booklet
+        create_booklet(results["compile"], booklet)
+        return booklet
+
+    def check_node(results):
+        from snippet_check import SnippetChecker, print_results
+        results = SnippetChecker(paths).check()
+        print_results(results)
+        return all(r.ok for r in results)
+
+    def format_node(results):
+        # Un .fmt que no se pudo generar no es fatal: se compila sin él
+        gen.ensure_format()
+        return None
+
+    def booklet_key(results):
+        return content_hash(results["compile"] + f"booklet-v{BOOKLET_VERSION}".encode())
+
+    nodes = [
+        Node("preamble", lambda r: gen.ensure_preamble()),
+        Node("index", lambda r: gen.index_sources()),
+        Node("sanitize", lambda r: gen.sanitize_sources(), deps=("index",)),
+        Node("tex", lambda r: gen.write_tex(gen.render_tex()), deps=("preamble", "sanitize")),
+    ]
+    compile_deps = ("tex",)
+    if gen.config.precompile_preamble:
+        nodes.append(Node("format", format_node, deps=("preamble",)))
+        compile_deps = ("tex", "format")
+    # Misma clave (etapa pdf) que Generator.generate: ambos puntos de entrada comparten el estado
+    nodes.append(Node("compile", compile_node, deps=compile_deps, key=lambda r: gen._compile_key(),
+                      outputs=(paths.output_pdf,), cached=paths.output_pdf.read_bytes, record=("pdf", "key")))
+    nodes.append(Node("postprocess", lambda r: gen.postprocess(), deps=("compile",)))
+    if booklet is not None:
+        nodes.append(Node("booklet", booklet_node, deps=("compile",), key=booklet_key, outputs=(booklet,)))
+    if check:
+        nodes.append(Node("check", check_node, deps=("index",)))
+    return nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build completo: PDF, métricas y cuadernillo")
+    parser.add_argument("--force", action="store_true", help="ejecutar todos los nodos aunque estén al día")
+    parser.add_argument("--profile", action="store_true", help="perfil de composición por snippet")
+    parser.add_argument("--no-booklet", action="store_true", help="no generar el cuadernillo")
+    parser.add_argument("--check", action="store_true", help="compilar también los snippets con g++")
+    parser.add_argument("--workers", type=int, default=None, help="nodos simultáneos")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    gen = Generator(PDFConfig(profile=args.profile))
+    gen.metrics.command = "build"
+    if not gen.paths.snippets_dir.exists():
+        logging.error(f"Directorio de snippets no encontrado: {gen.paths.snippets_dir}")
+        sys.exit(1)
+    booklet = None if args.no_booklet else gen.paths.project_dir / "Snippets_Booklet.pdf"
+    pipeline = Pipeline(gen, build_nodes(gen, booklet, args.check), args.workers, args.force)
+    ok = pipeline.run()
+    pipeline.print_summary()
+    gen.metrics.summary["ok"] = ok
+    gen.metrics.summary["up_to_date"] = pipeline.status.get("compile", {}).get("status") == "al día"
+    gen.metrics.summary["nodes"] = {name: st["status"] for name, st in pipeline.status.items()}
+    gen.metrics.save(gen.paths.build_dir)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Métricas del build: tiempos por fase y reporte JSON.
+
+Cada ejecución de generate_pdf.py o create_booklet.py registra sus fases
+(indexado, templates, sanitización, .tex, cada pasada de pdflatex, imposición)
+con tiempo de pared, tiempo de CPU (propio + procesos hijos) y bytes leídos y
+escritos por el proceso de Python. El resultado se guarda en
+``build/report_<comando>.json`` (``report_generate.json``, ``report_booklet.json``,
+...), así un comando no pisa el reporte de otro, y se agrega una línea a
+``build/report_history.jsonl``.
+
+CPU y E/S salen de contadores del proceso completo: si una fase se solapa
+con otra de otro hilo (nodos en paralelo de build.py) solo se registra su
+tiempo de pared y se marca con ``"overlapped": true``.
+
+Ejecutado directamente muestra el historial y marca las regresiones:
+
+    python build_metrics.py [--last 10] [--threshold 0.2]
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+REPORT_VERSION = 1
+REPORT_NAME = "report_{command}.json"
+HISTORY_NAME = "report_history.jsonl"
+
+OUTPUT_RE = re.compile(r"^Output written on .*? \((\d+) pages?, (\d+) bytes\)", re.MULTILINE)
+BOX_RE = re.compile(r"^(Overfull|Underfull) \\([hv])box", re.MULTILINE)
+WARNING_RE = re.compile(r"^(?:LaTeX|Package \w+) Warning:", re.MULTILINE)
+ERROR_RE = re.compile(r"^! ", re.MULTILINE)
+
+
+def _io_counters() -> Tuple[int, int]:
+    """Bytes leídos y escritos por este proceso (``/proc/self/io``; 0 si no existe)."""
+    try:
+        with open("/proc/self/io", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+
+def _cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def parse_latex_log(log_file: Path) -> Dict[str, int]:
+    """Páginas, tamaño y avisos de un ``.log`` de pdflatex (vacío si no existe)."""
+    try:
+        text = log_file.read_text(encoding="latin-1")
+    except OSError:
+        return {}
+    stats = {"pages": 0, "pdf_bytes": 0, "overfull_hbox": 0, "overfull_vbox": 0,
+             "underfull_hbox": 0, "underfull_vbox": 0, "warnings": len(WARNING_RE.findall(text)),
+             "errors": len(ERROR_RE.findall(text))}
+    m = OUTPUT_RE.search(text)
+    if m:
+        stats["pages"], stats["pdf_bytes"] = int(m.group(1)), int(m.group(2))
+    for kind, box in BOX_RE.findall(text):
+        stats[f"{kind.lower()}_{box}box"] += 1
+    return stats
+
+
+def merge_log_stats(stats: List[Dict[str, int]]) -> Dict[str, int]:
+    """Suma las estadísticas de varios logs (compilación por secciones)."""
+    total: Dict[str, int] = {}
+    for s in stats:
+        for key, value in s.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+class RunReport:
+    """Fases de una ejecución, en orden, y resumen final."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.started = datetime.datetime.now().isoformat(timespec="seconds")
+        self.phases: List[Dict] = []
+        self.summary: Dict = {}
+        self._wall0 = time.perf_counter()
+        self._cpu0 = _cpu_seconds()
+        self._io0 = _io_counters()
+        # Fases abiertas: [hilo, se solapó con otro hilo]
+        self._open: List[List] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str, **extra) -> Iterator[Dict]:
+        """Mide el bloque; el diccionario devuelto admite datos extra de la fase."""
+        state = [threading.get_ident(), False]
+        with self._lock:
+            for other in self._open:
+                if other[0] != state[0]:
+                    other[1] = state[1] = True
+            self._open.append(state)
+        wall, cpu, (read, written) = time.perf_counter(), _cpu_seconds(), _io_counters()
+        try:
+            yield extra
+        finally:
+            read2, written2 = _io_counters()
+            entry = {"name": name, "wall_s": round(time.perf_counter() - wall, 6)}
+            with self._lock:
+                self._open.remove(state)
+                if state[1]:
+                    # Los contadores incluyen el trabajo de las fases concurrentes
+                    entry["overlapped"] = True
+                else:
+                    entry.update(cpu_s=round(_cpu_seconds() - cpu, 6), read_bytes=read2 - read,
+                                 written_bytes=written2 - written)
+                self.phases.append({**entry, **extra})
+
+    def to_dict(self) -> Dict:
+        read, written = _io_counters()
+        return {
+            "version": REPORT_VERSION,
+            "command": self.command,
+            "started": self.started,
+            "wall_s": round(time.perf_counter() - self._wall0, 6),
+            "cpu_s": round(_cpu_seconds() - self._cpu0, 6),
+            "read_bytes": read - self._io0[0],
+            "written_bytes": written - self._io0[1],
+            "phases": self.phases,
+            **self.summary,
+        }
+
+    def save(self, build_dir: Path) -> Path:
+        """Escribe ``report_<comando>.json`` y agrega la ejecución al historial."""
+        data = self.to_dict()
+        build_dir.mkdir(parents=True, exist_ok=True)
+        path = build_dir / REPORT_NAME.format(command=self.command)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        with open(build_dir / HISTORY_NAME, "a", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False) + "\n")
+        latex = data.get("latex", {})
+        extra = f", {latex['pages']} páginas, {latex['overfull_hbox']} overfull" if latex else ""
+        logging.info(f"📊 Reporte en {path.relative_to(build_dir.parent).as_posix()} "
+                     f"({data['wall_s'] * 1000:.0f} ms{extra})")
+        return path
+
+
+def load_history(build_dir: Path) -> List[Dict]:
+    runs = []
+    try:
+        with open(build_dir / HISTORY_NAME, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    runs.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return runs
+
+
+def find_regressions(runs: List[Dict], threshold: float) -> List[Tuple[Dict, float]]:
+    """Ejecuciones más lentas que la mediana de las anteriores del mismo comando."""
+    flagged = []
+    previous: Dict[str, List[float]] = {}
+    for run in runs:
+        key = run.get("command", "")
+        # Un build sin cambios no es comparable con uno que compila
+        if run.get("up_to_date"):
+            continue
+        times = previous.setdefault(key, [])
+        if times:
+            median = sorted(times)[len(times) // 2]
+            if median > 0 and run["wall_s"] > median * (1 + threshold):
+                flagged.append((run, run["wall_s"] / median))
+        times.append(run["wall_s"])
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historial de builds y regresiones de tiempo")
+    parser.add_argument("--build-dir", type=Path, default=Path(__file__).parent / "build")
+    parser.add_argument("--last", type=int, default=10, help="ejecuciones a mostrar")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="fracción sobre la mediana anterior que cuenta como regresión")
+    args = parser.parse_args()
+
+    runs = load_history(args.build_dir)
+    if not runs:
+        print(f"Sin historial en {args.build_dir / HISTORY_NAME}")
+        sys.exit(1)
+    print(f"{'Inicio':<20} {'Comando':<10} {'Total (s)':>10} {'CPU (s)':>9} {'Páginas':>8} {'Overfull':>9}  Fase más lenta")
+    for run in runs[-args.last:]:
+        latex = run.get("latex", {})
+        slowest = max(run.get("phases", []), key=lambda p: p["wall_s"], default=None)
+        slow = f"{slowest['name']} ({slowest['wall_s']:.2f} s)" if slowest else "-"
+        print(f"{run['started']:<20} {run['command']:<10} {run['wall_s']:>10.2f} {run['cpu_s']:>9.2f} "
+              f"{latex.get('pages', '-'):>8} {latex.get('overfull_hbox', '-'):>9}  {slow}")
+    regressions = find_regressions(runs, args.threshold)
+    for run, ratio in regressions:
+        print(f"⚠️ {run['started']} {run['command']}: x{ratio:.2f} respecto a la mediana anterior")
+    sys.exit(1 if regressions and regressions[-1][0] is runs[-1] else 0)
+
+
+if __name__ == "__main__":
+    main()
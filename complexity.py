@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Verificación empírica de las cotas de complejidad declaradas en los snippets.
+
+Los comentarios de los snippets prometen cosas como ``O(sqrt(N))`` o
+``Hasta N = 10^8 aprox en 1s``. Para cada función de ``SPECS`` se toma el
+comentario que la precede, se compila un ``main`` que genera una entrada de
+tamaño ``N`` y cronometra solo la llamada, y se ejecuta con tamaños
+crecientes. Con los tiempos se ajusta el exponente de crecimiento
+(``t ~ N^k`` por mínimos cuadrados en escala log-log) y se compara con:
+
+- el exponente de la cota declarada en los mismos tamaños (``O(n log n)``
+  da algo más de 1), con una tolerancia;
+- el tiempo absoluto prometido (``Hasta N = 10^k [en Xs]``, 1 s si no se
+  indica), medido o extrapolado hasta ``10^k``.
+
+Las funciones baratas se repiten dentro del programa hasta que la medición
+supere unos milisegundos. Los resultados se guardan en
+``build/complexity/cache.json`` por hash de la unidad compilada, así que
+volver a correr sin cambios no compila ni ejecuta nada.
+
+Uso:
+    python complexity.py [FUNCION ...] [--force] [--tolerance 0.25]
+"""
+
+import argparse
+import ast
+import json
+import logging
+import math
+import re
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from generate_pdf import ProjectPaths, content_hash
+from snippet_check import DEPENDENCIES, SnippetChecker, read_snippet
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Cambiar si cambia la forma de medir para invalidar la caché
+COMPLEXITY_VERSION = "1"
+FLAGS = ["-std=gnu++17", "-O2", "-w"]
+# Tiempo mínimo de una medición; por debajo se repite la llamada (si la función lo admite)
+MIN_MEASURE_S = 0.02
+# Las mediciones más cortas no entran en el ajuste (ruido del reloj y del arranque)
+MIN_FIT_S = 0.002
+DEFAULT_CLAIM_SECONDS = 1.0
+# Margen sobre el tiempo absoluto prometido
+ABSOLUTE_SLACK = 1.5
+
+BIG_O_RE = re.compile(r"\bO\(")
+UP_TO_RE = re.compile(r"Hasta\s+N\s*=\s*10\^(\d+)(?:[^\n]*?\ben\s+(\d+(?:[.,]\d+)?)\s*s\b)?", re.IGNORECASE)
+
+DRIVER = """int main(int argc, char** argv) {{
+    long long N = atoll(argv[1]), R = atoll(argv[2]);
+    mt19937_64 rng(12345);
+    volatile long long sink = 0;
+    {setup}
+    auto t0 = chrono::steady_clock::now();
+    for (long long rep = 0; rep < R; rep++) {{ {work} }}
+    auto t1 = chrono::steady_clock::now();
+    fprintf(stderr, "CHECK_TIME %.9f %lld\\n", chrono::duration<double>(t1 - t0).count() / R, (long long) sink);
+}}"""
+
+# Con accesos aleatorios a memoria los fallos de caché suman ~0.3 al exponente medido
+RANDOM_ACCESS_TOLERANCE = 0.45
+
+# Genera en setup un DAG aleatorio de N nodos y 2N aristas (u -> v con u < v, etiquetas permutadas)
+RANDOM_DAG = """int n = N; vector<int> lab(n); iota(lab.begin(), lab.end(), 0); shuffle(lab.begin(), lab.end(), rng);
+    vector<vector<int>> adj(n);
+    for (long long i = 0; i < 2 * N; i++) { int u = rng() % n, v = rng() % n; if (u == v) continue;
+        if (u > v) swap(u, v); adj[lab[u]].push_back(lab[v]); }"""
+# Primo más grande <= N (sin cronometrar), el peor caso de los algoritmos por división
+LARGEST_PRIME = """long long p = max(2LL, N);
+    auto is_p = [](long long x) { if (x < 2) return false; for (long long d = 2; d * d <= x; d++) if (x % d == 0) return false; return true; };
+    while (!is_p(p)) p--;"""
+
+
+@dataclass
+class Spec:
+    name: str
+    snippet: str
+    # Función cuyo comentario previo contiene la cota
+    target: str
+    setup: str
+    work: str
+    sizes: Sequence[int]
+    # Cota a usar si el comentario no trae una O(...)
+    bound: Optional[str] = None
+    # Si la llamada puede repetirse para medir tiempos cortos
+    repeatable: bool = False
+    # Reemplazos en la unidad; CHECK_N se define con -D al compilar cada tamaño
+    replace: Dict[str, str] = field(default_factory=dict)
+    # Margen propio sobre el exponente (None: el global)
+    tolerance: Optional[float] = None
+
+
+SPECS: Dict[str, Spec] = {s.name: s for s in [
+    Spec("sieve_bitset", "Number Theory/Sieve_bitset.cpp", "sieve",
+         setup="", work="sieve(); sink = composite[N - 1];",
+         sizes=[10 ** 6, 3 * 10 ** 6, 10 ** 7, 3 * 10 ** 7, 10 ** 8], bound="n log(log(n))",
+         replace={"const int MAX_V = 1e7 + 5;": "const int MAX_V = CHECK_N + 5;"}),
+    Spec("sieve", "Number Theory/Sieve.cpp", "sieve",
+         setup="vector<bool> is_prime(N + 1);", work="sieve(is_prime); sink = is_prime[N];",
+         sizes=[10 ** 5, 10 ** 6, 10 ** 7, 3 * 10 ** 7], bound="n log(log(n))"),
+    Spec("divisores", "Number Theory/Number_Theory.cpp", "divisores",
+         setup="", work="sink += divisores(N - rep % 16).size();",
+         sizes=[10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8, 10 ** 9], bound="sqrt(n)", repeatable=True),
+    Spec("factorizar", "Number Theory/Number_Theory.cpp", "factorizar",
+         setup=LARGEST_PRIME, work="sink += factorizar(p).size();",
+         sizes=[10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8, 10 ** 9], bound="sqrt(n)", repeatable=True),
+    Spec("isPrime", "Number Theory/Number_Theory.cpp", "isPrime",
+         setup=LARGEST_PRIME, work="sink += isPrime(p);",
+         sizes=[10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8, 10 ** 9], repeatable=True),
+    Spec("euler_classic", "Number Theory/Euler_Toliente.cpp", "euler_classic",
+         setup=LARGEST_PRIME + " EulerTotiente e;", work="sink += e.euler_classic<long long>(p);",
+         sizes=[10 ** 4, 10 ** 6, 10 ** 8, 10 ** 10, 10 ** 12], repeatable=True),
+    Spec("euler_faster", "Number Theory/Euler_Toliente.cpp", "euler_faster",
+         setup="EulerTotiente e;", work="e.euler_faster(N);",
+         sizes=[10 ** 4, 10 ** 5, 10 ** 6, 3 * 10 ** 6]),
+    Spec("phi_1_to_n", "Number Theory/Phi_Euler.cpp", "phi_1_to_n",
+         setup="", work="phi_1_to_n(N);",
+         sizes=[10 ** 5, 10 ** 6, 10 ** 7, 3 * 10 ** 7]),
+    Spec("precompute_factorials", "Combinatory/Combinatory.cpp", "precompute_factorials",
+         setup="", work="precompute_factorials(); sink = invf[0];",
+         sizes=[10 ** 5, 10 ** 6, 3 * 10 ** 6, 10 ** 7],
+         replace={"const int MAXN = 1e6;": "const int MAXN = CHECK_N;"}),
+    Spec("topo_sort_dfs", "Graph/Topo_Sort_DFS.cpp", "topo_sort",
+         setup=RANDOM_DAG, work="sink += topo_sort(adj).size();",
+         sizes=[10 ** 4, 10 ** 5, 3 * 10 ** 5, 10 ** 6], tolerance=RANDOM_ACCESS_TOLERANCE),
+    Spec("topo_sort_kahn", "Graph/Topo_Sort_Kahns_BFS.cpp", "topo_sort",
+         setup=RANDOM_DAG, work="sink += topo_sort(n, adj).size();",
+         sizes=[10 ** 4, 10 ** 5, 3 * 10 ** 5, 10 ** 6], tolerance=RANDOM_ACCESS_TOLERANCE),
+    Spec("manhattan_mst_edges", "Manhattan Distance/Nearest_Neighbor_in_each_Octant.cpp", "manhattan_mst_edges",
+         setup="vector<point> ps(N); for (auto& q : ps) q = {(long long) (rng() % 1000000000), (long long) (rng() % 1000000000)};",
+         work="sink += manhattan_mst_edges(ps).size();",
+         sizes=[10 ** 4, 10 ** 5, 3 * 10 ** 5, 10 ** 6]),
+]}
+
+
+# ---------------------------------------------------------------------------
+# Cotas declaradas
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Claim:
+    bound: Optional[str] = None        # expresión de O(...), p. ej. "sqrt(N)"
+    up_to: Optional[int] = None        # Hasta N = 10^k
+    seconds: Optional[float] = None    # ... en X s
+
+
+def claim_comment(code: str, target: str) -> str:
+    """Comentarios que preceden a la definición de ``target`` (hasta un ``}`` o una línea en blanco)."""
+    lines = code.splitlines()
+    definition = re.compile(rf"\b{re.escape(target)}\s*\(")
+    for i, line in enumerate(lines):
+        if definition.search(line) and not line.lstrip().startswith("//") and line.rstrip().endswith("{"):
+            break
+    else:
+        return ""
+    comments: List[str] = []
+    for line in reversed(lines[:i]):
+        stripped = line.strip()
+        if stripped.startswith("//"):
+            comments.append(stripped)
+        elif stripped.startswith("}") or (not stripped and comments):
+            break
+    return "\n".join(reversed(comments))
+
+
+def header_comment(code: str) -> str:
+    """Comentarios iniciales del archivo (la cota suele declararse ahí)."""
+    comments = []
+    for line in code.splitlines():
+        if not line.strip().startswith("//"):
+            break
+        comments.append(line.strip())
+    return "\n".join(comments)
+
+
+def _big_o(text: str) -> Optional[str]:
+    """Contenido de ``O(...)`` con paréntesis balanceados (o hasta el fin de línea)."""
+    m = BIG_O_RE.search(text)
+    if not m:
+        return None
+    depth, out = 1, []
+    for c in text[m.end():]:
+        if c == "\n":
+            break
+        depth += (c == "(") - (c == ")")
+        if depth == 0:
+            break
+        out.append(c)
+    return "".join(out).strip() or None
+
+
+def parse_claim(comment: str) -> Claim:
+    claim = Claim(bound=_big_o(comment))
+    m = UP_TO_RE.search(comment)
+    if m:
+        claim.up_to = 10 ** int(m.group(1))
+        claim.seconds = float(m.group(2).replace(",", ".")) if m.group(2) else DEFAULT_CLAIM_SECONDS
+    return claim
+
+
+def _to_python(expr: str) -> str:
+    """``(N + M)*logN`` -> ``(n + n)*log(n)``: todas las variables de tamaño son n."""
+    expr = expr.lower().replace("^", "**")
+    expr = re.sub(r"\b(?:n|m|v|e)\b", "n", expr)
+    expr = re.sub(r"log\s*n\b", "log(n)", expr)
+    expr = re.sub(r"(\bn|\))\s*(?=(?:log|sqrt|n\b|\())", r"\1*", expr)
+    return expr
+
+
+def growth(expr: str, n: float) -> float:
+    """Evalúa la cota en ``n`` (solo +, *, /, **, log, sqrt y constantes)."""
+    funcs = {"log": lambda x: math.log(max(x, 2.0)), "sqrt": math.sqrt}
+
+    def ev(node):
+        if isinstance(node, ast.Expression):
+            return ev(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return float(node.value)
+        if isinstance(node, ast.Name) and node.id == "n":
+            return n
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mult, ast.Div, ast.Pow)):
+            a, b = ev(node.left), ev(node.right)
+            if isinstance(node.op, ast.Add):
+                return a + b
+            if isinstance(node.op, ast.Mult):
+                return a * b
+            return a / b if isinstance(node.op, ast.Div) else a ** b
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in funcs \
+                and len(node.args) == 1:
+            return funcs[node.func.id](ev(node.args[0]))
+        raise ValueError(f"expresión no soportada: {expr!r}")
+
+    return ev(ast.parse(_to_python(expr), mode="eval"))
+
+
+def fit_exponent(points: Sequence[Tuple[float, float]]) -> Optional[float]:
+    """Pendiente de log(y) contra log(x) por mínimos cuadrados."""
+    if len(points) < 2:
+        return None
+    xs = [math.log(x) for x, _ in points]
+    ys = [math.log(y) for _, y in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    den = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den if den else None
+
+
+# ---------------------------------------------------------------------------
+# Medición
+# ---------------------------------------------------------------------------
+
+def _big_stack():
+    # La recursión de los DFS no debe medir el límite de pila del sistema
+    soft, hard = resource.getrlimit(resource.RLIMIT_STACK)
+    resource.setrlimit(resource.RLIMIT_STACK, (hard, hard))
+
+
+def measure(binary: Path, n: int, repeat: int, repeatable: bool, timeout: float) -> Tuple[Optional[float], str]:
+    """Mejor tiempo por llamada de ``repeat`` ejecuciones; (None, motivo) si falla."""
+    reps = 1
+    best = None
+    preexec = _big_stack if resource is not None else None
+    for _ in range(repeat):
+        while True:
+            try:
+                proc = subprocess.run([str(binary), str(n), str(reps)], stdout=subprocess.DEVNULL,
+                                      stderr=subprocess.PIPE, text=True, timeout=timeout, preexec_fn=preexec)
+            except subprocess.TimeoutExpired:
+                return None, f"superó {timeout:.0f} s"
+            m = re.search(r"CHECK_TIME (\S+)", proc.stderr)
+            if proc.returncode != 0 or not m:
+                return None, f"código {proc.returncode} {proc.stderr.strip()[-200:]}"
+            seconds = float(m.group(1))
+            if repeatable and seconds * reps < MIN_MEASURE_S:
+                reps = min(reps * max(2, int(MIN_MEASURE_S / max(seconds * reps, 1e-7)) + 1), 10 ** 7)
+                continue
+            break
+        best = seconds if best is None else min(best, seconds)
+    return best, ""
+
+
+@dataclass
+class Verdict:
+    name: str
+    snippet: str
+    claim: Dict
+    bound: Optional[str]
+    points: List[Tuple[int, float]]
+    exponent: Optional[float] = None
+    expected_exponent: Optional[float] = None
+    at_limit_s: Optional[float] = None
+    at_limit_extrapolated: bool = False
+    problems: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems and not self.errors
+
+
+def judge(verdict: Verdict, claim: Claim, tolerance: float, min_fit_s: float = MIN_FIT_S):
+    """Compara el exponente ajustado y el tiempo absoluto con lo declarado."""
+    fit_points = [(n, t) for n, t in verdict.points if t >= min_fit_s]
+    verdict.exponent = fit_exponent(fit_points)
+    if verdict.exponent is None:
+        verdict.errors.append("mediciones insuficientes para ajustar el exponente")
+    if verdict.bound and fit_points:
+        try:
+            expected = [(n, growth(verdict.bound, n)) for n, _ in fit_points]
+            verdict.expected_exponent = fit_exponent(expected) if len(expected) > 1 else None
+        except (ValueError, OverflowError, SyntaxError) as e:
+            verdict.errors.append(str(e))
+    if verdict.exponent is not None and verdict.expected_exponent is not None \
+            and verdict.exponent > verdict.expected_exponent + tolerance:
+        verdict.problems.append(f"crece como N^{verdict.exponent:.2f}, la cota O({verdict.bound}) "
+                                f"permite ~N^{verdict.expected_exponent:.2f}")
+    if claim.up_to and verdict.points:
+        measured = dict(verdict.points)
+        if claim.up_to in measured:
+            verdict.at_limit_s = measured[claim.up_to]
+        else:
+            n, t = max(verdict.points)
+            if n < claim.up_to:
+                k = verdict.exponent if verdict.exponent is not None else 1.0
+                verdict.at_limit_s = t * (claim.up_to / n) ** k
+                verdict.at_limit_extrapolated = True
+        if verdict.at_limit_s is not None and verdict.at_limit_s > claim.seconds * ABSOLUTE_SLACK:
+            how = "extrapolado" if verdict.at_limit_extrapolated else "medido"
+            verdict.problems.append(f"N = {claim.up_to:.0e}: {verdict.at_limit_s:.2f} s ({how}), "
+                                    f"se declara {claim.seconds:g} s")
+
+
+class ComplexityChecker:
+    def __init__(self, checker: Optional[SnippetChecker] = None, repeat: int = 3, timeout: float = 20.0,
+                 tolerance: float = 0.25):
+        self.checker = checker or SnippetChecker(ProjectPaths())
+        self.repeat = repeat
+        self.timeout = timeout
+        self.tolerance = tolerance
+        self.work_dir = self.checker.paths.build_dir / "complexity"
+        self.cache_path = self.work_dir / "cache.json"
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _cache_key(self, spec: Spec) -> str:
+        code = "\n".join(read_snippet(self.checker.paths.snippets_dir / rel)
+                         for rel in [spec.snippet] + DEPENDENCIES.get(spec.snippet, []))
+        payload = json.dumps([COMPLEXITY_VERSION, self.checker.flags_key(FLAGS), code, asdict(spec), self.repeat])
+        return content_hash(payload.encode("utf-8"))
+
+    def _judge(self, verdict: Verdict, claim: Claim, spec: Spec):
+        tolerance = self.tolerance if spec.tolerance is None else spec.tolerance
+        # Las funciones repetidas ya se midieron durante al menos MIN_MEASURE_S en total
+        judge(verdict, claim, tolerance, 0.0 if spec.repeatable else MIN_FIT_S)
+
+    def run_spec(self, spec: Spec, cache: Dict[str, Dict], force: bool = False) -> Verdict:
+        code = read_snippet(self.checker.paths.snippets_dir / spec.snippet)
+        claim = parse_claim(claim_comment(code, spec.target))
+        if claim.bound is None and claim.up_to is None:
+            claim = parse_claim(header_comment(code))
+        if claim.bound is None and claim.up_to is None and spec.bound is None:
+            logging.warning(f"⚠️ {spec.name}: sin cota declarada")
+        key = self._cache_key(spec)
+        entry = cache.get(spec.name)
+        if not force and entry and entry.get("key") == key:
+            points = [tuple(p) for p in entry["points"]]
+            verdict = Verdict(spec.name, spec.snippet, asdict(claim), claim.bound or spec.bound, points,
+                              errors=entry.get("errors", []), cached=True)
+            self._judge(verdict, claim, spec)
+            return verdict
+
+        verdict = Verdict(spec.name, spec.snippet, asdict(claim), claim.bound or spec.bound, [])
+        driver = DRIVER.format(setup=spec.setup, work=spec.work)
+        binary = None
+        for n in spec.sizes:
+            start = time.perf_counter()
+            try:
+                if spec.replace or binary is None:
+                    flags = FLAGS + ([f"-DCHECK_N={n}"] if spec.replace else [])
+                    name = f"{spec.name}_{n}" if spec.replace else spec.name
+                    binary = self.checker.build_program(spec.snippet, driver, self.work_dir, name, flags, spec.replace)
+            except RuntimeError as e:
+                verdict.errors.append(str(e).splitlines()[0])
+                break
+            seconds, error = measure(binary, n, self.repeat, spec.repeatable, self.timeout)
+            if seconds is None:
+                verdict.errors.append(f"N = {n}: {error}")
+                break
+            verdict.points.append((n, seconds))
+            logging.info(f"   {spec.name} N = {n:.0e}: {seconds * 1000:.3f} ms "
+                         f"({time.perf_counter() - start:.1f} s)")
+        cache[spec.name] = {"key": key, "points": verdict.points, "errors": verdict.errors}
+        self._judge(verdict, claim, spec)
+        return verdict
+
+    def run(self, names: Optional[List[str]] = None, force: bool = False) -> List[Verdict]:
+        cache = self._load_cache()
+        self.checker.ensure_pch(FLAGS)
+        verdicts = []
+        for name in names or list(SPECS):
+            verdicts.append(self.run_spec(SPECS[name], cache, force))
+            self.work_dir.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+        return verdicts
+
+
+def print_table(verdicts: List[Verdict]):
+    width = max(len(v.name) for v in verdicts)
+    print(f"\n{'Función':<{width}}  {'Cota':<16} {'Exp.':>5} {'Esperado':>8} {'Al límite (s)':>13}")
+    print("-" * (width + 48))
+    for v in verdicts:
+        exp = f"{v.exponent:.2f}" if v.exponent is not None else "-"
+        expected = f"{v.expected_exponent:.2f}" if v.expected_exponent is not None else "-"
+        limit = f"{v.at_limit_s:.3f}{'*' if v.at_limit_extrapolated else ''}" if v.at_limit_s is not None else "-"
+        mark = "✅" if v.ok else "❌"
+        print(f"{v.name:<{width}}  {(v.bound or '-')[:16]:<16} {exp:>5} {expected:>8} {limit:>13} {mark}")
+    for v in verdicts:
+        for msg in v.problems + v.errors:
+            print(f"❌ {v.name} ({v.snippet}): {msg}")
+    print("(* extrapolado)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contrasta las cotas de complejidad declaradas con mediciones")
+    parser.add_argument("names", nargs="*", help=f"funciones a medir: {', '.join(SPECS)} (por defecto, todas)")
+    parser.add_argument("--force", action="store_true", help="ignorar la caché de mediciones")
+    parser.add_argument("--repeat", type=int, default=3, help="ejecuciones por tamaño (se toma la mejor)")
+    parser.add_argument("--timeout", type=float, default=20.0, help="segundos por ejecución")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="margen sobre el exponente esperado")
+    parser.add_argument("--json", type=Path, help="guardar también los resultados en JSON")
+    args = parser.parse_args()
+    unknown = [n for n in args.names if n not in SPECS]
+    if unknown:
+        parser.error(f"funciones desconocidas: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    verdicts = ComplexityChecker(repeat=args.repeat, timeout=args.timeout, tolerance=args.tolerance) \
+        .run(args.names or None, args.force)
+    print_table(verdicts)
+    if args.json:
+        args.json.write_text(json.dumps([asdict(v) for v in verdicts], indent=1), encoding="utf-8")
+    sys.exit(0 if all(v.ok for v in verdicts) else 1)
+
+
+if __name__ == "__main__":
+    main()
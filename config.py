@@ -9,7 +9,7 @@ You can import and use these configurations in your own scripts.
 Author: DóndeEstásCR7
 """
 
-from generate_snippets_pdf import PDFConfig, FontSize, PageOrientation, SnippetPDFGenerator
+from generate_snippets_pdf import PDFConfig, FontSize, PageOrientation, SnippetPDFGenerator, build_variants, print_timing_table
 
 # ===============================
 # CONFIGURACIONES PREDEFINIDAS
@@ -215,31 +215,35 @@ def get_presentation_config():
 # FUNCIÓN PRINCIPAL DE EJEMPLOS
 # ===============================
 
+EXAMPLES = [
+    ("Básico", get_default_config, "snippets_default"),
+    ("Portrait", get_portrait_config, "snippets_portrait"),
+    ("Fuente Grande", get_large_font_config, "snippets_large_font"),
+    ("Compacto", get_compact_config, "snippets_compact"),
+    ("Espaciado Personalizado", get_custom_spacing_config, "snippets_custom_spacing"),
+    ("Competencia", get_competition_config, "snippets_competition"),
+    ("Estudio", get_study_config, "snippets_study"),
+    ("Presentación", get_presentation_config, "snippets_presentation")
+]
+
+def all_configs():
+    """Nombre de salida -> configuración, para ``build_variants``."""
+    return {output_name: config_func() for _, config_func, output_name in EXAMPLES}
+
 def run_examples():
-    """Ejecuta todos los ejemplos de configuración."""
+    """Ejecuta todos los ejemplos de configuración (en paralelo, un solo indexado)."""
     print("🚀 Ejecutando ejemplos de configuración...\n")
     
-    examples = [
-        ("Básico", get_default_config, "snippets_default"),
-        ("Portrait", get_portrait_config, "snippets_portrait"),
-        ("Fuente Grande", get_large_font_config, "snippets_large_font"),
-        ("Compacto", get_compact_config, "snippets_compact"),
-        ("Espaciado Personalizado", get_custom_spacing_config, "snippets_custom_spacing"),
-        ("Competencia", get_competition_config, "snippets_competition"),
-        ("Estudio", get_study_config, "snippets_study"),
-        ("Presentación", get_presentation_config, "snippets_presentation")
-    ]
-    
-    for name, config_func, output_name in examples:
-        print(f"📄 Generando {name}...")
-        config = config_func()
-        success = generate_with_config(config, output_name)
-        if success:
-            print(f"✅ {name} completado\n")
+    results = build_variants(all_configs())
+    names = {output_name: name for name, _, output_name in EXAMPLES}
+    for result in results:
+        if result.ok:
+            print(f"✅ {names[result.name]} completado: {result.name}.pdf")
         else:
-            print(f"❌ {name} falló\n")
+            print(f"❌ {names[result.name]} falló")
+    print_timing_table(results)
     
-    print("🎉 Todos los ejemplos completados!")
+    print("\n🎉 Todos los ejemplos completados!")
 
 if __name__ == "__main__":
     # Ejecutar ejemplos si se ejecuta directamente
@@ -5,17 +5,29 @@ Imprime 2 páginas por cara (4 por hoja), ordenadas para crear un libro
 al apilar y doblar las hojas.
 """
 
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import os
 import sys
 from pathlib import Path
+from typing import BinaryIO, Union
+
+from build_metrics import RunReport
 
 # Intentar importar desde pypdf primero (versión moderna)
 try:
-    from pypdf import PdfReader, PdfWriter, PageObject, Transformation
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.generic import (ArrayObject, DecodedStreamObject, DictionaryObject, FloatObject, IndirectObject,
+                               NameObject, StreamObject)
 except ImportError:
     # Si falla, intentar PyPDF2 (versión antigua)
     try:
-        from PyPDF2 import PdfReader, PdfWriter, PageObject
-        from PyPDF2.generic import Transformation
+        from PyPDF2 import PdfReader, PdfWriter
+        from PyPDF2.generic import (ArrayObject, DecodedStreamObject, DictionaryObject, FloatObject, IndirectObject,
+                                    NameObject, StreamObject)
     except ImportError:
         print("Error: pypdf o PyPDF2 no están instalados.")
         print("Instala con uno de estos comandos:")
@@ -24,111 +36,369 @@ except ImportError:
         sys.exit(1)
 
 
-def create_booklet(input_pdf: Path, output_pdf: Path):
+def booklet_order(pages_needed: int):
     """
-    Crea un PDF en formato cuadernillo desde un PDF normal.
-    
+    Devuelve, por cada hoja, los índices (base 0) de las páginas en cada posición.
+
+    Returns:
+        Lista de tuplas ``(anverso_izq, anverso_der, reverso_izq, reverso_der)``
+    """
+    sheets = []
+    for sheet in range(pages_needed // 4):
+        # Cara frontal (anverso): páginas exteriores
+        front_left_idx = pages_needed - 1 - (sheet * 2)
+        front_right_idx = sheet * 2
+        # Cara trasera (reverso): páginas interiores
+        back_left_idx = sheet * 2 + 1
+        back_right_idx = pages_needed - 2 - (sheet * 2)
+        sheets.append((front_left_idx, front_right_idx, back_left_idx, back_right_idx))
+    return sheets
+
+
+def page_to_xobject(writer: PdfWriter, page):
+    """
+    Convierte una página de origen en un Form XObject del writer.
+
+    Los recursos se clonan a través del writer, que recuerda los objetos ya
+    copiados: una fuente o imagen compartida por varias páginas se escribe una
+    sola vez en la salida.
+    """
+    contents = page.get_contents()
+    xobject = DecodedStreamObject()
+    xobject.set_data(contents.get_data() if contents is not None else b"")
+    box = page.mediabox
+    xobject.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): ArrayObject([FloatObject(v) for v in (box.left, box.bottom, box.right, box.top)]),
+    })
+    resources = page.get("/Resources")
+    if resources is not None:
+        xobject[NameObject("/Resources")] = resources.clone(writer)
+    return writer._add_object(xobject.flate_encode())
+
+
+def impose_face(writer: PdfWriter, placements, width: float, height: float):
+    """
+    Agrega una cara de hoja que dibuja los XObjects dados.
+
     Args:
-        input_pdf: Ruta al PDF de entrada
-        output_pdf: Ruta al PDF de salida en formato cuadernillo
+        placements: Lista de ``(xobject, página_origen, desplazamiento_x)``
+    """
+    face = writer.add_blank_page(width=width, height=height)
+    names = DictionaryObject()
+    ops = []
+    for i, (xobject, page, tx) in enumerate(placements):
+        name = NameObject(f"/P{i}")
+        names[name] = xobject
+        # Matriz de transformación: trasladar el origen de la página a su posición
+        dx = tx - float(page.mediabox.left)
+        dy = -float(page.mediabox.bottom)
+        ops.append(f"q 1 0 0 1 {dx:g} {dy:g} cm {name} Do Q")
+    face[NameObject("/Resources")] = DictionaryObject({NameObject("/XObject"): names})
+    content = DecodedStreamObject()
+    content.set_data("\n".join(ops).encode("ascii"))
+    face[NameObject("/Contents")] = writer._add_object(content.flate_encode())
+    return face
+
+
+def impose_signature(writer: PdfWriter, reader: PdfReader, start: int, signature_pages: int, verbose: bool = True,
+                     previous=None, changed_sheets=None):
+    """
+    Impone en ``writer`` las hojas de una firma (signature) del cuadernillo.
+
+    Args:
+        start: Índice (base 0) de la primera página de origen de la firma
+        signature_pages: Páginas de la firma (múltiplo de 4, con las en blanco)
+        verbose: Imprimir el orden de páginas de cada hoja
+        previous: Páginas del cuadernillo anterior; las hojas que no estén en
+            ``changed_sheets`` se copian de ahí en lugar de volver a imponerse
+
+    Returns:
+        Número de hojas impuestas
     """
-    reader = PdfReader(str(input_pdf))
-    writer = PdfWriter()
-    
     num_pages = len(reader.pages)
-    
-    # Redondear al múltiplo de 4 más cercano (necesario para cuadernillos)
-    pages_needed = ((num_pages + 3) // 4) * 4
-    
+
     # Obtener dimensiones de la página original
     page_width = float(reader.pages[0].mediabox.width)
     page_height = float(reader.pages[0].mediabox.height)
-    
+
     # Dimensiones de la hoja final (2 páginas lado a lado)
     sheet_width = page_width * 2
     sheet_height = page_height
-    
-    # Calcular el orden de páginas para cuadernillo
-    num_sheets = pages_needed // 4  # Número de hojas físicas
-    
-    for sheet in range(num_sheets):
-        # Cara frontal (anverso): páginas exteriores
-        front_left_idx = pages_needed - 1 - (sheet * 2)
-        front_right_idx = sheet * 2
-        
-        # Cara trasera (reverso): páginas interiores
-        back_left_idx = sheet * 2 + 1
-        back_right_idx = pages_needed - 2 - (sheet * 2)
-        
-        print(f"Hoja {sheet + 1}: Anverso [{front_left_idx + 1}, {front_right_idx + 1}], Reverso [{back_left_idx + 1}, {back_right_idx + 1}]")
-        
-        # ==== CARA FRONTAL (ANVERSO) ====
-        front_page = PageObject.create_blank_page(width=sheet_width, height=sheet_height)
-        
-        # Página izquierda del anverso
-        if front_left_idx < num_pages:
-            left_content = reader.pages[front_left_idx]
-            # Posicionar en la izquierda (x=0)
-            front_page.merge_translated_page(left_content, tx=0, ty=0)
-        
-        # Página derecha del anverso
-        if front_right_idx < num_pages:
-            right_content = reader.pages[front_right_idx]
-            # Posicionar en la derecha (x=page_width)
-            front_page.merge_translated_page(right_content, tx=page_width, ty=0)
-        
-        writer.add_page(front_page)
-        
+
+    xobjects = {}
+
+    def placement(idx, tx):
+        idx += start
+        if idx >= num_pages:
+            return None
+        if idx not in xobjects:
+            xobjects[idx] = page_to_xobject(writer, reader.pages[idx])
+        return (xobjects[idx], reader.pages[idx], tx)
+
+    sheets = booklet_order(signature_pages)
+    for sheet, (front_left_idx, front_right_idx, back_left_idx, back_right_idx) in enumerate(sheets):
+        if previous is not None and sheet not in changed_sheets:
+            writer.add_page(previous[2 * sheet])
+            writer.add_page(previous[2 * sheet + 1])
+            continue
+        if verbose:
+            print(f"Hoja {sheet + 1}: Anverso [{start + front_left_idx + 1}, {start + front_right_idx + 1}], "
+                  f"Reverso [{start + back_left_idx + 1}, {start + back_right_idx + 1}]")
+
+        # ==== CARA FRONTAL (ANVERSO) ==== izquierda en x=0, derecha en x=page_width
+        front = [placement(front_left_idx, 0), placement(front_right_idx, page_width)]
+        impose_face(writer, [p for p in front if p], sheet_width, sheet_height)
+
         # ==== CARA TRASERA (REVERSO) ====
-        back_page = PageObject.create_blank_page(width=sheet_width, height=sheet_height)
-        
-        # Página izquierda del reverso
-        if back_left_idx < num_pages:
-            left_content_back = reader.pages[back_left_idx]
-            # Posicionar en la izquierda (x=0)
-            back_page.merge_translated_page(left_content_back, tx=0, ty=0)
-        
-        # Página derecha del reverso
-        if back_right_idx < num_pages:
-            right_content_back = reader.pages[back_right_idx]
-            # Posicionar en la derecha (x=page_width)
-            back_page.merge_translated_page(right_content_back, tx=page_width, ty=0)
-        
-        writer.add_page(back_page)
+        back = [placement(back_left_idx, 0), placement(back_right_idx, page_width)]
+        impose_face(writer, [p for p in back if p], sheet_width, sheet_height)
+
+    # Fusionar objetos idénticos que no compartían referencia (pypdf >= 5)
+    if hasattr(writer, "compress_identical_objects"):
+        writer.compress_identical_objects()
+    return len(sheets)
+
+
+def print_instructions():
+    print(f"\n📖 Instrucciones de impresión:")
+    print(f"   1. Imprime en modo 'doble cara' (o imprime impares, luego pares)")
+    print(f"   2. Imprime sin escalar ('tamaño real' o '100%')")
+    print(f"   3. Apila todas las hojas en orden")
+    print(f"   4. Dobla por la mitad y grapa en el centro")
+
+
+class _PageHasher:
+    """Hash del contenido de una página, incluidos sus recursos (fuentes, imágenes)."""
+
+    def __init__(self):
+        self._streams = {}
+
+    def _feed(self, h, obj, depth=0):
+        if depth > 32:
+            return
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            if key not in self._streams:
+                self._streams[key] = None  # evita ciclos
+                sub = hashlib.sha256()
+                self._feed(sub, obj.get_object(), depth + 1)
+                self._streams[key] = sub.digest()
+            h.update(self._streams[key] or b"")
+        elif isinstance(obj, StreamObject):
+            h.update(obj._data if isinstance(obj._data, bytes) else bytes(obj._data))
+            self._feed(h, DictionaryObject(obj), depth + 1)
+        elif isinstance(obj, dict):
+            for key in sorted(obj):
+                if key in ("/Parent", "/Annots"):
+                    continue
+                h.update(str(key).encode())
+                self._feed(h, obj[key], depth + 1)
+        elif isinstance(obj, list):
+            for item in obj:
+                self._feed(h, item, depth + 1)
+        else:
+            h.update(repr(obj).encode())
+
+    def page_hash(self, page) -> str:
+        h = hashlib.sha256()
+        contents = page.get_contents()
+        h.update(contents.get_data() if contents is not None else b"")
+        self._feed(h, page.get("/Resources"))
+        h.update(repr([float(v) for v in page.mediabox]).encode())
+        return h.hexdigest()
+
+
+def booklet_manifest_path(output_pdf: Path) -> Path:
+    return output_pdf.parent / "build" / "booklet_manifest.json"
+
+
+def _load_previous(output_pdf: Path, manifest_path: Path, page_hashes):
+    """
+    Devuelve ``(páginas_anteriores, hojas_cambiadas)`` si se puede reutilizar el
+    cuadernillo anterior, o ``(None, None)`` si hay que reconstruirlo entero.
+    """
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        st = output_pdf.stat()
+    except (OSError, ValueError):
+        return None, None
+    old_hashes = manifest.get("pages", [])
+    # El total de páginas cambia el orden de todas las hojas (y el "Page X of Y")
+    if len(old_hashes) != len(page_hashes) or manifest.get("output") != [st.st_mtime_ns, st.st_size]:
+        return None, None
+    pages_needed = ((len(page_hashes) + 3) // 4) * 4
+    changed = set()
+    for sheet, slots in enumerate(booklet_order(pages_needed)):
+        if any(idx < len(page_hashes) and page_hashes[idx] != old_hashes[idx] for idx in slots):
+            changed.add(sheet)
+    return PdfReader(str(output_pdf)).pages, changed
+
+
+def _open_input(input_pdf):
+    """``PdfReader`` acepta rutas o streams; los bytes en memoria se envuelven."""
+    if isinstance(input_pdf, (bytes, bytearray, memoryview)):
+        return io.BytesIO(input_pdf)
+    if isinstance(input_pdf, (str, Path)):
+        return str(input_pdf)
+    return input_pdf
+
+
+def create_booklet(input_pdf: Union[Path, bytes, BinaryIO], output_pdf: Path, incremental: bool = True):
+    """
+    Crea un PDF en formato cuadernillo desde un PDF normal.
+
+    Cada página de origen se convierte una única vez en un Form XObject que las
+    hojas colocan mediante matrices de transformación, en lugar de fusionar el
+    contenido de la página en cada hoja.
+
+    Con ``incremental`` se guarda un hash del contenido de cada página en
+    ``build/booklet_manifest.json``; si el número de páginas no cambió, solo se
+    vuelven a imponer las hojas con alguna página modificada y el resto se copia
+    del cuadernillo anterior.
+
+    Args:
+        input_pdf: Ruta al PDF de entrada, o su contenido (bytes o stream) ya en memoria
+        output_pdf: Ruta al PDF de salida en formato cuadernillo
+        incremental: Reutilizar las hojas sin cambios del cuadernillo anterior
+    """
+    reader = PdfReader(_open_input(input_pdf))
+    writer = PdfWriter()
     
-    # Guardar el PDF resultante
-    with open(output_pdf, 'wb') as f:
+    num_pages = len(reader.pages)
+    
+    # Redondear al múltiplo de 4 más cercano (necesario para cuadernillos)
+    pages_needed = ((num_pages + 3) // 4) * 4
+
+    hasher = _PageHasher()
+    page_hashes = [hasher.page_hash(page) for page in reader.pages]
+    manifest_path = booklet_manifest_path(output_pdf)
+    previous, changed = _load_previous(output_pdf, manifest_path, page_hashes) if incremental else (None, None)
+
+    # Todo el documento es una sola firma
+    num_sheets = impose_signature(writer, reader, 0, pages_needed, previous=previous, changed_sheets=changed)
+
+    # Guardar el PDF resultante (a un temporal: el anterior puede estar abierto en ``previous``)
+    tmp_output = output_pdf.with_name(output_pdf.name + ".tmp")
+    with open(tmp_output, 'wb') as f:
         writer.write(f)
+    os.replace(tmp_output, output_pdf)
+    st = output_pdf.stat()
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({"pages": page_hashes, "output": [st.st_mtime_ns, st.st_size]}), encoding="utf-8")
     
+    if previous is not None:
+        print(f"♻️ Hojas reutilizadas: {num_sheets - len(changed)}/{num_sheets}")
     print(f"✅ Cuadernillo creado exitosamente!")
     print(f"📄 Páginas originales: {num_pages}")
     print(f"📄 Páginas en cuadernillo: {pages_needed} (con {pages_needed - num_pages} páginas en blanco)")
     print(f"📋 Hojas a imprimir: {num_sheets} (imprimir ambas caras)")
     print(f"💾 Guardado en: {output_pdf}")
-    print(f"\n📖 Instrucciones de impresión:")
-    print(f"   1. Imprime en modo 'doble cara' (o imprime impares, luego pares)")
-    print(f"   2. Imprime sin escalar ('tamaño real' o '100%')")
-    print(f"   3. Apila todas las hojas en orden")
-    print(f"   4. Dobla por la mitad y grapa en el centro")
+    print_instructions()
+
+
+def signature_path(output_pdf: Path, number: int) -> Path:
+    return output_pdf.with_name(f"{output_pdf.stem}_firma{number:02d}{output_pdf.suffix}")
+
+
+def create_booklet_streaming(input_pdf: Path, output_pdf: Path, signature_sheets: int = 8, use_mmap: bool = False):
+    """
+    Crea el cuadernillo por firmas, con memoria acotada sin importar el largo del PDF.
+
+    El documento se divide en firmas de ``signature_sheets`` hojas (4 páginas por
+    hoja) que se imponen de forma independiente: cada firma usa un lector y un
+    escritor nuevos y se escribe a su propio archivo en cuanto termina, así que
+    en memoria solo vive una firma a la vez. Cada firma se dobla por separado y
+    luego se apilan en orden para encuadernar.
+
+    Args:
+        input_pdf: Ruta al PDF de entrada
+        output_pdf: Ruta base; las firmas se guardan como ``<nombre>_firmaNN.pdf``
+        signature_sheets: Hojas por firma
+        use_mmap: Leer la entrada a través de un mapeo en memoria del archivo
+
+    Returns:
+        Lista de archivos generados, en orden
+    """
+    signature_pages = max(1, signature_sheets) * 4
+    outputs = []
+    with open(input_pdf, "rb") as fh:
+        source = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap else fh
+        try:
+            num_pages = len(PdfReader(source).pages)
+            pages_needed = ((num_pages + 3) // 4) * 4
+            num_signatures = (pages_needed + signature_pages - 1) // signature_pages
+            for number, start in enumerate(range(0, pages_needed, signature_pages), 1):
+                pages = min(signature_pages, pages_needed - start)
+                source.seek(0)
+                # Lector nuevo por firma: su caché de objetos se libera al terminarla
+                reader = PdfReader(source)
+                writer = PdfWriter()
+                sheets = impose_signature(writer, reader, start, pages, verbose=False)
+                target = signature_path(output_pdf, number)
+                with open(target, "wb") as out:
+                    writer.write(out)
+                outputs.append(target)
+                print(f"Firma {number}/{num_signatures}: páginas {start + 1}-{start + pages}, {sheets} hoja(s) → {target}")
+                del reader, writer
+        finally:
+            if use_mmap:
+                source.close()
+
+    print(f"✅ Cuadernillo creado exitosamente!")
+    print(f"📄 Páginas originales: {num_pages}")
+    print(f"📄 Páginas en cuadernillo: {pages_needed} (con {pages_needed - num_pages} páginas en blanco)")
+    print(f"📋 Firmas: {len(outputs)} de hasta {signature_sheets} hoja(s); dobla cada firma por separado y apílalas en orden")
+    print_instructions()
+    return outputs
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Convierte un PDF en formato cuadernillo para impresión.")
+    parser.add_argument("input", nargs="?", default="Snippets.pdf", help="PDF de entrada (por defecto Snippets.pdf)")
+    parser.add_argument("output", nargs="?", default="Snippets_Booklet.pdf", help="PDF de salida")
+    parser.add_argument("--stream", action="store_true",
+                        help="imponer por firmas con memoria acotada, un archivo por firma")
+    parser.add_argument("--signature", type=int, default=8, metavar="HOJAS",
+                        help="hojas por firma en modo --stream (por defecto 8)")
+    parser.add_argument("--mmap", action="store_true", help="leer la entrada mediante mmap (modo --stream)")
+    parser.add_argument("--full", action="store_true", help="reimponer todas las hojas aunque no hayan cambiado")
+    args = parser.parse_args()
+
     # Archivos de entrada y salida
-    input_file = Path("Snippets.pdf")
-    output_file = Path("Snippets_Booklet.pdf")
+    input_file = Path(args.input)
+    output_file = Path(args.output)
     
     if not input_file.exists():
         print(f"❌ Error: No se encontró el archivo {input_file}")
         print(f"   Asegúrate de haber generado el PDF primero con: python generate_pdf.py")
         sys.exit(1)
     
+    report = RunReport("booklet")
     try:
-        create_booklet(input_file, output_file)
+        with report.phase("booklet", mode="stream" if args.stream else "full" if args.full else "incremental") as info:
+            if args.stream:
+                outputs = create_booklet_streaming(input_file, output_file, args.signature, args.mmap)
+                info["signatures"] = len(outputs)
+            else:
+                create_booklet(input_file, output_file, incremental=not args.full)
+                outputs = [output_file]
+            info["input_bytes"] = input_file.stat().st_size
+            info["output_bytes"] = sum(path.stat().st_size for path in outputs)
+        report.summary["ok"] = True
     except Exception as e:
         print(f"❌ Error creando el cuadernillo: {e}")
         import traceback
         traceback.print_exc()
+        report.summary["ok"] = False
         sys.exit(1)
+    finally:
+        try:
+            path = report.save(output_file.resolve().parent / "build")
+            print(f"📊 Reporte: {path}")
+        except OSError:
+            pass
 
 
 if __name__ == "__main__":
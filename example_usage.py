@@ -193,7 +193,7 @@ def run_all_examples():
     
     print("🎉 Todos los ejemplos completados!")
     print("\n📋 Resumen de archivos generados:")
-    print("   - Snippets.pdf (configuración por defecto)")
+    print("   - Snippets_<diseño>.pdf por cada ejemplo (p. ej. Snippets_landscape_2col_small.pdf)")
     print("   - Revisa el directorio para ver todos los archivos generados")
 
 if __name__ == "__main__":
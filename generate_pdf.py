@@ -4,16 +4,28 @@ Generate PDF from C++ snippets using an external preamble (preamble.tex)
 and \cppfile macro for including listings.
 """
 
+import argparse
 import os
 import sys
 import subprocess
 import datetime
+import hashlib
+import json
 import logging
+import time
 import unicodedata
 import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import highlight
+import tex_profile
+from latex_supervisor import log_failure, run_latex
+from build_metrics import RunReport, merge_log_stats, parse_latex_log
 
 
 @dataclass
@@ -21,6 +33,20 @@ class PDFConfig:
     title: str = "El Bicho"
     author: str = "DondeEstasCR7"
     date_format: str = "%d/%m/%Y"
+    max_latex_passes: int = 4
+    # Compila cada sección como documento independiente en paralelo y une los PDFs
+    parallel_sections: bool = False
+    max_workers: Optional[int] = None
+    # Vuelca el preámbulo a un formato precompilado (.fmt) y arranca pdflatex desde él
+    precompile_preamble: bool = False
+    # "listings" (\lstinputlisting) o "python" (resaltado previo con highlight.py)
+    highlighter: str = "listings"
+    # Hilos para leer/sanitizar/escribir snippets (None: valor por defecto de ThreadPoolExecutor)
+    io_workers: Optional[int] = None
+    # Sondas \pdfelapsedtime por snippet (ver tex_profile.py)
+    profile: bool = False
+    # Segundos máximos por pasada de pdflatex (None: sin límite)
+    latex_timeout: Optional[float] = 300
 
 
 @dataclass
@@ -32,6 +58,14 @@ class ProjectPaths:
     preamble_tex: Path = field(init=False)
     build_dir: Path = field(init=False)
     sanitized_dir: Path = field(init=False)
+    manifest: Path = field(init=False)
+    aux_cache_dir: Path = field(init=False)
+    sections_dir: Path = field(init=False)
+    format_dir: Path = field(init=False)
+    highlight_dir: Path = field(init=False)
+    index: Path = field(init=False)
+    snipignore: Path = field(init=False)
+    latex_cache: Path = field(init=False)
 
     def __post_init__(self):
         self.snippets_dir = self.project_dir / "Snippets"
@@ -40,60 +74,365 @@ class ProjectPaths:
         self.preamble_tex = self.project_dir / "preamble.tex"
         self.build_dir = self.project_dir / "build"
         self.sanitized_dir = self.build_dir / "sanitized"
+        self.manifest = self.build_dir / "manifest.json"
+        self.aux_cache_dir = self.build_dir / "aux"
+        self.sections_dir = self.build_dir / "sections"
+        self.format_dir = self.build_dir / "fmt"
+        self.highlight_dir = self.build_dir / "highlight"
+        self.index = self.build_dir / "index.json"
+        self.snipignore = self.project_dir / ".snipignore"
+        self.latex_cache = self.build_dir / "latex.json"
 
 
-class SnippetCollector:
-    def __init__(self, snippets_dir: Path):
+class SnippetRecord:
+    """Entrada compacta del índice: un ``.cpp`` con su stat, template y sección."""
+
+    __slots__ = ("path", "section", "mtime_ns", "size", "template", "template_stat", "digest")
+
+    def __init__(self, path: Path, section: str, mtime_ns: int, size: int,
+                 template: Optional[str] = None, template_stat: Optional[List[int]] = None,
+                 digest: Optional[str] = None):
+        self.path = path
+        self.section = section
+        self.mtime_ns = mtime_ns
+        self.size = size
+        # Texto de <nombre>.template (None si no existe) y su [mtime_ns, size]
+        self.template = template
+        self.template_stat = template_stat
+        # Hash del contenido, calculado a demanda y válido mientras el stat no cambie
+        self.digest = digest
+
+
+def _read_template(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            return fh.read().strip()
+    except Exception:
+        return ""
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Traduce un patrón estilo .gitignore; ``*`` y ``?`` no cruzan ``/``."""
+    out: List[str] = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                out.append("[^" + body[1:] + "]" if body.startswith("!") else "[" + body + "]")
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class SnipIgnore:
+    """Patrones de ``.snipignore`` compilados a expresiones regulares.
+
+    Se comparan contra la ruta relativa a ``Snippets/``; las carpetas se prueban
+    con ``/`` final, así que un patrón ``build/`` solo excluye directorios. Un
+    patrón sin ``/`` se aplica al nombre en cualquier nivel; uno que empieza con
+    ``/`` solo desde la raíz. ``!patrón`` vuelve a incluir lo que excluyó un
+    patrón anterior (gana el último que coincide); como en git, no rescata
+    archivos dentro de una carpeta excluida, porque esa carpeta no se recorre.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        # (regex, es negación) en el orden del archivo
+        self._rules: List[Tuple[re.Pattern, bool]] = []
+        for pat in patterns:
+            negated = pat.startswith("!")
+            if negated or pat.startswith("\\!"):
+                pat = pat[1:]
+            if not pat:
+                continue
+            dir_only = pat.endswith("/")
+            anchored = pat.startswith("/")
+            pat = pat.strip("/")
+            anchored = anchored or "/" in pat
+            prefix = "" if anchored else "(?:.*/)?"
+            self._rules.append((re.compile(prefix + _glob_to_regex(pat) + ("/" if dir_only else "/?") + r"\Z"),
+                                negated))
+        # Sin negaciones basta una única alternativa compilada
+        self._regex = None
+        if self._rules and not any(negated for _, negated in self._rules):
+            self._regex = re.compile("|".join(f"(?:{rx.pattern})" for rx, _ in self._rules))
+
+    @classmethod
+    def load(cls, path: Path) -> "SnipIgnore":
+        patterns: List[str] = []
+        try:
+            lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                patterns.append(line)
+        return cls(patterns)
+
+    def ignores(self, rel_path: str, is_dir: bool = False) -> bool:
+        path = rel_path + "/" if is_dir else rel_path
+        if self._regex is not None:
+            return self._regex.match(path) is not None
+        for regex, negated in reversed(self._rules):
+            if regex.match(path):
+                return not negated
+        return False
+
+
+class SnippetIndex:
+    """Índice de ``Snippets/`` construido en un único recorrido con ``os.scandir``.
+
+    Se persiste en ``build/index.json``; en la siguiente ejecución las entradas
+    cuyo mtime y tamaño no cambiaron (incluidos los templates) se reutilizan sin
+    volver a leer el disco.
+    """
+
+    VERSION = 1
+
+    def __init__(self, snippets_dir: Path, cache_path: Optional[Path] = None, ignore: Optional[SnipIgnore] = None):
         self.snippets_dir = snippets_dir
+        self.cache_path = cache_path
+        self.ignore = ignore or SnipIgnore([])
+        # Entradas excluidas por .snipignore en el último recorrido
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+        self.skipped_dirs = 0
+        self.sections: Optional[Dict[str, List[SnippetRecord]]] = None
+        self.folder_templates: Dict[str, str] = {}
+        self._folder_stats: Dict[str, List[int]] = {}
+        self._by_path: Dict[Path, SnippetRecord] = {}
 
-    def collect(self) -> Dict[str, List[Path]]:
-        sections: Dict[str, List[Path]] = {}
+    def _load_cache(self):
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (AttributeError, OSError, ValueError):
+            return {}, {}
+        if data.get("version") != self.VERSION:
+            return {}, {}
+        return data.get("records", {}), data.get("folders", {})
+
+    def scan(self) -> "SnippetIndex":
+        cached_records, cached_folders = self._load_cache() if self.sections is None else self._dump()
+        sections: Dict[str, List[SnippetRecord]] = {}
+        self.folder_templates = {}
+        self._folder_stats = {}
+        self.skipped_files = self.skipped_bytes = self.skipped_dirs = 0
         if not self.snippets_dir.exists():
-            return sections
-        for folder in sorted(self.snippets_dir.iterdir()):
-            if not folder.is_dir():
+            self.sections = sections
+            self._by_path = {}
+            return self
+        with os.scandir(self.snippets_dir) as it:
+            folders = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+        for folder in folders:
+            if self.ignore.ignores(folder.name, is_dir=True):
+                self.skipped_dirs += 1
                 continue
-            files = [p for p in sorted(folder.iterdir()) if p.suffix == ".cpp"]
-            if files:
-                sections[folder.name] = files
-        return sections
+            entries = {}
+            with os.scandir(folder.path) as it:
+                for e in it:
+                    if not e.is_file():
+                        continue
+                    if self.ignore.ignores(f"{folder.name}/{e.name}"):
+                        self.skipped_files += 1
+                        self.skipped_bytes += e.stat().st_size
+                        continue
+                    entries[e.name] = e
+            folder_template = entries.get("folder.template")
+            if folder_template is not None:
+                st = folder_template.stat()
+                stat = [st.st_mtime_ns, st.st_size]
+                cached = cached_folders.get(folder.name)
+                self.folder_templates[folder.name] = cached[2] if cached and cached[:2] == stat else _read_template(folder_template.path)
+                self._folder_stats[folder.name] = stat
+            records: List[SnippetRecord] = []
+            for name in sorted(entries):
+                if not name.endswith(".cpp"):
+                    continue
+                st = entries[name].stat()
+                stem = name[:-len(".cpp")]
+                key = f"{folder.name}/{name}"
+                cached = cached_records.get(key)
+                digest = cached[2] if cached and cached[:2] == [st.st_mtime_ns, st.st_size] else None
+                template = template_stat = None
+                t_entry = entries.get(stem + ".template")
+                if t_entry is not None:
+                    t_st = t_entry.stat()
+                    template_stat = [t_st.st_mtime_ns, t_st.st_size]
+                    if cached and cached[4] == template_stat:
+                        template = cached[3]
+                    else:
+                        template = _read_template(t_entry.path)
+                records.append(SnippetRecord(Path(entries[name].path), folder.name, st.st_mtime_ns, st.st_size,
+                                             template, template_stat, digest))
+            if records:
+                sections[folder.name] = records
+        self.sections = sections
+        self._by_path = {r.path: r for records in sections.values() for r in records}
+        return self
+
+    def _dump(self):
+        records = {f"{r.section}/{r.path.name}": [r.mtime_ns, r.size, r.digest, r.template, r.template_stat]
+                   for r in self._by_path.values()}
+        folders = {name: self._folder_stats[name] + [text] for name, text in self.folder_templates.items()}
+        return records, folders
+
+    def save(self):
+        if self.cache_path is None or self.sections is None:
+            return
+        records, folders = self._dump()
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": self.VERSION, "records": records, "folders": folders}), encoding="utf-8")
+        os.replace(tmp, self.cache_path)
+
+    def get(self, path: Path) -> Optional[SnippetRecord]:
+        return self._by_path.get(path)
+
+    def ensure_scanned(self) -> "SnippetIndex":
+        return self if self.sections is not None else self.scan()
+
+
+class SnippetCollector:
+    def __init__(self, snippets_dir: Path, index: Optional[SnippetIndex] = None):
+        self.snippets_dir = snippets_dir
+        self.index = index or SnippetIndex(snippets_dir)
+
+    def collect(self) -> Dict[str, List[Path]]:
+        sections = self.index.ensure_scanned().sections
+        return {folder: [r.path for r in records] for folder, records in sections.items()}
 
 
 class TemplateManager:
-    def __init__(self, snippets_dir: Path):
+    def __init__(self, snippets_dir: Path, index: Optional[SnippetIndex] = None):
         self.snippets_dir = snippets_dir
+        self.index = index or SnippetIndex(snippets_dir)
 
     def read_all(self) -> Dict[str, Dict[str, str]]:
+        index = self.index.ensure_scanned()
         info: Dict[str, Dict[str, str]] = {}
-        for folder in sorted(self.snippets_dir.iterdir()):
-            if not folder.is_dir():
-                continue
+        for folder in sorted(set(index.sections) | set(index.folder_templates)):
             folder_info: Dict[str, str] = {}
-            folder_template = folder / "folder.template"
-            if folder_template.exists():
-                try:
-                    folder_info["description"] = folder_template.read_text(encoding="utf-8", errors="replace").strip()
-                except Exception:
-                    folder_info["description"] = ""
-            for fp in folder.iterdir():
-                if fp.suffix == ".cpp":
-                    t = fp.with_suffix(".template")
-                    if t.exists():
-                        try:
-                            folder_info[fp.stem] = t.read_text(encoding="utf-8", errors="replace").strip()
-                        except Exception:
-                            folder_info[fp.stem] = ""
+            if folder in index.folder_templates:
+                folder_info["description"] = index.folder_templates[folder]
+            for r in index.sections.get(folder, []):
+                if r.template is not None:
+                    folder_info[r.path.stem] = r.template
             if folder_info:
-                info[folder.name] = folder_info
+                info[folder] = folder_info
         return info
 
+# BOM y caracteres de control excepto \n, \t, \r
+_UNSAFE_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufeff]")
+
+
 def sanitize_text(text: str) -> str:
     """Solo elimina BOM y caracteres de control, preserva acentos y UTF-8"""
-    # Eliminar BOM
-    text = text.replace("\ufeff", "")
-    # Solo eliminar caracteres de control excepto \n, \t, \r
-    text = "".join(ch for ch in text if ch in "\n\t\r" or ord(ch) >= 32)
-    return text
+    return _UNSAFE_CHARS.sub("", text)
+
+
+# Lo mismo a nivel de bytes (el BOM en UTF-8 es EF BB BF)
+_UNSAFE_BYTES = re.compile(b"[\x00-\x08\x0b\x0c\x0e-\x1f]|\xef\xbb\xbf")
+
+
+def is_clean_snippet(raw: bytes) -> bool:
+    """True si ``raw`` ya es UTF-8 válido sin BOM ni caracteres de control."""
+    if _UNSAFE_BYTES.search(raw):
+        return False
+    try:
+        raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def decode_snippet(raw: bytes) -> str:
+    """Decodifica con la cadena de respaldo utf-8 -> cp1252 -> latin-1."""
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        try:
+            return raw.decode('cp1252')
+        except UnicodeDecodeError:
+            return raw.decode('latin-1', errors='replace')
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Escribe el archivo solo si su contenido cambió. Devuelve True si se escribió."""
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+class BuildManifest:
+    """Manifiesto persistente con los hashes de contenido de cada etapa del build.
+
+    Se guarda como JSON en ``build/manifest.json`` con la forma
+    ``{"stages": {etapa: {clave: hash}}}``.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.stages: Dict[str, Dict[str, str]] = {}
+        self.load()
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if data.get("version") == self.VERSION:
+            self.stages = data.get("stages", {})
+        else:
+            self.stages = {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": self.VERSION, "stages": self.stages}, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def get(self, stage: str, key: str) -> Optional[str]:
+        return self.stages.get(stage, {}).get(key)
+
+    def set(self, stage: str, key: str, digest: str):
+        self.stages.setdefault(stage, {})[key] = digest
+
+    def retain(self, stage: str, keys):
+        """Descarta las entradas de la etapa que no estén en ``keys``."""
+        entries = self.stages.get(stage, {})
+        for key in set(entries) - set(keys):
+            del entries[key]
 
 
 def normalize_ascii_filename(name: str) -> str:
@@ -108,14 +447,48 @@ def normalize_ascii_filename(name: str) -> str:
 
 
 class PDFCompiler:
-    def __init__(self, latex_cmd: str = "pdflatex"):
+    def __init__(self, latex_cmd: str = "pdflatex", cache_file: Optional[Path] = None,
+                 timeout: Optional[float] = None):
         self.latex_cmd = latex_cmd
-        self._latex_path = self._find_latex()
+        self.cache_file = cache_file
+        self.timeout = timeout
+        self._latex_path = self._cached_latex() or self._find_latex()
+        # Formato precompilado (.fmt) con el que arranca cada pasada, si existe
+        self.format_file: Optional[Path] = None
+
+    def _cache_key(self) -> str:
+        return f"{self.latex_cmd}|{os.environ.get('PATH', '')}"
+
+    def _cached_latex(self) -> Optional[str]:
+        """Ruta de pdflatex guardada por un build anterior, si sigue siendo válida."""
+        if self.cache_file is None:
+            return None
+        try:
+            cached = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            if cached["key"] != self._cache_key():
+                return None
+            if os.stat(cached["resolved"]).st_mtime_ns != cached["mtime_ns"]:
+                return None
+            return cached["path"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store_latex(self, path: str):
+        resolved = shutil.which(path)
+        if self.cache_file is None or resolved is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_text(json.dumps({"key": self._cache_key(), "path": path, "resolved": resolved,
+                                                   "mtime_ns": os.stat(resolved).st_mtime_ns}), encoding="utf-8")
+        except OSError:
+            pass
 
     def _find_latex(self) -> str:
         try:
             result = subprocess.run([self.latex_cmd, "--version"], capture_output=True, text=True, timeout=5)
             if result.returncode == 0:
+                self._store_latex(self.latex_cmd)
                 return self.latex_cmd
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
@@ -129,33 +502,149 @@ class PDFCompiler:
         for p in candidates:
             if Path(p).exists():
                 logging.info(f"✅ Encontrado pdflatex en: {p}")
+                self._store_latex(p)
                 return p
         logging.warning(f"⚠️ No se encontró pdflatex en ubicaciones conocidas, usando: {self.latex_cmd}")
         return self.latex_cmd
 
-    def compile(self, tex_file: Path) -> bool:
+    def compile(self, tex_file: Path, cwd: Optional[Path] = None) -> bool:
+        """Compila ``tex_file`` dejando los resultados junto a él.
+
+        ``cwd`` es el directorio desde el que se resuelven los \\input relativos
+        (por defecto, el del propio .tex). La salida se supervisa en streaming:
+        ante el primer error o si se supera ``timeout`` se detiene pdflatex.
+        """
+        cwd = cwd or tex_file.parent
+        cmd = [self._latex_path, "-interaction=nonstopmode", "-file-line-error", "-shell-escape",
+               f"-output-directory={tex_file.parent}"]
+        env = None
+        if self.format_file is not None:
+            cmd.append(f"-fmt={self.format_file.stem}")
+            env = dict(os.environ, TEXFORMATS=f"{self.format_file.parent}{os.pathsep}")
+        cmd.append(str(tex_file))
         try:
-            cmd = [self._latex_path, "-interaction=nonstopmode", "-shell-escape", str(tex_file)]
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
-            return True
-        except subprocess.CalledProcessError as e:
-            logging.error("Error compilando PDF")
-            logging.error(e.stdout)
-            logging.error(e.stderr)
-            return False
+            result = run_latex(cmd, cwd, env, self.timeout)
         except FileNotFoundError:
             logging.error(f"Comando no encontrado: {self._latex_path}")
             return False
+        if not result.ok:
+            log_failure(result, cwd, self.timeout)
+        return result.ok
+
+    def dump_format(self, stub_tex: Path, fmt_file: Path, cwd: Path) -> bool:
+        """Vuelca con mylatexformat todo lo anterior a \\begin{document} de ``stub_tex``."""
+        cmd = [self._latex_path, "-ini", "-interaction=nonstopmode", "-shell-escape",
+               f"-jobname={fmt_file.stem}", f"-output-directory={fmt_file.parent}",
+               "&pdflatex", "mylatexformat.ltx", stub_tex.relative_to(cwd).as_posix()]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True, cwd=cwd, timeout=self.timeout)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logging.warning(f"⚠️ No se pudo precompilar el preámbulo: {e}")
+            return False
+        return fmt_file.exists()
+
+
+class PassScheduler:
+    """Repite pdflatex solo mientras cambien los archivos auxiliares (.aux, .toc, .out).
+
+    Antes de la primera pasada se siembran los auxiliares del build anterior, de
+    modo que un documento cuyo layout no cambió converge en una sola pasada.
+    """
+
+    AUX_SUFFIXES = (".aux", ".toc", ".out")
+
+    def __init__(self, compiler: PDFCompiler, max_passes: int = 4, cache_dir: Optional[Path] = None,
+                 metrics: Optional[RunReport] = None):
+        self.compiler = compiler
+        self.max_passes = max(1, max_passes)
+        self.cache_dir = cache_dir
+        self.metrics = metrics
+        self.passes = 0
+
+    def _snapshot(self, tex_file: Path) -> Dict[str, Optional[str]]:
+        digests: Dict[str, Optional[str]] = {}
+        for suffix in self.AUX_SUFFIXES:
+            try:
+                digests[suffix] = content_hash(tex_file.with_suffix(suffix).read_bytes())
+            except OSError:
+                digests[suffix] = None
+        return digests
+
+    def _seed(self, tex_file: Path):
+        if self.cache_dir is None:
+            return
+        for suffix in self.AUX_SUFFIXES:
+            target = tex_file.with_suffix(suffix)
+            cached = self.cache_dir / target.name
+            if not target.exists() and cached.exists():
+                shutil.copyfile(cached, target)
+
+    def _store(self, tex_file: Path):
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for suffix in self.AUX_SUFFIXES:
+            source = tex_file.with_suffix(suffix)
+            if source.exists():
+                shutil.copyfile(source, self.cache_dir / source.name)
+
+    def run(self, tex_file: Path, cwd: Optional[Path] = None) -> bool:
+        self._seed(tex_file)
+        before = self._snapshot(tex_file)
+        self.passes = 0
+        while self.passes < self.max_passes:
+            self.passes += 1
+            logging.info(f"🔨 Compilando PDF (pasada {self.passes})...")
+            with self.metrics.phase(f"pdflatex pass {self.passes}") if self.metrics else nullcontext():
+                ok = self.compiler.compile(tex_file, cwd)
+            if not ok:
+                return False
+            after = self._snapshot(tex_file)
+            if after == before:
+                self._store(tex_file)
+                return True
+            before = after
+        logging.warning(f"⚠️ Los auxiliares siguen cambiando tras {self.max_passes} pasadas")
+        self._store(tex_file)
+        return True
+
+
+def compile_document(compiler: PDFCompiler, max_passes: int, tex_file: Path, cwd: Path,
+                     aux_cache: Optional[Path] = None) -> Tuple[bool, int, float]:
+    """
+    Punto de entrada de los pools de procesos (secciones y variantes): compila
+    ``tex_file`` con un ``PassScheduler`` propio y devuelve ``(ok, pasadas, segundos)``.
+    """
+    start = time.perf_counter()
+    scheduler = PassScheduler(compiler, max_passes, aux_cache)
+    ok = scheduler.run(tex_file, cwd) and tex_file.with_suffix(".pdf").exists()
+    return ok, scheduler.passes, time.perf_counter() - start
 
 
 class Generator:
     def __init__(self, config: Optional[PDFConfig] = None, paths: Optional[ProjectPaths] = None):
         self.config = config or PDFConfig()
         self.paths = paths or ProjectPaths()
-        self.collector = SnippetCollector(self.paths.snippets_dir)
-        self.compiler = PDFCompiler()
+        self.index = SnippetIndex(self.paths.snippets_dir, self.paths.index, SnipIgnore.load(self.paths.snipignore))
+        self.collector = SnippetCollector(self.paths.snippets_dir, self.index)
+        self.compiler = PDFCompiler(cache_file=self.paths.latex_cache, timeout=self.config.latex_timeout)
+        self.metrics = RunReport("generate")
+        self.scheduler = PassScheduler(self.compiler, self.config.max_latex_passes, self.paths.aux_cache_dir,
+                                       self.metrics)
+        self.manifest = BuildManifest(self.paths.manifest)
+        self.sections: Dict[str, List[Path]] = {}
+        self.templates: Dict[str, Dict[str, str]] = {}
+        self.section_lines: Dict[str, List[str]] = {}
+        self._includes: Dict[Path, Path] = {}
+        self.highlighter = highlight.CppHighlighter(self.paths.highlight_dir)
+        self._highlighted: List[Path] = []
 
-    def ensure_preamble(self):
+    def reset_metrics(self, command: str):
+        """Empieza un reporte nuevo (un proceso puede hacer varios builds)."""
+        self.metrics = RunReport(command)
+        self.scheduler.metrics = self.metrics
+
+    def preamble_content(self) -> str:
         content = r"""\documentclass[10pt,a4paper,notitlepage]{article}
 \usepackage{hyperref}
 \usepackage[spanish,es-tabla]{babel}
@@ -243,7 +732,40 @@ class Generator:
     \lstinputlisting[style=C++,#1]{\detokenize{#2}}
 }
 """
-        self.paths.preamble_tex.write_text(content, encoding="utf-8")
+        if self.config.highlighter == "python":
+            content += highlight.PREAMBLE
+        if self.config.profile:
+            content += tex_profile.PREAMBLE
+        return content + self.layout_preamble()
+
+    def layout_preamble(self) -> str:
+        """Ajustes de diseño que se agregan al final del preámbulo (para subclases)."""
+        return ""
+
+    def ensure_preamble(self):
+        content = self.preamble_content()
+        if write_if_changed(self.paths.preamble_tex, content):
+            logging.info("📝 preamble.tex actualizado")
+        self.manifest.set("outputs", "preamble.tex", content_hash(content.encode("utf-8")))
+
+    def ensure_format(self) -> bool:
+        """Prepara el .fmt del preámbulo actual (clave: hash de su contenido) y lo activa."""
+        digest = self.manifest.get("outputs", "preamble.tex") or ""
+        fmt_dir = self.paths.format_dir
+        fmt_file = fmt_dir / f"preamble-{digest[:16]}.fmt"
+        if not fmt_file.exists():
+            fmt_dir.mkdir(parents=True, exist_ok=True)
+            for old in fmt_dir.glob("preamble-*"):
+                old.unlink()
+            stub = fmt_dir / f"{fmt_file.stem}-stub.tex"
+            preamble = self.paths.preamble_tex.relative_to(self.paths.project_dir).as_posix()
+            stub.write_text(f"\\input{{{preamble}}}\n\\begin{{document}}\n\\end{{document}}\n", encoding="utf-8")
+            logging.info("🧩 Precompilando preámbulo...")
+            if not self.compiler.dump_format(stub, fmt_file, self.paths.project_dir):
+                self.compiler.format_file = None
+                return False
+        self.compiler.format_file = fmt_file
+        return True
 
     def _to_title_case(self, name: str) -> str:
         return name.replace("_", " ").replace(".cpp", "").title()
@@ -251,90 +773,283 @@ class Generator:
     def _original_path(self, src: Path) -> Path:
         return src
 
-    def build_tex(self) -> str:
-        self.ensure_preamble()
-        sections = self.collector.collect()
-        templates = TemplateManager(self.paths.snippets_dir).read_all()
+    def _sanitized_copy(self, f: Path) -> Path:
+        """Crea (o reutiliza) la copia con UTF-8 normalizado (preservando acentos)."""
+        out_path = self.paths.build_dir / "sanitized_include" / f.name
+        key = f.relative_to(self.paths.project_dir).as_posix()
+        record = self.index.get(f)
+        try:
+            raw = None
+            digest = record.digest if record is not None else None
+            if digest is None:
+                raw = f.read_bytes()
+                digest = content_hash(raw)
+                if record is not None:
+                    record.digest = digest
+            self.manifest.set("snippets", key, digest)
+            if self.manifest.get("clean", key) == digest:
+                return f
+            if self.manifest.get("sanitized", key) == digest and out_path.exists():
+                return out_path
+            if raw is None:
+                raw = f.read_bytes()
+            if is_clean_snippet(raw):
+                # Caso común: se incluye el original, sin escribir copia
+                self.manifest.set("clean", key, digest)
+                return f
+            # Solo sanitizar BOM y caracteres de control, preservar acentos
+            code = sanitize_text(decode_snippet(raw))
+            out_path.write_text(code, encoding='utf-8', newline='\n')
+            self.manifest.set("sanitized", key, digest)
+        except Exception as e:
+            # Fallback: referencia original si algo falla
+            out_path = f
+        return out_path
+
+    def _prepare_includes(self, files: List[Path]) -> Dict[Path, Path]:
+        """Lee, decodifica, sanitiza y escribe los snippets en un pool de hilos.
+
+        ``map`` conserva el orden de entrada, así que el resultado es determinista.
+        """
+        copies_dir = self.paths.build_dir / "sanitized_include"
+        copies_dir.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.config.io_workers) as pool:
+            includes = dict(zip(files, pool.map(self._sanitized_copy, files)))
+        # Borrar copias que ya no se referencian (snippet eliminado o ahora limpio)
+        used = set(includes.values())
+        for stale in copies_dir.iterdir():
+            if stale not in used:
+                stale.unlink()
+        return includes
+
+    def _cover_lines(self) -> List[str]:
         today = datetime.datetime.now().strftime(self.config.date_format)
         lines: List[str] = []
-        lines.append("% Generated by generate_pdf.py\n")
-        lines.append("\\input{preamble.tex}\n")
-        lines.append("\\begin{document}\n")
-        lines.append(f"\\def\\title{{{self.config.title}}}\n")
         # Portada: Título, Autor, Imagen, Fecha (en ese orden) y en una sola página
         lines.append("\\vspace{0.6cm}\n")
         lines.append(f"\\centering{{\\LARGE\\textbf{{{self.config.title}}}}}\\\\[0.5cm]\n")
         lines.append(f"\\centering{{{self.config.author}}}\\\\[0.5cm]\n")
         lines.append("\\centering{\\includegraphics[width=5.5cm]{img/cr7.jpg}}\\\\[0.5cm]\n")
         lines.append(f"\\centering{{{today}}}\\\\[0.2cm]\n")
+        return lines
+
+    def _section_lines(self, folder: str, files: List[Path], templates: Dict[str, Dict[str, str]]) -> List[str]:
+        lines: List[str] = []
+        lines.append(f"\\section{{{self._to_title_case(folder)}}}\n")
+        # descripción de carpeta (como LaTeX directo)
+        folder_desc = templates.get(folder, {}).get("description", "").strip()
+        if folder_desc:
+            lines.append(f"{folder_desc}\n\n")
+        for f in files:
+            key = f.relative_to(self.paths.snippets_dir).as_posix()
+            if self.config.profile:
+                lines.append(tex_profile.probe("B", key))
+            title = self._to_title_case(f.stem)
+            lines.append(f"\\subsection{{{title}}}\n")
+            # descripción de archivo (como LaTeX directo)
+            file_desc = templates.get(folder, {}).get(f.stem, "").strip()
+            if file_desc:
+                lines.append(f"{file_desc}\n\n")
+            if self.config.profile:
+                lines.append(tex_profile.probe("T", key))
+            out_path = self._includes[f]
+            digest = self.manifest.get("snippets", f.relative_to(self.paths.project_dir).as_posix())
+            if self.config.highlighter == "python" and digest:
+                hl_path = self.highlighter.render(out_path, digest)
+                self._highlighted.append(hl_path)
+                lines.append(f"\\cpphlfile{{{hl_path.relative_to(self.paths.project_dir).as_posix()}}}\n")
+            else:
+                rel_path = out_path.relative_to(self.paths.project_dir).as_posix()
+                lines.append(f"\\cppfile{{{rel_path}}}\n")
+            if self.config.profile:
+                lines.append(tex_profile.probe("E", key))
+        lines.append("\n")
+        return lines
+
+    def index_sources(self):
+        """Indexa Snippets/ y lee los templates."""
+        with self.metrics.phase("index") as info:
+            self.index.scan()
+            info["skipped_files"] = self.index.skipped_files
+        if self.index.skipped_files or self.index.skipped_dirs:
+            logging.info(f"🙈 .snipignore: {self.index.skipped_files} archivo(s) "
+                         f"({self.index.skipped_bytes / 1024:.1f} KB) y {self.index.skipped_dirs} carpeta(s) omitidos")
+        with self.metrics.phase("collect") as info:
+            self.sections = self.collector.collect()
+            info["sections"] = len(self.sections)
+        with self.metrics.phase("templates"):
+            self.templates = TemplateManager(self.paths.snippets_dir, self.index).read_all()
+
+    def sanitize_sources(self):
+        """Prepara los archivos a incluir: el original si ya está limpio o la copia sanitizada."""
+        with self.metrics.phase("sanitize") as info:
+            self._includes = self._prepare_includes([f for files in self.sections.values() for f in files])
+            info["files"] = len(self._includes)
+        self.manifest.retain("snippets", [f.relative_to(self.paths.project_dir).as_posix() for files in self.sections.values() for f in files])
+        self.manifest.retain("sanitized", self.manifest.stages.get("snippets", {}))
+        self.manifest.retain("clean", self.manifest.stages.get("snippets", {}))
+        self.index.save()
+
+    def prepare_sources(self):
+        """Indexa Snippets/, lee los templates y prepara los archivos a incluir."""
+        self.index_sources()
+        self.sanitize_sources()
+
+    def adopt_sources(self, other: "Generator"):
+        """Reutiliza los snippets ya indexados y sanitizados por otro generador."""
+        self.sections = other.sections
+        self.templates = other.templates
+        self._includes = other._includes
+        for stage in ("snippets", "sanitized", "clean"):
+            self.manifest.stages[stage] = dict(other.manifest.stages.get(stage, {}))
+
+    def _body_begin_lines(self) -> List[str]:
+        return []
+
+    def _body_end_lines(self) -> List[str]:
+        return []
+
+    def render_tex(self) -> str:
+        preamble = self.paths.preamble_tex.relative_to(self.paths.project_dir).as_posix()
+        lines: List[str] = []
+        lines.append("% Generated by generate_pdf.py\n")
+        lines.append(f"\\input{{{preamble}}}\n")
+        lines.append("\\begin{document}\n")
+        lines.append(f"\\def\\title{{{self.config.title}}}\n")
+        lines.extend(self._cover_lines())
         # Índice inmediatamente después de la portada (misma página)
         lines.append("\\tableofcontents\n")
         lines.append("\\newpage\n\n")
 
-        for folder, files in sections.items():
-            lines.append(f"\\section{{{self._to_title_case(folder)}}}\n")
-            # descripción de carpeta (como LaTeX directo)
-            folder_desc = templates.get(folder, {}).get("description", "").strip()
-            if folder_desc:
-                lines.append(f"{folder_desc}\n\n")
-            for f in files:
-                title = self._to_title_case(f.stem)
-                lines.append(f"\\subsection{{{title}}}\n")
-                # descripción de archivo (como LaTeX directo)
-                file_desc = templates.get(folder, {}).get(f.stem, "").strip()
-                if file_desc:
-                    lines.append(f"{file_desc}\n\n")
-                # Crear copia con UTF-8 normalizado (preservando acentos)
-                tmp_dir = (self.paths.build_dir / "sanitized_include")
-                tmp_dir.mkdir(parents=True, exist_ok=True)
-                out_path = tmp_dir / f.name
-                try:
-                    raw = f.read_bytes()
-                    try:
-                        code = raw.decode('utf-8')
-                    except UnicodeDecodeError:
-                        try:
-                            code = raw.decode('cp1252')
-                        except UnicodeDecodeError:
-                            code = raw.decode('latin-1', errors='replace')
-                    # Solo sanitizar BOM y caracteres de control, preservar acentos
-                    code = sanitize_text(code)
-                    out_path.write_text(code, encoding='utf-8', newline='\n')
-                except Exception as e:
-                    # Fallback: referencia original si algo falla
-                    out_path = f
-                rel_path = out_path.relative_to(self.paths.project_dir).as_posix()
-                lines.append(f"\\cppfile{{{rel_path}}}\n")
-            lines.append("\n")
+        lines.extend(self._body_begin_lines())
+        self.section_lines = {}
+        self._highlighted = []
+        for folder, files in self.sections.items():
+            self.section_lines[folder] = self._section_lines(folder, files, self.templates)
+            lines.extend(self.section_lines[folder])
+        lines.extend(self._body_end_lines())
 
         lines.append("\\end{document}\n")
+        if self._highlighted:
+            self.highlighter.prune(self._highlighted)
         return "".join(lines)
 
+    def build_tex(self) -> str:
+        self.ensure_preamble()
+        self.prepare_sources()
+        with self.metrics.phase("tex"):
+            return self.render_tex()
+
     def write_tex(self, content: str):
-        self.paths.output_tex.write_text(content, encoding="utf-8")
+        if write_if_changed(self.paths.output_tex, content):
+            logging.info(f"💾 {self.paths.output_tex.name} actualizado")
+        self.manifest.set("outputs", "Snippets.tex", content_hash(content.encode("utf-8")))
+
+    def _compile_key(self) -> str:
+        """Hash de todo lo que lee pdflatex: preámbulo, .tex y snippets incluidos."""
+        parts = [f"{stage}/{key}={digest}" for stage in ("outputs", "snippets")
+                 for key, digest in sorted(self.manifest.stages.get(stage, {}).items())]
+        parts.append(f"parallel_sections={self.config.parallel_sections}")
+        parts.append(f"highlighter={self.config.highlighter}")
+        return content_hash("\n".join(parts).encode("utf-8"))
 
-    def generate(self) -> bool:
+    def _latex_stats(self) -> Dict[str, int]:
+        if self.config.parallel_sections:
+            return merge_log_stats([parse_latex_log(log) for log in sorted(self.paths.sections_dir.glob("*.log"))])
+        return parse_latex_log(self.paths.output_tex.with_suffix(".log"))
+
+    def report_profile(self):
+        """Tabla de costo por snippet a partir de los ``.prof`` de la última pasada."""
+        if self.config.parallel_sections:
+            prof_files = sorted(self.paths.sections_dir.glob(f"*{tex_profile.PROFILE_SUFFIX}"))
+        else:
+            prof_files = [self.paths.output_tex.with_suffix(tex_profile.PROFILE_SUFFIX)]
+        costs = tex_profile.load_profiles(prof_files)
+        self.metrics.summary["profile"] = tex_profile.summary(costs)
+        tex_profile.print_table(costs)
+
+    def compile_pdf(self) -> bool:
+        """Compila el ``.tex`` ya escrito, completo o por secciones."""
+        if self.config.parallel_sections:
+            from section_build import SectionBuilder
+            builder = SectionBuilder(self)
+            with self.metrics.phase("sections"):
+                ok = builder.build()
+            self.metrics.summary["passes"] = sum(builder.passes.values())
+            self.metrics.summary["section_passes"] = builder.passes
+        else:
+            ok = self.scheduler.run(self.paths.output_tex, self.paths.project_dir)
+            self.metrics.summary["passes"] = self.scheduler.passes
+        return ok and self.paths.output_pdf.exists()
+
+    def postprocess(self):
+        """Métricas del log de pdflatex y, si corresponde, la tabla de perfil."""
+        self.metrics.summary["latex"] = self._latex_stats()
+        if self.config.profile:
+            self.report_profile()
+
+    def generate(self, force: bool = False) -> bool:
+        ok = False
         try:
             logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
             if not self.paths.snippets_dir.exists():
                 logging.error(f"Directorio de snippets no encontrado: {self.paths.snippets_dir}")
                 return False
+            start = time.perf_counter()
             tex = self.build_tex()
-            self.write_tex(tex)
-            ok = self.compiler.compile(self.paths.output_tex)
-            if not ok:
-                return False
-            # second pass for TOC
-            ok = self.compiler.compile(self.paths.output_tex)
-            return ok and self.paths.output_pdf.exists()
+            with self.metrics.phase("write_tex"):
+                self.write_tex(tex)
+            compile_key = self._compile_key()
+            if not force and self.manifest.get("pdf", "key") == compile_key and self.paths.output_pdf.exists():
+                self.manifest.save()
+                self.metrics.summary["up_to_date"] = True
+                logging.info(f"✅ Sin cambios, PDF al día ({(time.perf_counter() - start) * 1000:.0f} ms)")
+                if self.config.profile:
+                    self.report_profile()
+                ok = True
+                return True
+            # El PDF anterior deja de ser válido hasta que la compilación termine bien
+            self.manifest.stages.pop("pdf", None)
+            self.manifest.save()
+            if self.config.precompile_preamble:
+                with self.metrics.phase("format"):
+                    self.ensure_format()
+            ok = self.compile_pdf()
+            self.postprocess()
+            if ok:
+                self.manifest.set("pdf", "key", compile_key)
+                self.manifest.save()
+            return ok
         except Exception as e:
             logging.error(f"Error inesperado: {e}")
             return False
+        finally:
+            self.metrics.summary["ok"] = ok
+            try:
+                self.metrics.save(self.paths.build_dir)
+            except OSError as e:
+                logging.warning(f"⚠️ No se pudo guardar el reporte: {e}")
 
 
 def main():
-    gen = Generator()
-    if gen.generate():
+    parser = argparse.ArgumentParser(description="Genera Snippets.pdf a partir de Snippets/")
+    parser.add_argument("--force", action="store_true", help="compilar aunque nada haya cambiado")
+    parser.add_argument("--profile", action="store_true",
+                        help="medir el tiempo de composición de cada snippet (tabla al final)")
+    parser.add_argument("--watch", action="store_true",
+                        help="observar Snippets/ y recompilar al guardar solo las secciones afectadas "
+                             "(requiere pypdf; Ctrl+C para salir)")
+    parser.add_argument("--debounce", type=float, default=0.3, metavar="SEG",
+                        help="espera sin eventos antes de reconstruir en --watch (por defecto 0.3)")
+    parser.add_argument("--poll", action="store_true", help="en --watch, sondear en lugar de usar inotify")
+    args = parser.parse_args()
+
+    gen = Generator(PDFConfig(profile=args.profile))
+    if args.watch:
+        from watch import watch
+        watch(gen, args.debounce, args.poll)
+        sys.exit(0)
+    if gen.generate(force=args.force):
         try:
             print("\nPDF generado exitosamente!")
         except Exception:
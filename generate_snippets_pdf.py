@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+r"""
+Generación de variantes de diseño del notebook (orientación, columnas, márgenes,
+tamaño de fuente, números de línea y espaciado) sobre generate_pdf.py.
+
+Es la API que usan config.py y example_usage.py:
+
+    generator = SnippetPDFGenerator(config=PDFConfig(columns=1))
+    generator.generate_pdf()
+
+Para construir muchas variantes a la vez, ``build_variants`` indexa y sanitiza
+los snippets una sola vez, escribe el ``.tex`` de cada variante a partir de ese
+índice compartido y compila todas en paralelo, cada una en su propio directorio
+``build/variants/<nombre>/`` para que no se pisen los ``.aux``.
+"""
+
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from generate_pdf import Generator, ProjectPaths, compile_document
+from generate_pdf import PDFConfig as BaseConfig
+
+
+class FontSize(Enum):
+    TINY = "\\tiny"
+    SCRIPT = "\\scriptsize"
+    FOOTNOTE = "\\footnotesize"
+    SMALL = "\\small"
+    NORMAL = "\\normalsize"
+
+
+class PageOrientation(Enum):
+    PORTRAIT = "portrait"
+    LANDSCAPE = "landscape"
+
+
+def default_spacing() -> Dict[str, str]:
+    return {
+        "section_title": "0.3cm",
+        "subsection_title": "0.2cm",
+        "after_code": "0.3cm",
+        "between_sections": "0.6cm",
+    }
+
+
+@dataclass
+class PDFConfig(BaseConfig):
+    orientation: PageOrientation = PageOrientation.LANDSCAPE
+    columns: int = 2
+    margins: str = "0.5in"
+    font_size: FontSize = FontSize.SMALL
+    line_numbers: bool = True
+    column_separation: str = "0.5cm"
+    code_spacing: Dict[str, str] = field(default_factory=default_spacing)
+
+
+class SnippetPDFGenerator(Generator):
+    """Generador con diseño configurable que compila en un directorio aislado."""
+
+    def __init__(self, config: Optional[PDFConfig] = None, paths: Optional[ProjectPaths] = None):
+        super().__init__(config or PDFConfig(), paths)
+        self._final: Optional[Tuple[Path, Path]] = None
+
+    def layout_preamble(self) -> str:
+        c = self.config
+        spacing = {**default_spacing(), **c.code_spacing}
+        between, section, subsection, after = (spacing[k] for k in
+                                               ("between_sections", "section_title", "subsection_title", "after_code"))
+        numbers = "left" if c.line_numbers else "none"
+        landscape = ",landscape" if c.orientation == PageOrientation.LANDSCAPE else ""
+        size = c.font_size.value
+        return rf"""
+%%% Diseño de la variante (generate_snippets_pdf.py)
+\usepackage[a4paper,margin={c.margins}{landscape}]{{geometry}}
+\usepackage{{multicol}}
+\setlength{{\columnsep}}{{{c.column_separation}}}
+\makeatletter
+\renewcommand\section{{\@startsection{{section}}{{1}}{{\z@}}{{-{between}}}{{{section}}}{{\normalfont\Large\bfseries}}}}
+\renewcommand\subsection{{\@startsection{{subsection}}{{2}}{{\z@}}{{-3.25ex\@plus -1ex \@minus -.2ex}}{{{subsection}}}{{\normalfont\large\bfseries}}}}
+\makeatother
+\renewcommand\cppfile[2][]{{
+    \lstinputlisting[style=C++,basicstyle={size}\ttfamily,numbers={numbers},#1]{{\detokenize{{#2}}}}
+    \vspace{{{after}}}
+}}
+\providecommand\cpphlfile[1]{{}}
+\renewcommand\cpphlfile[1]{{
+    \VerbatimInput[commandchars=\\\{{\}},numbers={numbers},numbersep=9pt,frame=leftline,framesep=3pt,
+        xleftmargin=15pt,xrightmargin=5pt,breaklines,fontfamily=tt,fontsize={size}]{{#1}}
+    \vspace{{{after}}}
+}}
+"""
+
+    def _body_begin_lines(self) -> List[str]:
+        return [f"\\begin{{multicols}}{{{self.config.columns}}}\n"] if self.config.columns > 1 else []
+
+    def _body_end_lines(self) -> List[str]:
+        return ["\\end{multicols}\n"] if self.config.columns > 1 else []
+
+    def layout_name(self) -> str:
+        """Nombre corto del diseño, p. ej. ``landscape_2col_small``."""
+        c = self.config
+        return f"{c.orientation.value}_{c.columns}col_{c.font_size.name.lower()}"
+
+    def isolate(self) -> Tuple[Path, Path]:
+        """
+        Redirige el build a ``build/variants/<nombre>/`` según el PDF de salida
+        pedido y devuelve ``(tex_final, pdf_final)``.
+
+        Sin un nombre de salida propio la variante se publica como
+        ``Snippets_<diseño>.pdf``: nunca reemplaza al ``Snippets.pdf`` principal,
+        que ``generate_pdf.py`` da por al día según su propio manifiesto.
+        """
+        if self._final is None:
+            default = ProjectPaths(self.paths.project_dir)
+            if self.paths.output_pdf == default.output_pdf or self.paths.output_tex == default.output_tex:
+                stem = f"{default.output_pdf.stem}_{self.layout_name()}"
+                self.paths.output_tex = self.paths.project_dir / f"{stem}.tex"
+                self.paths.output_pdf = self.paths.project_dir / f"{stem}.pdf"
+            self._final = (self.paths.output_tex, self.paths.output_pdf)
+            work = self.paths.build_dir / "variants" / self.paths.output_pdf.stem
+            work.mkdir(parents=True, exist_ok=True)
+            self.paths.output_tex = work / self._final[0].name
+            self.paths.output_pdf = work / self._final[1].name
+            self.paths.preamble_tex = work / "preamble.tex"
+            self.paths.manifest = work / "manifest.json"
+            self.paths.aux_cache_dir = work / "aux"
+            self.paths.sections_dir = work / "sections"
+            self.paths.format_dir = work / "fmt"
+            self.manifest.path = self.paths.manifest
+            self.manifest.load()
+            self.scheduler.cache_dir = self.paths.aux_cache_dir
+        return self._final
+
+    def prepare_variant(self, base: Generator) -> Tuple[Path, Path]:
+        """Escribe preámbulo y ``.tex`` de la variante con los snippets ya preparados por ``base``."""
+        final = self.isolate()
+        self.ensure_preamble()
+        self.adopt_sources(base)
+        self.write_tex(self.render_tex())
+        return final
+
+    def publish(self):
+        """Copia el ``.tex`` y el PDF de la variante a las rutas pedidas."""
+        final_tex, final_pdf = self.isolate()
+        shutil.copyfile(self.paths.output_tex, final_tex)
+        shutil.copyfile(self.paths.output_pdf, final_pdf)
+
+    def generate_pdf(self, force: bool = False) -> bool:
+        self.isolate()
+        ok = self.generate(force)
+        if ok:
+            self.publish()
+        return ok
+
+
+@dataclass
+class VariantResult:
+    name: str
+    ok: bool
+    skipped: bool = False
+    tex_seconds: float = 0.0
+    compile_seconds: float = 0.0
+    passes: int = 0
+    pdf: Optional[Path] = None
+
+
+def build_variants(variants: Dict[str, PDFConfig], max_workers: Optional[int] = None,
+                   force: bool = False) -> List[VariantResult]:
+    """
+    Construye varias variantes en paralelo.
+
+    Cada variante se compila como un único documento (``parallel_sections`` no
+    aplica: el paralelismo está entre variantes).
+
+    Args:
+        variants: Nombre del PDF de salida (sin extensión) -> configuración
+        max_workers: Procesos de pdflatex simultáneos (por defecto, núcleos)
+        force: Recompilar aunque la variante esté al día
+
+    Returns:
+        Un ``VariantResult`` por variante, en el mismo orden
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    base = Generator()
+    start = time.perf_counter()
+    base.prepare_sources()
+    logging.info(f"📁 Snippets indexados y sanitizados una vez ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    generators: Dict[str, SnippetPDFGenerator] = {}
+    results: Dict[str, VariantResult] = {}
+    for name, config in variants.items():
+        gen = SnippetPDFGenerator(config=replace(config), paths=ProjectPaths(base.paths.project_dir))
+        gen.paths.output_tex = gen.paths.project_dir / f"{name}.tex"
+        gen.paths.output_pdf = gen.paths.project_dir / f"{name}.pdf"
+        start = time.perf_counter()
+        gen.prepare_variant(base)
+        generators[name] = gen
+        results[name] = VariantResult(name, ok=False, tex_seconds=time.perf_counter() - start)
+
+    pending = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for name, gen in generators.items():
+            key = gen._compile_key()
+            if not force and gen.manifest.get("pdf", "key") == key and gen.paths.output_pdf.exists():
+                results[name].ok = results[name].skipped = True
+                continue
+            gen.manifest.stages.pop("pdf", None)
+            gen.manifest.save()
+            if gen.config.precompile_preamble:
+                gen.ensure_format()
+            logging.info(f"🔨 Compilando {name}...")
+            pending[name] = (key, pool.submit(compile_document, gen.compiler, gen.config.max_latex_passes,
+                                              gen.paths.output_tex, gen.paths.project_dir, gen.paths.aux_cache_dir))
+        for name, (key, future) in pending.items():
+            ok, passes, seconds = future.result()
+            results[name].ok, results[name].passes, results[name].compile_seconds = ok, passes, seconds
+            if ok:
+                generators[name].manifest.set("pdf", "key", key)
+                generators[name].manifest.save()
+
+    for name, result in results.items():
+        if result.ok:
+            generators[name].publish()
+            result.pdf = generators[name].isolate()[1]
+    return list(results.values())
+
+
+def print_timing_table(results: List[VariantResult]):
+    width = max([len(r.name) for r in results] + [8])
+    print(f"\n{'Variante':<{width}}  {'Estado':<10} {'.tex (ms)':>10} {'pdflatex (s)':>13} {'Pasadas':>8}")
+    print("-" * (width + 46))
+    for r in results:
+        status = "al día" if r.skipped else ("ok" if r.ok else "ERROR")
+        print(f"{r.name:<{width}}  {status:<10} {r.tex_seconds * 1000:>10.1f} {r.compile_seconds:>13.2f} {r.passes:>8}")
+
+
+def main():
+    from config import all_configs
+
+    results = build_variants(all_configs(), max_workers=os.cpu_count())
+    print_timing_table(results)
+    sys.exit(0 if all(r.ok for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+r"""
+Resaltado de sintaxis C++ desde Python.
+
+Tokeniza cada snippet una sola vez y genera LaTeX ya coloreado para
+``\VerbatimInput`` (fvextra) con ``commandchars=\\\{\}``, de modo que pdflatex
+solo tiene que componer cajas en lugar de analizar el código como hace
+``listings``. Los colores replican el estilo de ``\lstdefinestyle{C++}`` del
+preámbulo: palabras clave, cadenas, comentarios y líneas con ``#``.
+
+La salida se guarda en ``build/highlight/<hash>.tex`` según el hash del snippet,
+así que un archivo sin cambios no se vuelve a tokenizar.
+"""
+
+import re
+from pathlib import Path
+from typing import List
+
+# Cambiar si se modifica la salida para invalidar la caché
+HIGHLIGHT_VERSION = "1"
+
+# Palabras clave del lenguaje C++ de listings (lstlang1.sty) + morekeywords del preámbulo
+KEYWORDS = frozenset("""
+    auto break case char const continue default do double else enum extern float for goto
+    if int long register return short signed sizeof static struct switch typedef union
+    unsigned void volatile while and and_eq asm bitand bitor bool catch class compl
+    const_cast delete dynamic_cast explicit export false friend inline mutable namespace
+    new not not_eq operator or or_eq private protected public reinterpret_cast static_cast
+    template this throw true try typeid typename using virtual wchar_t xor xor_eq
+    tint forn forsn fore
+""".split())
+EMPH = frozenset(("tipo", "usa", "tipo2"))
+
+TOKEN_RE = re.compile(r"""
+      (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<string>"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?)
+    | (?P<directive>\#[^\n]*)
+    | (?P<ident>[A-Za-z_]\w*)
+    | (?P<other>[^"'/\#A-Za-z_]+|/)
+""", re.VERBOSE | re.DOTALL)
+
+PREAMBLE = r"""
+%%% Resaltado generado por highlight.py
+\usepackage{fvextra}
+\def\cppkw#1{\textcolor{darkblue}{#1}}
+\def\cppstr#1{\textcolor{magenta}{#1}}
+\def\cppcom#1{\textcolor{OliveGreen}{#1}}
+\def\cpppre#1{\textcolor{Purple}{#1}}
+\def\cppemph#1{\textsf{\textbf{#1}}}
+\def\cppBS{\char`\\}
+\def\cppLB{\char`\{}
+\def\cppRB{\char`\}}
+\renewcommand\theFancyVerbLine{\tiny\arabic{FancyVerbLine}}
+\newcommand\cpphlfile[1]{
+    \VerbatimInput[commandchars=\\\{\},numbers=left,numbersep=9pt,frame=leftline,framesep=3pt,
+        xleftmargin=15pt,xrightmargin=5pt,breaklines,fontfamily=tt]{#1}
+}
+"""
+
+_ESCAPES = str.maketrans({"\\": "\\cppBS{}", "{": "\\cppLB{}", "}": "\\cppRB{}"})
+
+
+def _escape(text: str) -> str:
+    return text.translate(_ESCAPES)
+
+
+def _wrap(macro: str, text: str) -> str:
+    # fancyvrb procesa línea por línea: un comando no puede abarcar saltos de línea
+    return "\n".join(f"\\{macro}{{{_escape(part)}}}" if part else "" for part in text.split("\n"))
+
+
+def highlight_cpp(code: str) -> str:
+    """Devuelve ``code`` con los comandos de color de ``PREAMBLE`` ya aplicados."""
+    out: List[str] = []
+    code = code.replace("\r\n", "\n").replace("\r", "\n").expandtabs(2)
+    for m in TOKEN_RE.finditer(code):
+        kind, text = m.lastgroup, m.group()
+        if kind == "comment":
+            out.append(_wrap("cppcom", text))
+        elif kind == "string":
+            out.append(_wrap("cppstr", text))
+        elif kind == "directive":
+            out.append(_wrap("cpppre", text))
+        elif kind == "ident" and text in KEYWORDS:
+            out.append(f"\\cppkw{{{text}}}")
+        elif kind == "ident" and text in EMPH:
+            out.append(f"\\cppemph{{{text}}}")
+        else:
+            out.append(_escape(text))
+    return "".join(out)
+
+
+class CppHighlighter:
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    def render(self, src: Path, digest: str) -> Path:
+        """Resalta ``src`` (UTF-8) y devuelve el archivo en caché para ``digest``."""
+        out_path = self.cache_dir / f"{digest[:24]}-v{HIGHLIGHT_VERSION}.tex"
+        if not out_path.exists():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            code = src.read_text(encoding="utf-8", errors="replace")
+            tmp = out_path.with_suffix(".tmp")
+            tmp.write_text(highlight_cpp(code), encoding="utf-8", newline="\n")
+            tmp.replace(out_path)
+        return out_path
+
+    def prune(self, keep):
+        """Borra las entradas de la caché que no estén en ``keep``."""
+        keep = set(keep)
+        for old in self.cache_dir.glob("*.tex"):
+            if old not in keep:
+                old.unlink()
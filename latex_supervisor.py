@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Supervisión de pdflatex con salida en streaming.
+
+En lugar de esperar a que el proceso termine con toda la salida en memoria,
+se lee línea por línea: al primer error (``! ...`` o ``archivo:línea: ...`` con
+``-file-line-error``) se junta el contexto que imprime TeX (``l.<n> ...``), se
+termina el proceso y se informa archivo, línea y las líneas del fuente
+alrededor. También se corta si se supera el tiempo máximo.
+
+La lectura se hace en un hilo con una cola para que el tiempo máximo funcione
+igual en Windows (MiKTeX) y en Linux.
+"""
+
+import logging
+import queue
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FILE_LINE_RE = re.compile(r"^(?P<file>(?:[A-Za-z]:)?[^:\s][^:]*\.\w+):(?P<line>\d+): (?P<msg>.*)")
+BANG_RE = re.compile(r"^! (?P<msg>.*)")
+CONTEXT_LINE_RE = re.compile(r"^l\.(?P<line>\d+)")
+# Líneas de salida que se guardan para mostrar si el proceso falla sin error reconocible
+TAIL_LINES = 40
+# Líneas a esperar tras el error buscando ``l.<n>`` antes de cortar el proceso
+CONTEXT_WINDOW = 12
+
+
+@dataclass
+class LatexError:
+    message: str
+    file: Optional[str] = None
+    line: Optional[int] = None
+    context: List[str] = field(default_factory=list)
+
+    def location(self) -> str:
+        if self.file and self.line:
+            return f"{self.file}:{self.line}"
+        if self.line:
+            return f"línea {self.line}"
+        return self.file or "?"
+
+
+@dataclass
+class LatexResult:
+    ok: bool
+    returncode: Optional[int] = None
+    error: Optional[LatexError] = None
+    timed_out: bool = False
+    seconds: float = 0.0
+    tail: List[str] = field(default_factory=list)
+
+
+def _pump(stream, lines: "queue.Queue[Optional[str]]"):
+    for line in stream:
+        lines.put(line.rstrip("\r\n"))
+    lines.put(None)
+
+
+def _kill(proc: subprocess.Popen):
+    if proc.poll() is None:
+        proc.kill()
+    proc.wait()
+
+
+def source_context(path: Path, line: int, radius: int = 2) -> List[str]:
+    """Líneas ``line - radius .. line + radius`` de ``path``, numeradas."""
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+    lo, hi = max(1, line - radius), min(len(text), line + radius)
+    return [f"{'>' if n == line else ' '}{n:5d} | {text[n - 1]}" for n in range(lo, hi + 1)]
+
+
+def run_latex(cmd: List[str], cwd: Path, env: Optional[Dict[str, str]] = None,
+              timeout: Optional[float] = None, fail_fast: bool = True) -> LatexResult:
+    """Ejecuta ``cmd`` leyendo su salida en streaming (ver docstring del módulo)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True, encoding="latin-1", errors="replace")
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+    reader = threading.Thread(target=_pump, args=(proc.stdout, lines), daemon=True)
+    reader.start()
+    tail: deque = deque(maxlen=TAIL_LINES)
+    error: Optional[LatexError] = None
+    pending = 0
+    deadline = start + timeout if timeout else None
+
+    while True:
+        wait = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        try:
+            line = lines.get(timeout=wait)
+        except queue.Empty:
+            _kill(proc)
+            return LatexResult(False, proc.returncode, error, timed_out=True,
+                               seconds=time.perf_counter() - start, tail=list(tail))
+        if line is None:
+            break
+        tail.append(line)
+        if error is None:
+            m = FILE_LINE_RE.match(line) or BANG_RE.match(line)
+            if m:
+                groups = m.groupdict()
+                error = LatexError(groups["msg"].strip(), groups.get("file"),
+                                   int(groups["line"]) if groups.get("line") else None)
+                pending = CONTEXT_WINDOW
+            continue
+        if pending:
+            error.context.append(line)
+            pending -= 1
+            m = CONTEXT_LINE_RE.match(line)
+            if m:
+                error.line = error.line or int(m.group("line"))
+                pending = min(pending, 1)
+            if not pending and fail_fast:
+                _kill(proc)
+                break
+
+    reader.join(timeout=1)
+    returncode = proc.wait()
+    ok = returncode == 0 and error is None
+    return LatexResult(ok, returncode, error, seconds=time.perf_counter() - start, tail=list(tail))
+
+
+def log_failure(result: LatexResult, cwd: Path, timeout: Optional[float]):
+    """Escribe en el log el error con su ubicación y contexto."""
+    if result.timed_out:
+        logging.error(f"⏱️ pdflatex superó el tiempo máximo ({timeout:.0f} s) y se detuvo")
+    err = result.error
+    if err is None:
+        if not result.timed_out:
+            logging.error(f"Error compilando PDF (código {result.returncode})")
+        if result.tail:
+            logging.error("\n".join(result.tail))
+        return
+    logging.error(f"❌ {err.location()}: {err.message}")
+    for line in err.context:
+        if line.strip():
+            logging.error(f"    {line}")
+    if err.file and err.line:
+        for line in source_context(cwd / err.file, err.line):
+            logging.error(f"    {line}")
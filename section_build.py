@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Compilación en paralelo por secciones.
+
+Cada sección de ``SnippetCollector.collect()`` (Graph, DP, Geometry, ...) se
+emite como un documento independiente en ``build/sections/`` y se compila en un
+pool de procesos. La portada con el índice se compila al final, a partir de las
+entradas ``\\@writefile{toc}`` de los ``.aux`` de las secciones (que no abren su
+propio ``.toc``), y todos los PDFs se unen con pypdf.
+
+Cada sección se numera localmente y no conoce el total, así que su contenido
+(y su hash) no depende del largo de las demás: solo se recompilan las secciones
+cuyas entradas cambiaron. Al unir los PDFs se estampa "Page X of N" desde un
+documento de numeración (páginas vacías con solo ese encabezado), el índice
+suma a cada entrada el desplazamiento de su sección y sus enlaces apuntan a los
+destinos con nombre de hyperref de cada sección (únicos porque cada sección
+arranca su contador de ``section`` en su posición).
+"""
+
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from generate_pdf import (
+    compile_document,
+    content_hash,
+    normalize_ascii_filename,
+    write_if_changed,
+)
+
+
+FRONT_NAME = "00_Portada"
+STAMP_NAME = "99_Numeracion"
+TOC_NAME = "sections.toc"
+# Rondas máximas para estabilizar el largo de la portada (el índice incluye sus páginas)
+MAX_LAYOUT_ROUNDS = 3
+# \@writefile{toc}{<entrada>\protected@file@percent }
+TOC_WRITE_PREFIX = "\\@writefile{toc}{"
+FILE_PERCENT = "\\protected@file@percent"
+# \contentsline {section}{...}{<página>}{<destino>}%
+CONTENTS_PAGE_RE = re.compile(r"^(\\contentsline\s*\{.*\}\{)(\d+)(\}\{[^{}]*\}%?)\s*$")
+
+
+def _load_pdf_lib():
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        try:
+            from PyPDF2 import PdfReader, PdfWriter
+        except ImportError:
+            return None, None
+    return PdfReader, PdfWriter
+
+
+class SectionBuilder:
+    def __init__(self, generator):
+        self.gen = generator
+        self.paths = generator.paths
+        self.manifest = generator.manifest
+        self.sections_dir = self.paths.sections_dir
+        self.reader_cls, self.writer_cls = _load_pdf_lib()
+        # Pasadas de LaTeX por documento en este build (la portada puede compilarse varias veces)
+        self.passes: Dict[str, int] = {}
+
+    def _tex_name(self, index: int, folder: str) -> Path:
+        return self.sections_dir / f"{index:02d}_{normalize_ascii_filename(folder)}.tex"
+
+    def _page_count(self, pdf: Path) -> int:
+        return len(self.reader_cls(str(pdf)).pages)
+
+    def _header_lines(self) -> List[str]:
+        lines: List[str] = []
+        lines.append("% Generated by generate_pdf.py (section_build)\n")
+        lines.append(f"\\input{{{self.paths.preamble_tex.relative_to(self.paths.project_dir).as_posix()}}}\n")
+        lines.append("\\begin{document}\n")
+        return lines
+
+    def _document(self, body: List[str], first_section: int = 0) -> str:
+        lines = self._header_lines()
+        lines.append(f"\\def\\title{{{self.gen.config.title}}}\n")
+        # "Page X of N" se estampa al unir los PDFs
+        lines.append("\\fancyhead[RO]{}\n")
+        lines.append(f"\\setcounter{{section}}{{{first_section}}}\n")
+        lines.extend(body)
+        lines.append("\\end{document}\n")
+        return "".join(lines)
+
+    def _stamp_document(self, total_pages: int) -> str:
+        """``total_pages`` páginas vacías con solo el número de página en el encabezado."""
+        lines = self._header_lines()
+        lines.append("\\renewcommand{\\headrulewidth}{0pt}\n")
+        lines.append("\\fancyhead[LO]{}\\fancyhead[C]{}\n")
+        lines.append(f"\\fancyhead[RO]{{Page \\thepage\\ of {total_pages}}}\n")
+        lines.extend(["\\null\\newpage\n"] * total_pages)
+        lines.append("\\end{document}\n")
+        return "".join(lines)
+
+    def _front_body(self) -> List[str]:
+        lines = self.gen._cover_lines()
+        # Índice unificado a partir de los .aux de todas las secciones
+        lines.append("\\makeatletter\n")
+        lines.append("\\section*{\\contentsname\\@mkboth{\\MakeUppercase\\contentsname}{\\MakeUppercase\\contentsname}}\n")
+        lines.append(f"\\@input{{{(self.sections_dir / TOC_NAME).relative_to(self.paths.project_dir).as_posix()}}}\n")
+        lines.append("\\makeatother\n")
+        lines.append("\\newpage\n\n")
+        return lines
+
+    def _merge_toc(self, docs: List[Tuple[Path, int]], front_pages: int) -> str:
+        """Une las entradas del índice de ``(sección, páginas)`` pasando cada página local a la global.
+
+        Las secciones no llaman a ``\\tableofcontents``, así que no escriben
+        ``.toc``: las entradas se leen de los ``\\@writefile{toc}`` de su ``.aux``.
+        """
+        entries: List[str] = []
+        offset = front_pages
+        for tex, pages in docs:
+            try:
+                aux = tex.with_suffix(".aux").read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                aux = ""
+            for line in aux.splitlines():
+                line = line.strip()
+                if not (line.startswith(TOC_WRITE_PREFIX) and line.endswith("}")):
+                    continue
+                line = line[len(TOC_WRITE_PREFIX):-1].rstrip()
+                if line.endswith(FILE_PERCENT):
+                    line = line[:-len(FILE_PERCENT)].rstrip()
+                line += "%"
+                m = CONTENTS_PAGE_RE.match(line)
+                if m:
+                    line = f"{m.group(1)}{int(m.group(2)) + offset}{m.group(3)}"
+                entries.append(line)
+            offset += pages
+        return "\n".join(entries) + "\n"
+
+    def _compile_dirty(self, jobs: Dict[str, Path]) -> bool:
+        if not jobs:
+            return True
+        logging.info(f"🔨 Compilando {len(jobs)} documento(s) en paralelo...")
+        compiler = self.gen.compiler
+        max_passes = self.gen.config.max_latex_passes
+        cwd = self.paths.project_dir
+        with ProcessPoolExecutor(max_workers=self.gen.config.max_workers) as pool:
+            futures = {key: pool.submit(compile_document, compiler, max_passes, tex, cwd) for key, tex in jobs.items()}
+        ok = True
+        for key, future in futures.items():
+            done, passes, _ = future.result()
+            self.passes[key] = self.passes.get(key, 0) + passes
+            if done:
+                logging.info(f"  ✅ {jobs[key].name} ({passes} pasada(s))")
+            else:
+                logging.error(f"  ❌ Error compilando {jobs[key].name}")
+                self.manifest.stages.get("sections", {}).pop(key, None)
+                ok = False
+        return ok
+
+    def _write_and_schedule(self, key: str, tex: Path, content: str, inputs: str, jobs: Dict[str, Path]):
+        write_if_changed(tex, content)
+        digest = content_hash((content + inputs).encode("utf-8"))
+        if self.manifest.get("sections", key) != digest or not tex.with_suffix(".pdf").exists():
+            self.manifest.set("sections", key, digest)
+            jobs[key] = tex
+
+    def build(self) -> bool:
+        if self.reader_cls is None:
+            logging.error("pypdf o PyPDF2 no están instalados (pip install pypdf)")
+            return False
+        self.sections_dir.mkdir(parents=True, exist_ok=True)
+        preamble = self.manifest.get("outputs", "preamble.tex") or ""
+        snippets = self.manifest.stages.get("snippets", {})
+        folders = list(self.gen.sections)
+        docs = {folder: self._tex_name(i + 1, folder) for i, folder in enumerate(folders)}
+        front = self.sections_dir / f"{FRONT_NAME}.tex"
+        stamp = self.sections_dir / f"{STAMP_NAME}.tex"
+
+        jobs: Dict[str, Path] = {}
+        for i, folder in enumerate(folders):
+            content = self._document(self.gen.section_lines[folder], i)
+            inputs = preamble + "".join(snippets.get(f.relative_to(self.paths.project_dir).as_posix(), "")
+                                        for f in self.gen.sections[folder])
+            self._write_and_schedule(folder, docs[folder], content, inputs, jobs)
+        self.manifest.retain("sections", set(folders) | {FRONT_NAME, STAMP_NAME})
+        if not self._compile_dirty(jobs):
+            self.manifest.save()
+            return False
+        pages = {folder: self._page_count(docs[folder].with_suffix(".pdf")) for folder in folders}
+
+        front_pages = int(self.manifest.get("section_pages", FRONT_NAME) or 1)
+        for _ in range(MAX_LAYOUT_ROUNDS):
+            toc_file = self.sections_dir / TOC_NAME
+            write_if_changed(toc_file, self._merge_toc([(docs[f], pages[f]) for f in folders], front_pages))
+            jobs = {}
+            toc = content_hash(toc_file.read_bytes())
+            self._write_and_schedule(FRONT_NAME, front, self._document(self._front_body()), preamble + toc, jobs)
+            if not self._compile_dirty(jobs):
+                self.manifest.save()
+                return False
+            actual = self._page_count(front.with_suffix(".pdf"))
+            self.manifest.set("section_pages", FRONT_NAME, str(actual))
+            if actual == front_pages:
+                break
+            logging.info("🔄 Cambió el largo de la portada, recalculando las páginas del índice...")
+            front_pages = actual
+        else:
+            logging.warning(f"⚠️ La paginación no se estabilizó tras {MAX_LAYOUT_ROUNDS} rondas")
+        self.manifest.retain("section_pages", {FRONT_NAME})
+
+        total = front_pages + sum(pages.values())
+        jobs = {}
+        self._write_and_schedule(STAMP_NAME, stamp, self._stamp_document(total), preamble, jobs)
+        ok = self._compile_dirty(jobs)
+        self.manifest.save()
+        return ok and self._merge(front, [docs[f] for f in folders], stamp)
+
+    def _merge(self, front: Path, sections: List[Path], stamp: Path) -> bool:
+        writer = self.writer_cls()
+        for tex in sections:
+            # import_outline conserva los marcadores de hyperref de cada sección
+            writer.append(str(tex.with_suffix(".pdf")), import_outline=True)
+        # La portada se inserta al principio después de las secciones: así los enlaces
+        # del índice quedan resueltos contra los destinos con nombre ya registrados
+        writer.merge(0, str(front.with_suffix(".pdf")), import_outline=True)
+        stamps = self.reader_cls(str(stamp.with_suffix(".pdf"))).pages
+        if len(stamps) != len(writer.pages):
+            logging.warning(f"⚠️ Numeración con {len(stamps)} páginas para un documento de {len(writer.pages)}")
+        for page, number in zip(writer.pages, stamps):
+            page.merge_page(number)
+        with open(self.paths.output_pdf, "wb") as f:
+            writer.write(f)
+        logging.info(f"📚 {len(sections) + 1} documentos unidos en {self.paths.output_pdf.name}")
+        return True
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Verifica que los snippets de Snippets/ compilen con g++.
+
+Los snippets son fragmentos pensados para pegarse dentro de la plantilla de
+concurso (``Algos/Fast IO.cpp``): casi ninguno tiene ``#include`` ni ``main``,
+y muchos son sentencias sueltas (``int n; cin >> n; ...``). Para cada uno se
+arma una unidad de compilación en ``build/check/units/``:
+
+    #include "check_pch.h"          encabezado precompilado compartido
+    <plantilla hasta solve()>      ll, ps(), pb, ordered_set, ...
+    <contexto y dependencias>      nombres que el fragmento asume (ver tablas)
+    <declaraciones del fragmento>  structs, funciones (y variables globales)
+    void check_body() { ... }      las sentencias sueltas del fragmento
+    int main() { check_body(); }   main sintético si el snippet no tiene
+
+Si el fragmento tiene sentencias sueltas, sus variables se declaran dentro de
+``check_body`` (como al pegarlo en ``solve()``); si no, quedan globales. La
+excepción es una función definida después de las sentencias sueltas (como
+``reconstruct_lcs`` en ``DP/LCS.cpp``): usa el estado del fragmento y no puede
+definirse dentro de ``check_body``, así que las variables quedan globales. Las
+líneas conservan la numeración del snippet original (``#line``), así que
+los errores apuntan al archivo real. Se compila con ``-fsyntax-only`` en un
+pool de procesos; el ``bits/stdc++.h`` se precompila una sola vez y los
+resultados correctos se guardan en ``build/check/cache.json`` según el hash
+de la unidad, el compilador y las opciones.
+
+Uso:
+    python snippet_check.py [--jobs N] [--force] [--std gnu++17] [SNIPPET ...]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from generate_pdf import (
+    ProjectPaths,
+    SnipIgnore,
+    SnippetCollector,
+    SnippetIndex,
+    content_hash,
+    decode_snippet,
+    normalize_ascii_filename,
+    sanitize_text,
+    write_if_changed,
+)
+
+# Cambiar si cambia la forma de armar las unidades para invalidar la caché
+CHECK_VERSION = "1"
+PCH_HEADERS = ("bits/stdc++.h", "ext/pb_ds/assoc_container.hpp", "ext/pb_ds/tree_policy.hpp")
+# Plantilla de concurso: lo anterior a ``void solve()`` se antepone a cada fragmento
+TEMPLATE_SNIPPET = "Algos/Fast IO.cpp"
+TEMPLATE_END_RE = re.compile(r"^\s*void\s+solve\s*\(", re.MULTILINE)
+
+# Snippets que usan funciones o constantes de otro snippet
+DEPENDENCIES: Dict[str, List[str]] = {
+    "Combinatory/Combinatory.cpp": ["Number Theory/Potenciacion_Binaria.cpp"],
+}
+# Nombres que el fragmento da por declarados en el programa donde se pega
+CONTEXT: Dict[str, str] = {
+    "Bit Manipulation/Bits.cpp": "const int N = 20; int b;",
+    "Graph/BFS.cpp": "int n; vector<int> adj[200005];",
+    "Graph/DFS.cpp": "int n; vector<int> adj[200005];",
+    "Graph/Floyd Warshall.cpp": "const long long inf = 1e18;",
+    "Graph/Bellman Ford.cpp": "const long long inf = 1e18;",
+    "Graph/Dijkstra.cpp": "const long long inf = 1e18;",
+    "Numerical Methods/Modular SLAE.cpp": "const int N = 105;",
+    "Numerical Methods/Simpson's Integration.cpp": "double f(double x) { return x * x; }",
+    "Manhattan Distance/Farthest_pair_of_points.cpp": "int n, d; vector<vector<long long>> p;",
+}
+# Archivos que no son código (tablas de referencia)
+NOT_CODE = frozenset({"Algos/Tablas_y_Cotas.cpp"})
+
+CONTROL_WORDS = frozenset("for while if else do switch return break continue goto case default throw try".split())
+TOP_KEYWORDS = frozenset("struct class union enum template typedef using namespace extern".split())
+FUNC_HEADER_RE = re.compile(r"^[\w:<>,\s\*&~\[\]]*?\b[A-Za-z_~][\w:]*\s*\([^;{]*\)\s*(?:const\s*)?(?:noexcept\s*)?(?:->[^{]*)?$",
+                            re.DOTALL)
+DECL_RE = re.compile(r"^(?:[A-Za-z_][\w:]*(?:\s*<[^;]*?>)?[\s\*&]+)+[A-Za-z_]\w*\s*(?:[=({\[;,]|$)", re.DOTALL)
+MAIN_RE = re.compile(r"\b(?:int|signed)\s+main\s*\(")
+
+
+@dataclass
+class Chunk:
+    kind: str   # "decl" (tipos, funciones, directivas), "var" o "stmt"
+    line: int   # primera línea en el snippet (1-based)
+    text: str
+
+
+def _strip_code(code: str) -> str:
+    """Reemplaza comentarios y literales por espacios conservando posiciones y saltos."""
+    out = list(code)
+    i, n = 0, len(code)
+    while i < n:
+        c = code[i]
+        if code.startswith("//", i):
+            j = code.find("\n", i)
+            j = n if j < 0 else j
+        elif code.startswith("/*", i):
+            j = code.find("*/", i + 2)
+            j = n if j < 0 else j + 2
+        elif c in "\"'":
+            j = i + 1
+            while j < n and code[j] != c and code[j] != "\n":
+                j += 2 if code[j] == "\\" else 1
+            j = min(j + 1, n)
+        else:
+            i += 1
+            continue
+        for k in range(i, j):
+            if out[k] != "\n":
+                out[k] = " "
+        i = j
+    return "".join(out)
+
+
+def _outer(head: str) -> str:
+    """Lo anterior a la primera ``{`` sin el contenido de paréntesis y corchetes."""
+    out, depth = [], 0
+    for c in head:
+        if c == "{" and depth == 0:
+            break
+        if c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif depth == 0:
+            out.append(c)
+    return "".join(out)
+
+
+def _first_word(head: str) -> str:
+    m = re.match(r"\s*([A-Za-z_]\w*)", head)
+    return m.group(1) if m else ""
+
+
+def _classify(head: str) -> str:
+    first = _first_word(head)
+    if head.lstrip().startswith("#") or first in TOP_KEYWORDS:
+        return "decl"
+    if first in CONTROL_WORDS or not first:
+        return "stmt"
+    brace = head.find("{")
+    if brace >= 0 and FUNC_HEADER_RE.match(head[:brace].strip()) and "=" not in head[:brace]:
+        return "decl"
+    # Una lambda con captura por defecto no puede estar fuera de una función
+    if re.search(r"\[\s*[&=]", head):
+        return "stmt"
+    return "var" if DECL_RE.match(head.strip()) else "stmt"
+
+
+def split_fragment(code: str) -> List[Chunk]:
+    """
+    Divide un fragmento en elementos de nivel superior y los clasifica
+    (ver ``Chunk.kind``) con una heurística simple sobre llaves, paréntesis y
+    la primera palabra de cada elemento.
+    """
+    plain = _strip_code(code)
+    chunks: List[Chunk] = []
+    depth = 0
+    start = None
+    i, n = 0, len(plain)
+
+    def emit(end: int):
+        nonlocal start
+        text = code[start:end]
+        head = plain[start:end]
+        line = code.count("\n", 0, start) + 1
+        chunks.append(Chunk(_classify(head), line, text))
+        start = None
+
+    while i < n:
+        c = plain[i]
+        if start is None:
+            if c.isspace():
+                i += 1
+                continue
+            start = i
+            if c == "#":
+                # Directiva de preprocesador: hasta el fin de línea (con continuaciones)
+                j = i
+                while True:
+                    j = plain.find("\n", j)
+                    if j < 0:
+                        j = n
+                        break
+                    if code[j - 1] != "\\":
+                        break
+                    j += 1
+                emit(j)
+                i = j
+                continue
+        if c in "({[":
+            depth += 1
+        elif c in ")}]":
+            depth -= 1
+            if c == "}" and depth == 0:
+                head = plain[start:i + 1]
+                nxt = re.match(r"\s*([;,\w]?)", plain[i + 1:]).group(1)
+                first = _first_word(head)
+                # struct/class/enum e inicializaciones terminan en ';'; else/while continúan la sentencia
+                ends_with_semicolon = first in ("struct", "class", "union", "enum", "do") or "=" in _outer(head)
+                if not ends_with_semicolon and nxt not in (";", ",") and not re.match(r"\s*(else|while)\b", plain[i + 1:]):
+                    emit(i + 1)
+        elif c == ";" and depth == 0:
+            emit(i + 1)
+        i += 1
+    if start is not None and code[start:].strip():
+        emit(n)
+    return chunks
+
+
+def _is_function(chunk: Chunk) -> bool:
+    """Definición de función (un ``decl`` que no es tipo, alias ni directiva)."""
+    text = chunk.text.lstrip()
+    return chunk.kind == "decl" and not text.startswith("#") and _first_word(text) not in TOP_KEYWORDS
+
+
+def _line_directive(line: int, name: str) -> str:
+    return f'#line {line} "{name}"\n'
+
+
+def read_snippet(path: Path) -> str:
+    return sanitize_text(decode_snippet(path.read_bytes()))
+
+
+def template_prelude(snippets_dir: Path) -> str:
+    """La plantilla de concurso hasta ``void solve()`` (sin su ``main``)."""
+    path = snippets_dir / TEMPLATE_SNIPPET
+    try:
+        code = read_snippet(path)
+    except OSError:
+        return "using namespace std;\nusing ll = long long;\n"
+    m = TEMPLATE_END_RE.search(code)
+    return _line_directive(1, TEMPLATE_SNIPPET) + (code[:m.start()] if m else code)
+
+
+def build_unit(rel: str, code: str, prelude: str, deps: List[Tuple[str, str]], context: str,
+               driver: str = "", tail: str = "") -> str:
+    """
+    Arma la unidad de compilación de un snippet (ver docstring del módulo).
+    Con ``driver`` se descarta el ``main`` del snippet y se usa ese código;
+    ``tail`` se agrega al final de ``check_body`` (tras las sentencias sueltas).
+    Un programa completo se compila tal cual; con ``driver`` su ``main`` se
+    renombra a ``snippet_main`` y se agregan el contexto y el driver al final.
+    """
+    parts = ['#include "check_pch.h"\n']
+    if "#include" in _strip_code(code):
+        # Programa completo (la propia plantilla)
+        parts.append(_line_directive(1, rel))
+        parts.append(MAIN_RE.sub(lambda m: m.group(0).replace("main", "snippet_main"), code, count=1)
+                     if driver else code)
+        parts.append("\n")
+        if driver:
+            if context:
+                parts.append(_line_directive(1, f"<contexto de {rel}>"))
+                parts.append(context + "\n")
+            parts.append(_line_directive(1, "<check>"))
+            parts.append(driver + "\n")
+        return "".join(parts)
+    parts.append(prelude)
+    parts.append("\n")
+    if context:
+        parts.append(_line_directive(1, f"<contexto de {rel}>"))
+        parts.append(context + "\n")
+    for dep_rel, dep_code in deps:
+        parts.append(_line_directive(1, dep_rel))
+        parts.append(dep_code + "\n")
+    chunks = split_fragment(code)
+    if driver:
+        chunks = [c for c in chunks if not (c.kind == "decl" and MAIN_RE.match(c.text.strip()))]
+    # Si hay sentencias sueltas el fragmento va dentro de solve(): sus variables son locales,
+    # salvo que después se defina una función que las use (no puede ir dentro de check_body)
+    first_stmt = next((i for i, c in enumerate(chunks) if c.kind == "stmt"), None)
+    local_vars = first_stmt is not None and not any(_is_function(c) for c in chunks[first_stmt + 1:])
+    body: List[Chunk] = []
+    for chunk in chunks:
+        if chunk.kind == "stmt" or (chunk.kind == "var" and local_vars):
+            body.append(chunk)
+            continue
+        parts.append(_line_directive(chunk.line, rel))
+        parts.append(chunk.text + "\n")
+    parts.append(_line_directive(1, "<check>"))
+    parts.append("void check_body() {\n")
+    for chunk in body:
+        parts.append(_line_directive(chunk.line, rel))
+        parts.append(chunk.text + "\n")
+    parts.append(_line_directive(1, "<check>"))
+    parts.append(tail + "\n}\n" if tail else "}\n")
+    if driver:
+        parts.append(driver + "\n")
+    elif not MAIN_RE.search(_strip_code(code)):
+        parts.append("int main() { check_body(); }\n")
+    return "".join(parts)
+
+
+@dataclass
+class CheckResult:
+    snippet: str
+    ok: bool
+    cached: bool = False
+    seconds: float = 0.0
+    output: str = ""
+
+
+def _compile_unit(cmd: List[str]) -> Tuple[bool, float, str]:
+    """Punto de entrada de los procesos del pool."""
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True, errors="replace")
+    return proc.returncode == 0, time.perf_counter() - start, proc.stderr
+
+
+class SnippetChecker:
+    def __init__(self, paths: Optional[ProjectPaths] = None, compiler: str = "g++", std: str = "gnu++17",
+                 jobs: Optional[int] = None):
+        self.paths = paths or ProjectPaths()
+        self.compiler = compiler
+        self.flags = [f"-std={std}", "-fsyntax-only", "-w"]
+        self.jobs = jobs
+        self.check_dir = self.paths.build_dir / "check"
+        self.pch_dir = self.check_dir / "pch"
+        self.units_dir = self.check_dir / "units"
+        self.cache_path = self.check_dir / "cache.json"
+        self._version: Optional[str] = None
+
+    def compiler_version(self) -> str:
+        if self._version is None:
+            proc = subprocess.run([self.compiler, "--version"], capture_output=True, text=True)
+            self._version = proc.stdout.splitlines()[0] if proc.stdout else self.compiler
+        return self._version
+
+    def flags_key(self, flags: Optional[List[str]] = None) -> str:
+        flags = self.flags if flags is None else flags
+        return content_hash("\n".join([CHECK_VERSION, self.compiler_version()] + flags).encode("utf-8"))
+
+    def ensure_pch(self, flags: Optional[List[str]] = None) -> Path:
+        """
+        Precompila los encabezados comunes (una vez por compilador y opciones) y
+        devuelve la carpeta a pasar con ``-I``. Si falla, el encabezado queda
+        sin precompilar y simplemente se incluye.
+        """
+        flags = [f for f in (self.flags if flags is None else flags) if f not in ("-fsyntax-only", "-c")]
+        key = self.flags_key(flags)
+        pch_dir = self.pch_dir / key[:12]
+        header = pch_dir / "check_pch.h"
+        gch = header.with_suffix(".h.gch")
+        if gch.exists():
+            return pch_dir
+        pch_dir.mkdir(parents=True, exist_ok=True)
+        header.write_text("".join(f"#include <{h}>\n" for h in PCH_HEADERS), encoding="utf-8")
+        logging.info(f"🧩 Precompilando bits/stdc++.h ({' '.join(flags)})...")
+        tmp = gch.with_suffix(f".tmp{os.getpid()}")
+        proc = subprocess.run([self.compiler, *flags, "-x", "c++-header", str(header), "-o", str(tmp)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            logging.warning(f"⚠️ No se pudo precompilar el encabezado; se compila sin PCH\n{proc.stderr}")
+            tmp.unlink(missing_ok=True)
+            return pch_dir
+        os.replace(tmp, gch)
+        return pch_dir
+
+    def unit(self, rel: str, prelude: str, driver: str = "", context: str = "", tail: str = "") -> str:
+        """Unidad de compilación de ``rel`` con su contexto (más ``context``) y dependencias."""
+        deps = [(d, read_snippet(self.paths.snippets_dir / d)) for d in DEPENDENCIES.get(rel, [])]
+        code = read_snippet(self.paths.snippets_dir / rel)
+        context = "\n".join(c for c in (CONTEXT.get(rel, ""), context) if c)
+        return build_unit(rel, code, prelude, deps, context, driver, tail)
+
+    def build_program(self, rel: str, driver: str, out_dir: Path, name: str, flags: List[str],
+                      replace: Optional[Dict[str, str]] = None, context: str = "", tail: str = "") -> Path:
+        """
+        Compila ``rel`` con ``driver`` como ``main`` (y los reemplazos de texto
+        indicados) en ``out_dir/bin``. El binario se reutiliza mientras no
+        cambien la unidad, el compilador ni las opciones.
+        """
+        unit = self.unit(rel, template_prelude(self.paths.snippets_dir), driver, context, tail)
+        for old, new in (replace or {}).items():
+            if old not in unit:
+                raise RuntimeError(f"{rel}: no se encontró el texto a reemplazar {old!r}")
+            unit = unit.replace(old, new)
+        key = content_hash((self.flags_key(flags) + unit).encode("utf-8"))[:16]
+        binary = out_dir / "bin" / f"{name}_{key}"
+        if binary.exists():
+            return binary
+        binary.parent.mkdir(parents=True, exist_ok=True)
+        src = out_dir / f"{name}.cpp"
+        write_if_changed(src, unit)
+        for old in binary.parent.glob(f"{name}_*"):
+            old.unlink()
+        pch_dir = self.ensure_pch([f for f in flags if not f.startswith("-D")])
+        proc = subprocess.run([self.compiler, *flags, f"-I{pch_dir}", str(src), "-o", str(binary)],
+                              capture_output=True, text=True, errors="replace")
+        if proc.returncode != 0:
+            raise RuntimeError(f"no compila {rel}:\n{proc.stderr}")
+        return binary
+
+    def discover(self) -> List[Path]:
+        index = SnippetIndex(self.paths.snippets_dir, self.paths.index, SnipIgnore.load(self.paths.snipignore))
+        sections = SnippetCollector(self.paths.snippets_dir, index).collect()
+        return [f for files in sections.values() for f in files]
+
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.paths.snippets_dir).as_posix()
+
+    def _load_cache(self) -> Dict[str, str]:
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def check(self, files: Optional[List[Path]] = None, force: bool = False) -> List[CheckResult]:
+        files = files if files is not None else self.discover()
+        pch_dir = self.ensure_pch()
+        prelude = template_prelude(self.paths.snippets_dir)
+        cache = {} if force else self._load_cache()
+        flags_key = self.flags_key()
+        self.units_dir.mkdir(parents=True, exist_ok=True)
+
+        results: Dict[str, CheckResult] = {}
+        jobs: Dict[str, Tuple[str, List[str]]] = {}
+        for f in files:
+            rel = self._rel(f)
+            if rel in NOT_CODE:
+                continue
+            unit = self.unit(rel, prelude)
+            key = content_hash((flags_key + unit).encode("utf-8"))
+            if cache.get(rel) == key:
+                results[rel] = CheckResult(rel, ok=True, cached=True)
+                continue
+            unit_path = self.units_dir / f"{normalize_ascii_filename(rel).replace('/', '__')}"
+            write_if_changed(unit_path, unit)
+            cmd = [self.compiler, *self.flags, f"-I{pch_dir}", str(unit_path)]
+            jobs[rel] = (key, cmd)
+
+        if jobs:
+            logging.info(f"🔨 Compilando {len(jobs)} snippet(s) ({len(results)} en caché)...")
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                futures = {rel: pool.submit(_compile_unit, cmd) for rel, (_, cmd) in jobs.items()}
+                for rel, future in futures.items():
+                    ok, seconds, output = future.result()
+                    results[rel] = CheckResult(rel, ok, seconds=seconds, output=output)
+                    if ok:
+                        cache[rel] = jobs[rel][0]
+                    else:
+                        cache.pop(rel, None)
+        cache = {rel: key for rel, key in cache.items() if rel in results}
+        self.check_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_path.write_text(json.dumps(cache, indent=1, sort_keys=True), encoding="utf-8")
+        return [results[self._rel(f)] for f in files if self._rel(f) in results]
+
+
+def first_errors(output: str, limit: int = 3) -> List[str]:
+    return [line for line in output.splitlines() if ": error:" in line][:limit]
+
+
+def print_results(results: List[CheckResult], verbose: bool = False):
+    failed = [r for r in results if not r.ok]
+    cached = sum(r.cached for r in results)
+    for r in failed:
+        print(f"\n❌ {r.snippet}")
+        lines = r.output.splitlines() if verbose else first_errors(r.output) or r.output.splitlines()[:3]
+        for line in lines:
+            print(f"   {line}")
+    print(f"\n✅ {len(results) - len(failed)}/{len(results)} snippets compilan ({cached} desde la caché)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila todos los snippets con g++ para detectar errores")
+    parser.add_argument("snippets", nargs="*", type=Path, help="snippets a revisar (por defecto, todos)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="procesos de g++ simultáneos")
+    parser.add_argument("--force", action="store_true", help="ignorar la caché de resultados")
+    parser.add_argument("--std", default="gnu++17", help="estándar de C++ (por defecto gnu++17)")
+    parser.add_argument("--cxx", default="g++", help="compilador (por defecto g++)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="mostrar la salida completa de g++")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if shutil.which(args.cxx) is None:
+        logging.error(f"Compilador no encontrado: {args.cxx}")
+        sys.exit(2)
+    checker = SnippetChecker(compiler=args.cxx, std=args.std, jobs=args.jobs)
+    files = [p.resolve() for p in args.snippets] or None
+    start = time.perf_counter()
+    results = checker.check(files, force=args.force)
+    print_results(results, args.verbose)
+    print(f"⏱️ {time.perf_counter() - start:.1f} s")
+    sys.exit(0 if all(r.ok for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
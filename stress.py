@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Stress test diferencial entre pares de snippets (versión simple vs. rápida).
+
+Cada par (``PAIRS``) define un ``main`` para cada lado que lee ``Q`` consultas
+de stdin e imprime una respuesta por línea, y un generador de consultas. Los
+dos programas se arman con la misma unidad que ``snippet_check.py`` (plantilla
+de concurso + dependencias + snippet), se compilan una sola vez con ``-O2`` y
+el encabezado precompilado, y se reutilizan mientras el código no cambie.
+
+Cada caso es una ejecución de ambos programas con límite de tiempo y de
+memoria; los casos corren en paralelo en un pool de procesos (el límite de
+memoria se aplica con ``preexec_fn``, que no es seguro desde hilos). Un
+programa que muere por señal (SIGSEGV/SIGKILL) con el límite activo cuenta
+como "memoria", igual que un ``bad_alloc``.
+
+Ante la primera diferencia se detiene, reduce el caso (primero quita
+consultas, luego achica los números) y guarda el contraejemplo mínimo en
+``build/stress/<par>.txt``.
+
+Uso:
+    python stress.py [PAR ...] [--cases N] [--jobs N] [--seed S]
+                     [--timeout 2] [--memory-mb 512]
+"""
+
+import argparse
+import logging
+import random
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from generate_pdf import ProjectPaths
+from snippet_check import SnippetChecker
+
+try:
+    import resource
+except ImportError:  # Windows: sin límite de memoria por proceso
+    resource = None
+
+MOD = 10 ** 9 + 7
+INT_MAX = 2 ** 31 - 1
+
+Query = Tuple[int, ...]
+
+# Señales con las que muere un programa al agotar RLIMIT_AS sin lanzar bad_alloc
+MEMORY_SIGNALS = {signal.SIGSEGV, signal.SIGKILL}
+
+
+@dataclass
+class Pair:
+    name: str
+    brute: str
+    fast: str
+    brute_main: str
+    fast_main: str
+    # Genera una consulta a partir del generador aleatorio
+    query: Callable[[random.Random], Query]
+    # Cota inferior de cada campo al reducir el contraejemplo
+    lower: Query
+    max_queries: int = 50
+    cases: int = 2000
+
+
+def _combi_query(rng: random.Random) -> Query:
+    n = rng.randint(0, 20)
+    return n, rng.randint(-1, n + 1)
+
+
+def _sieve_query(rng: random.Random) -> Query:
+    # Mitad números chicos (bordes 0, 1, 2), mitad en todo el rango de la criba
+    return (rng.randint(0, 100) if rng.random() < 0.5 else rng.randint(0, 10 ** 7),)
+
+
+def _phi_query(rng: random.Random) -> Query:
+    r = rng.random()
+    if r < 0.4:
+        return (rng.randint(1, 1000),)
+    if r < 0.9:
+        return (rng.randint(1, 10 ** 9),)
+    return (rng.randint(INT_MAX - 10 ** 6, INT_MAX),)
+
+
+READ_QUERIES = "int q; cin >> q;"
+
+PAIRS: Dict[str, Pair] = {p.name: p for p in [
+    Pair(
+        name="combinatoria",
+        brute="Combinatory/Combi_brute_sin_MOD.cpp",
+        fast="Combinatory/Combinatory.cpp",
+        brute_main=f"""int main() {{ {READ_QUERIES}
+    while (q--) {{ long long n, k; cin >> n >> k;
+        cout << nCk_bruteforce(n, k) % {MOD} << ' ' << nPk_bruteforce(n, k) % {MOD} << '\\n'; }} }}""",
+        fast_main=f"""int main() {{ precompute_factorials(); {READ_QUERIES}
+    while (q--) {{ ll n, k; cin >> n >> k; cout << nCk(n, k) << ' ' << nPk(n, k) << '\\n'; }} }}""",
+        query=_combi_query,
+        lower=(0, -1),
+        max_queries=200,
+        cases=1000,
+    ),
+    Pair(
+        name="criba",
+        brute="Number Theory/Sieve.cpp",
+        fast="Number Theory/Sieve_bitset.cpp",
+        brute_main=f"""int main() {{ {READ_QUERIES} vector<int> xs(q); int mx = 1;
+    for (auto& x : xs) {{ cin >> x; mx = max(mx, x); }}
+    vector<bool> is_prime(mx + 1); sieve(is_prime);
+    for (int x : xs) cout << (int) is_prime[x] << '\\n'; }}""",
+        fast_main=f"""int main() {{ sieve(); {READ_QUERIES}
+    while (q--) {{ int x; cin >> x; cout << (int) !composite[x] << '\\n'; }} }}""",
+        query=_sieve_query,
+        lower=(0,),
+        cases=1000,
+    ),
+    Pair(
+        name="phi",
+        brute="Number Theory/Euler_Toliente.cpp",
+        fast="Number Theory/Phi_Euler.cpp",
+        brute_main=f"""int main() {{ EulerTotiente e; {READ_QUERIES}
+    while (q--) {{ long long n; cin >> n; cout << e.euler_classic<long long>(n) << '\\n'; }} }}""",
+        fast_main=f"""int main() {{ {READ_QUERIES}
+    while (q--) {{ int n; cin >> n; cout << phi(n) << '\\n'; }} }}""",
+        query=_phi_query,
+        lower=(1,),
+    ),
+]}
+
+
+def format_input(queries: Sequence[Query]) -> str:
+    return f"{len(queries)}\n" + "".join(" ".join(map(str, q)) + "\n" for q in queries)
+
+
+@dataclass
+class RunResult:
+    status: str  # "ok", "tiempo", "memoria", "error"
+    output: str = ""
+    seconds: float = 0.0
+    detail: str = ""
+
+
+@dataclass
+class CaseResult:
+    index: int
+    queries: List[Query]
+    brute: RunResult
+    fast: RunResult
+
+    @property
+    def ok(self) -> bool:
+        return self.brute.status == self.fast.status == "ok" and self.brute.output == self.fast.output
+
+
+def _limit_memory(limit_bytes: int):
+    def apply():
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    return apply
+
+
+def run_program(binary: Path, stdin: str, timeout: float, memory_mb: Optional[int]) -> RunResult:
+    preexec = _limit_memory(memory_mb * 2 ** 20) if memory_mb and resource is not None else None
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run([str(binary)], input=stdin, capture_output=True, text=True,
+                              timeout=timeout, preexec_fn=preexec)
+    except subprocess.TimeoutExpired:
+        return RunResult("tiempo", seconds=time.perf_counter() - start)
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        # Sin memoria: bad_alloc (abort) o SIGSEGV/SIGKILL al superar RLIMIT_AS, sin nada en stderr
+        killed = preexec is not None and -proc.returncode in MEMORY_SIGNALS
+        status = "memoria" if killed or "bad_alloc" in proc.stderr else "error"
+        code = f"señal {-proc.returncode}" if proc.returncode < 0 else f"código {proc.returncode}"
+        return RunResult(status, proc.stdout, seconds, f"{code} {proc.stderr.strip()[-300:]}")
+    return RunResult("ok", proc.stdout, seconds)
+
+
+def run_case(binaries: Dict[str, Path], index: int, queries: List[Query], timeout: float,
+             memory_mb: Optional[int]) -> CaseResult:
+    """Ejecuta ambos lados sobre el mismo caso; es de módulo para poder enviarse al pool de procesos."""
+    stdin = format_input(queries)
+    brute = run_program(binaries["brute"], stdin, timeout, memory_mb)
+    fast = run_program(binaries["fast"], stdin, timeout, memory_mb)
+    return CaseResult(index, queries, brute, fast)
+
+
+@dataclass
+class StressRunner:
+    pair: Pair
+    checker: SnippetChecker
+    timeout: float = 2.0
+    memory_mb: Optional[int] = 512
+    flags: List[str] = field(default_factory=lambda: ["-std=gnu++17", "-O2", "-w"])
+    binaries: Dict[str, Path] = field(default_factory=dict)
+
+    @property
+    def work_dir(self) -> Path:
+        return self.checker.paths.build_dir / "stress"
+
+    def compile(self):
+        """Compila ambos lados (en paralelo); los binarios se reutilizan por hash de la unidad."""
+        self.checker.ensure_pch(self.flags)
+        sides = {"brute": (self.pair.brute, self.pair.brute_main), "fast": (self.pair.fast, self.pair.fast_main)}
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = {side: pool.submit(self.checker.build_program, rel, driver, self.work_dir,
+                                         f"{self.pair.name}_{side}", self.flags)
+                       for side, (rel, driver) in sides.items()}
+            self.binaries = {side: f.result() for side, f in futures.items()}
+
+    def run_case(self, index: int, queries: List[Query]) -> CaseResult:
+        return run_case(self.binaries, index, queries, self.timeout, self.memory_mb)
+
+    def make_case(self, seed: int, index: int) -> List[Query]:
+        rng = random.Random(f"{self.pair.name}:{seed}:{index}")
+        # Los primeros casos son chicos: si fallan, el contraejemplo ya es corto
+        limit = max(1, min(self.pair.max_queries, 1 + index * self.pair.max_queries // max(1, self.pair.cases)))
+        return [self.pair.query(rng) for _ in range(rng.randint(1, limit))]
+
+    def stress(self, cases: int, seed: int, jobs: Optional[int]) -> Optional[CaseResult]:
+        """Primer caso (por índice) con diferencias, o None si todos coinciden."""
+        failure: Optional[CaseResult] = None
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_case, self.binaries, i, self.make_case(seed, i), self.timeout, self.memory_mb)
+                       for i in range(cases)]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                result = future.result()
+                if not result.ok and (failure is None or result.index < failure.index):
+                    failure = result
+                    for f in futures:
+                        f.cancel()
+        return failure
+
+    def _still_fails(self, queries: List[Query]) -> Optional[CaseResult]:
+        result = self.run_case(-1, queries)
+        return None if result.ok else result
+
+    def minimize(self, failure: CaseResult) -> CaseResult:
+        """Reduce el caso: quita bloques de consultas y luego acerca cada número a su cota inferior."""
+        best = failure
+        chunk = len(best.queries) // 2
+        while chunk >= 1:
+            i, reduced = 0, False
+            while i < len(best.queries):
+                candidate = best.queries[:i] + best.queries[i + chunk:]
+                result = self._still_fails(candidate) if candidate else None
+                if result is not None:
+                    best, reduced = result, True
+                else:
+                    i += chunk
+            if not reduced:
+                chunk //= 2
+        changed = True
+        while changed:
+            changed = False
+            for qi, query in enumerate(best.queries):
+                for fi, value in enumerate(query):
+                    lo = self.pair.lower[fi]
+                    # Valores pequeños primero y luego pasos decrecientes hacia el valor actual
+                    steps = {value - ((value - lo) >> k) for k in range(1, (value - lo).bit_length() + 1)}
+                    for candidate_value in sorted(set(range(lo, min(value, lo + 5))) | steps | {value - 1}):
+                        if candidate_value >= value or candidate_value < lo:
+                            continue
+                        candidate = list(best.queries)
+                        candidate[qi] = query[:fi] + (candidate_value,) + query[fi + 1:]
+                        result = self._still_fails(candidate)
+                        if result is not None:
+                            best, changed = result, True
+                            break
+                    if changed:
+                        break
+                if changed:
+                    break
+        return best
+
+
+def describe(pair: Pair, case: CaseResult) -> str:
+    lines = [f"Par: {pair.name} ({pair.brute} vs {pair.fast})", "Entrada:", format_input(case.queries).rstrip()]
+    for side, rel, run in (("simple", pair.brute, case.brute), ("rápido", pair.fast, case.fast)):
+        lines.append(f"Salida {side} [{run.status}, {run.seconds * 1000:.0f} ms] ({rel}):")
+        lines.append(run.output.rstrip() or "(vacía)")
+        if run.detail:
+            lines.append(run.detail)
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test diferencial entre snippets simples y rápidos")
+    parser.add_argument("pairs", nargs="*", help=f"pares a probar: {', '.join(PAIRS)} (por defecto, todos)")
+    parser.add_argument("--cases", type=int, default=None, help="casos por par (por defecto, los del par)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="casos simultáneos")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=2.0, help="segundos por ejecución")
+    parser.add_argument("--memory-mb", type=int, default=512, help="memoria por ejecución (0: sin límite)")
+    args = parser.parse_args()
+
+    unknown = [p for p in args.pairs if p not in PAIRS]
+    if unknown:
+        parser.error(f"pares desconocidos: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    checker = SnippetChecker(ProjectPaths())
+    all_ok = True
+    for name in args.pairs or list(PAIRS):
+        pair = PAIRS[name]
+        runner = StressRunner(pair, checker, args.timeout, args.memory_mb or None)
+        try:
+            runner.compile()
+        except RuntimeError as e:
+            logging.error(f"❌ {name}: {e}")
+            all_ok = False
+            continue
+        cases = args.cases or pair.cases
+        start = time.perf_counter()
+        failure = runner.stress(cases, args.seed, args.jobs)
+        elapsed = time.perf_counter() - start
+        if failure is None:
+            logging.info(f"✅ {name}: {cases} casos iguales en {elapsed:.1f} s")
+            continue
+        all_ok = False
+        logging.error(f"❌ {name}: diferencia en el caso {failure.index} ({len(failure.queries)} consultas); reduciendo...")
+        minimal = runner.minimize(failure)
+        report = describe(pair, minimal)
+        out = runner.work_dir / f"{name}.txt"
+        out.write_text(report, encoding="utf-8")
+        print(f"\n{report}💾 Contraejemplo en {out}")
+    sys.exit(0 if all_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Pruebas del índice unificado de la compilación por secciones."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from section_build import SectionBuilder  # noqa: E402
+
+
+def test_merge_toc_shifts_pages_from_section_aux(tmp_path):
+    graph = tmp_path / "01_Graph.tex"
+    graph.with_suffix(".aux").write_text(
+        "\\relax\n"
+        "\\@writefile{toc}{\\contentsline {section}{\\numberline {1}Graph}{1}{section.1}\\protected@file@percent }\n"
+        "\\@writefile{lol}{\\contentsline {lstlisting}{BFS.cpp}{1}{lstlisting.-1}\\protected@file@percent }\n"
+        "\\@writefile{toc}{\\contentsline {subsection}{\\numberline {1.1}BFS}{2}{subsection.1.1}\\protected@file@percent }\n",
+        encoding="utf-8",
+    )
+    dp = tmp_path / "02_DP.tex"
+    dp.with_suffix(".aux").write_text(
+        "\\@writefile{toc}{\\contentsline {section}{\\numberline {2}DP}{1}{section.2}}\n",
+        encoding="utf-8",
+    )
+    builder = SectionBuilder.__new__(SectionBuilder)
+    toc = builder._merge_toc([(graph, 3), (dp, 2), (tmp_path / "03_Missing.tex", 1)], front_pages=2)
+    assert toc.splitlines() == [
+        "\\contentsline {section}{\\numberline {1}Graph}{3}{section.1}%",
+        "\\contentsline {subsection}{\\numberline {1.1}BFS}{4}{subsection.1.1}%",
+        "\\contentsline {section}{\\numberline {2}DP}{6}{section.2}%",
+    ]
+
+
+def _pdf(path: Path, pages: int, dests=(), outline=(), links=()):
+    """PDF de ``pages`` páginas con destinos con nombre, marcadores y enlaces ``(página, destino)``."""
+    from pypdf import PdfWriter
+    from pypdf.generic import ArrayObject, DictionaryObject, FloatObject, NameObject, TextStringObject
+
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(200, 200)
+    for name, page in dests:
+        writer.add_named_destination(name, page)
+    for title, page in outline:
+        writer.add_outline_item(title, page)
+    for page, dest in links:
+        writer.add_annotation(page, DictionaryObject({
+            NameObject("/Type"): NameObject("/Annot"),
+            NameObject("/Subtype"): NameObject("/Link"),
+            NameObject("/Rect"): ArrayObject([FloatObject(10), FloatObject(10), FloatObject(50), FloatObject(20)]),
+            NameObject("/A"): DictionaryObject({
+                NameObject("/S"): NameObject("/GoTo"),
+                NameObject("/D"): TextStringObject(dest),
+            }),
+        }))
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path.with_suffix(".tex")
+
+
+def test_merge_keeps_outline_and_resolves_toc_links(tmp_path):
+    pytest.importorskip("pypdf")
+    from pypdf import PdfReader, PdfWriter
+
+    front = _pdf(tmp_path / "00_Portada.pdf", 1, links=[(0, "section.1"), (0, "section.2")])
+    graph = _pdf(tmp_path / "01_Graph.pdf", 2, dests=[("section.1", 0)], outline=[("Graph", 0)])
+    dp = _pdf(tmp_path / "02_DP.pdf", 1, dests=[("section.2", 0)], outline=[("DP", 0)])
+    stamp = _pdf(tmp_path / "99_Numeracion.pdf", 4)
+
+    builder = SectionBuilder.__new__(SectionBuilder)
+    builder.reader_cls, builder.writer_cls = PdfReader, PdfWriter
+    builder.paths = SimpleNamespace(output_pdf=tmp_path / "Snippets.pdf")
+    assert builder._merge(front, [graph, dp], stamp)
+
+    reader = PdfReader(str(tmp_path / "Snippets.pdf"))
+    assert len(reader.pages) == 4
+    assert [(item.title, reader.get_destination_page_number(item)) for item in reader.outline] == [
+        ("Graph", 1), ("DP", 3)]
+    dests = {name: reader.get_destination_page_number(d) for name, d in reader.named_destinations.items()}
+    assert dests == {"section.1": 1, "section.2": 3}
+    targets = [annot.get_object()["/A"]["/D"] for annot in reader.pages[0]["/Annots"]]
+    assert [dests[t] for t in targets] == [1, 3]
@@ -0,0 +1,56 @@
+"""Pruebas del traductor de globs y del matcher de ``.snipignore``."""
+
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_pdf import SnipIgnore, _glob_to_regex  # noqa: E402
+
+
+def glob_matches(pattern: str, path: str) -> bool:
+    return re.fullmatch(_glob_to_regex(pattern), path) is not None
+
+
+def test_glob_star_does_not_cross_slash():
+    assert glob_matches("*.cpp", "BFS.cpp")
+    assert not glob_matches("*.cpp", "Graph/BFS.cpp")
+    assert glob_matches("Gr?ph", "Graph")
+
+
+def test_glob_double_star_and_classes():
+    assert glob_matches("**/x.cpp", "x.cpp")
+    assert glob_matches("**/x.cpp", "a/b/x.cpp")
+    assert glob_matches("a/**", "a/b/c")
+    assert glob_matches("[ab].cpp", "a.cpp")
+    assert not glob_matches("[!ab].cpp", "a.cpp")
+    assert glob_matches("x+y.cpp", "x+y.cpp")
+
+
+def test_unanchored_pattern_matches_at_any_level():
+    ignore = SnipIgnore(["*.bak", "build/"])
+    assert ignore.ignores("a.bak")
+    assert ignore.ignores("Graph/a.bak")
+    assert ignore.ignores("Graph/build", is_dir=True)
+    assert not ignore.ignores("Graph/build")
+
+
+def test_leading_slash_anchors_to_root():
+    ignore = SnipIgnore(["/build", "/x.cpp"])
+    assert ignore.ignores("build", is_dir=True)
+    assert ignore.ignores("x.cpp")
+    assert not ignore.ignores("Graph/build", is_dir=True)
+    assert not ignore.ignores("Graph/x.cpp")
+
+
+def test_negation_reincludes_and_last_match_wins():
+    ignore = SnipIgnore(["*.cpp", "!keep.cpp"])
+    assert ignore.ignores("Graph/BFS.cpp")
+    assert not ignore.ignores("Graph/keep.cpp")
+    assert SnipIgnore(["!keep.cpp", "*.cpp"]).ignores("keep.cpp")
+    assert SnipIgnore(["\\!odd.cpp"]).ignores("!odd.cpp")
+
+
+def test_empty_ignores_nothing():
+    assert not SnipIgnore([]).ignores("Graph/BFS.cpp")
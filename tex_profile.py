@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+r"""
+Perfil del costo de composición de cada snippet dentro de pdflatex.
+
+Con ``PDFConfig(profile=True)`` el ``.tex`` rodea cada snippet con sondas que
+escriben ``\pdfelapsedtime`` y el número de página actual en ``<jobname>.prof``:
+
+    B;<snippet>;<tiempo>;<página>   antes de \subsection
+    T;<snippet>;<tiempo>;<página>   tras la descripción del template
+    E;<snippet>;<tiempo>;<página>   tras el listado de código
+
+El tiempo está en unidades de 1/65536 s desde el inicio de la pasada. Las
+páginas son las del contador en el momento de la sonda (aproximadas dentro de
+multicols o floats). Se usa el ``.prof`` de la última pasada.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROFILE_SUFFIX = ".prof"
+TICKS_PER_SECOND = 65536
+
+PREAMBLE = r"""
+%%% Sondas de perfil (tex_profile.py)
+\newwrite\snipprof
+\AtBeginDocument{\immediate\openout\snipprof=\jobname.prof}
+\def\snipprobe#1#2{\immediate\write\snipprof{#1;\detokenize{#2};\the\pdfelapsedtime;\the\value{page}}}
+"""
+
+
+def probe(kind: str, key: str) -> str:
+    return f"\\snipprobe{{{kind}}}{{{key}}}\n"
+
+
+@dataclass
+class SnippetCost:
+    snippet: str
+    section: str
+    template_s: float
+    listing_s: float
+    first_page: int
+    last_page: int
+
+    @property
+    def total_s(self) -> float:
+        return self.template_s + self.listing_s
+
+    @property
+    def pages(self) -> int:
+        return self.last_page - self.first_page + 1
+
+
+def parse_profile(prof_file: Path) -> List[SnippetCost]:
+    """Lee un ``.prof``; las sondas incompletas (pasada abortada) se descartan."""
+    marks: Dict[str, Dict[str, tuple]] = {}
+    try:
+        lines = prof_file.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+    for line in lines:
+        kind, _, rest = line.partition(";")
+        key, _, rest = rest.rpartition(";")
+        key, _, ticks = key.rpartition(";")
+        try:
+            marks.setdefault(key, {})[kind] = (int(ticks), int(rest))
+        except ValueError:
+            continue
+    costs = []
+    for key, m in marks.items():
+        if not {"B", "T", "E"} <= m.keys():
+            continue
+        section = key.split("/", 1)[0] if "/" in key else ""
+        costs.append(SnippetCost(
+            snippet=key,
+            section=section,
+            template_s=(m["T"][0] - m["B"][0]) / TICKS_PER_SECOND,
+            listing_s=(m["E"][0] - m["T"][0]) / TICKS_PER_SECOND,
+            first_page=m["B"][1],
+            last_page=m["E"][1],
+        ))
+    return costs
+
+
+def load_profiles(prof_files: List[Path]) -> List[SnippetCost]:
+    costs: List[SnippetCost] = []
+    for f in prof_files:
+        costs.extend(parse_profile(f))
+    return costs
+
+
+def by_section(costs: List[SnippetCost]) -> List[Dict]:
+    sections: Dict[str, Dict] = {}
+    for c in costs:
+        s = sections.setdefault(c.section, {"section": c.section, "snippets": 0, "template_s": 0.0, "listing_s": 0.0,
+                                            "first_page": c.first_page, "last_page": c.last_page})
+        s["snippets"] += 1
+        s["template_s"] += c.template_s
+        s["listing_s"] += c.listing_s
+        # Los snippets de una sección comparten páginas: se toma el rango, no la suma
+        s["first_page"] = min(s["first_page"], c.first_page)
+        s["last_page"] = max(s["last_page"], c.last_page)
+    for s in sections.values():
+        s["pages"] = s.pop("last_page") - s.pop("first_page") + 1
+    return sorted(sections.values(), key=lambda s: s["template_s"] + s["listing_s"], reverse=True)
+
+
+def summary(costs: List[SnippetCost], top: int = 10) -> Dict:
+    """Resumen para el reporte JSON del build."""
+    ranked = sorted(costs, key=lambda c: c.total_s, reverse=True)
+    return {
+        "total_s": round(sum(c.total_s for c in costs), 4),
+        "snippets": [{"snippet": c.snippet, "template_s": round(c.template_s, 4),
+                      "listing_s": round(c.listing_s, 4), "pages": c.pages} for c in ranked[:top]],
+    }
+
+
+def print_table(costs: List[SnippetCost], top: Optional[int] = 20):
+    if not costs:
+        print("Sin datos de perfil (¿se compiló con profile=True?)")
+        return
+    total = sum(c.total_s for c in costs) or 1.0
+    ranked = sorted(costs, key=lambda c: c.total_s, reverse=True)[:top]
+    width = max(len(c.snippet) for c in ranked)
+    print(f"\n{'Snippet':<{width}}  {'Template (s)':>12} {'Código (s)':>11} {'%':>6} {'Páginas':>8}")
+    print("-" * (width + 43))
+    for c in ranked:
+        print(f"{c.snippet:<{width}}  {c.template_s:>12.3f} {c.listing_s:>11.3f} "
+              f"{100 * c.total_s / total:>6.1f} {c.pages:>8}")
+
+    sections = by_section(costs)
+    width = max(len(s["section"]) for s in sections)
+    print(f"\n{'Sección':<{width}}  {'Snippets':>8} {'Template (s)':>12} {'Código (s)':>11} {'%':>6} {'Páginas':>8}")
+    print("-" * (width + 52))
+    for s in sections:
+        t = s["template_s"] + s["listing_s"]
+        print(f"{s['section']:<{width}}  {s['snippets']:>8} {s['template_s']:>12.3f} "
+              f"{s['listing_s']:>11.3f} {100 * t / total:>6.1f} {s['pages']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tabla de costo de composición por snippet y sección")
+    parser.add_argument("prof", nargs="*", type=Path, help="archivos .prof (por defecto Snippets.prof)")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    files = args.prof or [Path(__file__).parent / f"Snippets{PROFILE_SUFFIX}"]
+    costs = load_profiles(files)
+    print_table(costs, args.top)
+    sys.exit(0 if costs else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Modo ``--watch``: reconstruye el PDF cada vez que cambia algo en Snippets/.
+
+Un solo proceso mantiene vivo el ``Generator`` (índice de snippets, templates,
+manifiesto y preámbulo ya escritos), así que cada rebuild solo revalida por
+``stat`` lo que no cambió, vuelve a sanitizar los archivos modificados y
+arranca pdflatex con los auxiliares de la compilación anterior.
+
+Si pypdf está instalado, el modo watch activa ``parallel_sections``: cada
+sección es un documento propio con su hash en el manifiesto, así que un rebuild
+solo recompila las secciones afectadas (más la portada si cambió el índice y el
+documento de numeración si cambió el total de páginas). Sin pypdf se recompila
+el documento completo, normalmente en una sola pasada.
+
+Los cambios se detectan con inotify (vía ctypes, en Linux) o, si no está
+disponible, comparando ``stat`` periódicamente. Las ráfagas de guardados se
+agrupan hasta que pasen ``debounce`` segundos sin eventos.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = getattr(os, "O_NONBLOCK", 0o4000)
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+def _is_noise(path: Path) -> bool:
+    """Archivos temporales de editores (``.swp``, ``~``, ``4913`` de vim, ocultos)."""
+    name = path.name
+    return name.startswith(".") or name.endswith(("~", ".swp", ".swx", ".tmp")) or name == "4913"
+
+
+class InotifyWatcher:
+    """Observa un árbol de directorios con inotify (un watch por carpeta)."""
+
+    def __init__(self, root: Path):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc no encontrada")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        self._dirs: Dict[int, Path] = {}
+        for dirpath, _, _ in os.walk(root):
+            self._add(Path(dirpath))
+
+    def _add(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = directory
+
+    def _drain(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                path = directory / os.fsdecode(name) if name else directory
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add(path)
+                if not _is_noise(path):
+                    changed.add(path)
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Cambios ocurridos hasta ``timeout`` segundos (None: esperar indefinidamente)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        return self._drain() if ready else set()
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Alternativa portable: compara ``(mtime, tamaño)`` de todos los archivos."""
+
+    def __init__(self, root: Path, interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        state: Dict[Path, Tuple[int, int]] = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {p for p in current.keys() | self._snapshot.keys()
+                       if current.get(p) != self._snapshot.get(p) and not _is_noise(p)}
+            self._snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else
+                       max(0.0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+def make_watcher(root: Path, polling: bool = False):
+    if not polling and hasattr(select, "select") and os.name == "posix":
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            logging.info(f"inotify no disponible ({e}), usando sondeo")
+    return PollingWatcher(root)
+
+
+def _affected_sections(changed: Set[Path], snippets_dir: Path) -> Set[str]:
+    sections = set()
+    for path in changed:
+        try:
+            rel = path.relative_to(snippets_dir)
+        except ValueError:
+            continue
+        sections.add(rel.parts[0] if len(rel.parts) > 1 else "/")
+    return sections
+
+
+def watch(gen, debounce: float = DEFAULT_DEBOUNCE, polling: bool = False):
+    """Build inicial y luego un rebuild por cada ráfaga de cambios (Ctrl+C para salir)."""
+    if not gen.config.parallel_sections:
+        from section_build import _load_pdf_lib
+        if _load_pdf_lib()[0] is not None:
+            gen.config.parallel_sections = True
+        else:
+            logging.info("pypdf no disponible: cada rebuild recompila el documento completo")
+    gen.generate()
+    watcher = make_watcher(gen.paths.snippets_dir, polling)
+    kind = "inotify" if isinstance(watcher, InotifyWatcher) else "sondeo"
+    logging.info(f"👀 Observando {gen.paths.snippets_dir} ({kind}); Ctrl+C para salir")
+    try:
+        while True:
+            changed = watcher.wait(None)
+            first_event = time.perf_counter()
+            # Esperar a que termine la ráfaga de guardados
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            sections = sorted(_affected_sections(changed, gen.paths.snippets_dir))
+            logging.info(f"🔄 {len(changed)} cambio(s) en: {', '.join(sections)}")
+            start = time.perf_counter()
+            gen.reset_metrics("watch")
+            gen.metrics.summary["changed_sections"] = sections
+            ok = gen.generate()
+            done = time.perf_counter()
+            if gen.config.parallel_sections:
+                rebuilt = sorted(gen.metrics.summary.get("section_passes", {}))
+                logging.info(f"🧩 Documentos recompilados: {', '.join(rebuilt) or 'ninguno'}")
+            status = "✅" if ok else "❌"
+            logging.info(f"{status} Rebuild en {(done - start) * 1000:.0f} ms "
+                         f"({(done - first_event) * 1000:.0f} ms desde el primer cambio)")
+    except KeyboardInterrupt:
+        logging.info("👋 Fin del modo watch")
+    finally:
+        watcher.close()